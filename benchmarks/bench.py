@@ -0,0 +1,201 @@
+"""
+Throughput benchmarks of transducers against equivalent builtin, itertools
+and comprehension code.
+
+    python -m benchmarks --sizes 1000,100000 --output new.jsonl
+    python -m benchmarks --compare old.jsonl --output new.jsonl
+
+Each result is a JSON object on its own line, keyed by case, mode, source
+and size, so results of separate runs can be compared (`--compare`).
+"""
+import argparse
+from functools import reduce
+from itertools import groupby, islice
+import json
+import platform
+import sys
+import timeit
+from typing import Callable, Dict, Iterable, List, NamedTuple, Tuple
+
+import transducers as t
+
+
+def ident(x):
+    return x
+
+
+def pred(x):
+    return hash(x) % 3
+
+
+class Case(NamedTuple):
+    name: str
+    xform: Callable
+    baseline: Callable[[Iterable], List]
+    # whether the case keeps values of the source's type (and so can be run
+    # with `into_new` from a dict)
+    same_values: bool = True
+
+
+def __comp_case(depth: int) -> Case:
+    stages = [t.map(ident) if i % 2 == 0 else t.filter(pred) for i in range(depth)]
+
+    def baseline(src):
+        steps = [
+            (lambda it: map(ident, it)) if i % 2 == 0 else (lambda it: filter(pred, it))
+            for i in range(depth)
+        ]
+        return list(reduce(lambda it, step: step(it), steps, src))
+
+    return Case(f"comp-{depth}", t.comp(*stages), baseline)
+
+
+def __batches(src, n):
+    it = iter(src)
+    return list(iter(lambda: list(islice(it, n)), []))
+
+
+CASES = [
+    Case("map", t.map(ident), lambda src: [ident(x) for x in src]),
+    Case("filter", t.filter(pred), lambda src: [x for x in src if pred(x)]),
+    *(__comp_case(depth) for depth in (1, 2, 4, 8)),
+    Case("distinct", t.distinct(), lambda src: list(dict.fromkeys(src))),
+    Case("dedupe", t.dedupe(), lambda src: [k for k, _ in groupby(src)]),
+    Case("partition", t.partition(32), lambda src: __batches(src, 32), False),
+    Case("take_nth", t.take_nth(7), lambda src: list(islice(src, 0, None, 7))),
+]
+
+# sources, as functions creating a fresh source of a given size (and its
+# values for the baseline)
+SOURCES: Dict[str, Callable[[int], Callable[[], Tuple[Iterable, Iterable]]]] = {
+    "list": lambda n: (lambda l: lambda: (l, l))(list(range(n))),
+    "range": lambda n: lambda: (range(n), range(n)),
+    "dict": lambda n: (lambda d: lambda: (d, d.items()))(dict.fromkeys(range(n))),
+    "generator": lambda n: lambda: (
+        (x for x in range(n)),
+        (x for x in range(n)),
+    ),
+}
+
+MODES = {
+    "transduce": lambda xf, src: t.transduce(xf, t.conj, [], src),
+    "into": lambda xf, src: t.into([], xf, src),
+    "into_new": lambda xf, src: t.into_new(xf, src),
+    "fuse": lambda xf, src: t.fuse(xf)(t.conj, [], src),
+}
+
+# into_new needs a source with an `empty` collection of its own type
+INTO_NEW_SOURCES = {"list", "dict"}
+
+
+def __time(f: Callable[[], object], size: int, repeat: int) -> float:
+    """
+    Best time (in seconds) of one call to `f`.
+    """
+    number = max(1, 100000 // size)
+    return min(timeit.repeat(f, number=number, repeat=repeat)) / number
+
+
+def run(sizes: List[int], repeat: int, cases: List[Case]) -> Iterable[Dict]:
+    for size in sizes:
+        for source, make in SOURCES.items():
+            fresh = make(size)
+            for case in cases:
+                baseline = __time(lambda: case.baseline(fresh()[1]), size, repeat)
+                for mode, transduce in MODES.items():
+                    if mode == "into_new" and (
+                        source not in INTO_NEW_SOURCES
+                        or (source == "dict" and not case.same_values)
+                    ):
+                        continue
+                    seconds = __time(
+                        lambda: transduce(case.xform, fresh()[0]), size, repeat
+                    )
+                    yield {
+                        "case": case.name,
+                        "mode": mode,
+                        "source": source,
+                        "size": size,
+                        "seconds": seconds,
+                        "ns_per_element": seconds / size * 1e9,
+                        "baseline_seconds": baseline,
+                        "ratio": seconds / baseline,
+                    }
+
+
+def __key(result: Dict) -> Tuple:
+    return (result["case"], result["mode"], result["source"], result["size"])
+
+
+def compare(old: Iterable[Dict], new: Iterable[Dict], threshold: float) -> int:
+    """
+    Print the change of each result from `old` to `new` (as the change in its
+    ratio to the baseline, which is less sensitive to the machine than
+    absolute times). Returns the number of regressions beyond `threshold`.
+    """
+    previous = {__key(r): r for r in old if "case" in r}
+    regressions = 0
+    for result in new:
+        before = previous.get(__key(result))
+        if before is None:
+            continue
+        change = result["ratio"] / before["ratio"] - 1
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        name = "/".join(str(k) for k in __key(result))
+        print(
+            f"{name:<40} {before['ratio']:8.2f}x -> {result['ratio']:8.2f}x "
+            f"({change:+.1%}){flag}",
+            file=sys.stderr,
+        )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000,100000",
+        help="comma separated input sizes (e.g. 1000,...,10000000)",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cases", help="comma separated case names (default all)")
+    parser.add_argument("--output", help="write results (JSON Lines) to this file")
+    parser.add_argument("--compare", help="results (JSON Lines) of a previous run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown counted as a regression by --compare",
+    )
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    cases = CASES
+    if args.cases:
+        names = set(args.cases.split(","))
+        cases = [case for case in CASES if case.name in names]
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    results = []
+    try:
+        meta = {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+        }
+        print(json.dumps(meta), file=out, flush=True)
+        for result in run(sizes, args.repeat, cases):
+            results.append(result)
+            print(json.dumps(result), file=out, flush=True)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = [json.loads(line) for line in f if line.strip()]
+        if compare(old, results, args.threshold):
+            sys.exit(1)
@@ -1,3 +1,15 @@
 from tests.protocols import *
 from tests.utils import *
 from tests.transducers import *
+from tests.fused import *
+from tests.chunked import *
+from tests.arrays import *
+from tests.parallel import *
+from tests.aio import *
+from tests.persistent import *
+from tests.debug import *
+from tests.membership import *
+from tests.rolling import *
+from tests.caching import *
+from tests.files import *
+from tests.merging import *
@@ -0,0 +1,102 @@
+import asyncio
+import unittest
+
+import transducers as t
+import transducers.aio as ta
+import transducers.utils as u
+
+
+async def arange(n, seen=None):
+    for x in range(n):
+        if seen is not None:
+            seen.append(x)
+        await asyncio.sleep(0)
+        yield x
+
+
+async def slow_square(x):
+    await asyncio.sleep((5 - x % 5) / 1000)
+    return x * x
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class AsyncTests(unittest.TestCase):
+    def test_atransduce(self):
+        xf = t.comp(t.filter(lambda x: x % 2 == 1), t.map(lambda x: x + 1))
+        self.assertEqual(6, run(ta.atransduce(xf, lambda x, y: x + y, 0, arange(5))))
+        # regular iterables work too
+        self.assertEqual(106, run(ta.atransduce(xf, u.add, 100, range(5))))
+
+    def test_ainto(self):
+        self.assertEqual([0, 1, 2], run(ta.ainto([], arange(3))))
+        xf = t.comp(t.partition(2), t.map(u.sum))
+        self.assertEqual([1, 5, 4], run(ta.ainto([], xf, arange(5))))
+        xf = t.map(lambda c: c.upper())
+        self.assertEqual("ABC", run(ta.ainto("", xf, "abc")))
+
+    def test_reduced_cancels_source(self):
+        seen = []
+        xf = t.comp(t.map(lambda x: x * 10), t.take(3))
+        self.assertEqual([0, 10, 20], run(ta.ainto([], xf, arange(100, seen))))
+        self.assertEqual([0, 1, 2], seen)
+
+    def test_reduced_closes_source(self):
+        closed = []
+
+        async def source():
+            try:
+                for x in range(100):
+                    yield x
+            finally:
+                closed.append(True)
+
+        async def closed_after(xf):
+            closed.clear()
+            res = await ta.ainto([], xf, source())
+            return res, list(closed)
+
+        self.assertEqual(([0, 1, 2], [True]), run(closed_after(t.take(3))))
+        xf = t.comp(ta.amap(slow_square), t.take(2))
+        self.assertEqual(([0, 1], [True]), run(closed_after(xf)))
+
+    def test_long_sync_runs(self):
+        dbl = t.map(lambda x: x * 2)
+        inc = t.map(lambda x: x + 1)
+        xf = t.comp(dbl, inc, inc, inc, inc, ta.amap(slow_square))
+        self.assertEqual([16, 36], run(ta.ainto([], xf, arange(2))))
+
+    def test_amap(self):
+        xf = t.comp(
+            t.filter(lambda x: x % 2 == 0),
+            ta.amap(slow_square, limit=4),
+            t.map(lambda x: x + 1),
+            t.take(5),
+        )
+        self.assertEqual([1, 5, 17, 37, 65], run(ta.ainto([], xf, arange(1000))))
+
+        async def squares():
+            return [x async for x in ta.amap(slow_square, arange(10), limit=3)]
+
+        self.assertEqual([x * x for x in range(10)], run(squares()))
+
+    def test_amap_limit(self):
+        running = 0
+        most = 0
+
+        async def track(x):
+            nonlocal running, most
+            running += 1
+            most = max(most, running)
+            await asyncio.sleep(0.001)
+            running -= 1
+            return x
+
+        xf = t.comp(ta.amap(track, limit=3), t.concat())
+        self.assertEqual([0, 1, 2, 3], run(ta.ainto([], xf, [[0, 1], [2], [], [3]])))
+        self.assertLessEqual(most, 3)
+
+    def test_amap_sync(self):
+        self.assertRaises(TypeError, t.into, [], ta.amap(slow_square), range(3))
@@ -0,0 +1,98 @@
+import unittest
+
+import transducers as t
+import transducers.arrays as a
+from transducers.transducers import identity
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+
+@unittest.skipIf(np is None, "requires numpy")
+class ArraysTests(unittest.TestCase):
+    def assertVectorizesLike(self, xf, coll):
+        expected = t.into([], xf, list(coll))
+        self.assertEqual(expected, a.into([], xf, coll))
+        self.assertEqual(expected, a.transduce(xf, t.conj, [], coll))
+
+    def test_vectorize(self):
+        xf = t.comp(
+            t.map(a.vectorized(lambda x: x * 2)),
+            t.filter(a.vectorized(lambda x: x % 3 == 0)),
+            t.take(4),
+        )
+        res, rest = a.vectorize(xf, np.arange(100))
+        self.assertTrue(isinstance(res, np.ndarray))
+        self.assertEqual([0, 6, 12, 18], res.tolist())
+        self.assertTrue(rest is identity)
+
+    def test_matches_transduce(self):
+        coll = np.array([3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5, 8, 9, 7, 9, 3])
+        self.assertVectorizesLike(t.map(np.negative), coll)
+        self.assertVectorizesLike(t.map(a.vectorized(lambda x: x + 1)), coll)
+        self.assertVectorizesLike(t.remove(a.vectorized(lambda x: x > 4)), coll)
+        self.assertVectorizesLike(t.comp(t.drop(3), t.take_nth(2)), coll)
+        self.assertVectorizesLike(t.comp(t.distinct(), t.take(5)), coll)
+        self.assertVectorizesLike(t.comp(t.distinct(), t.drop(50)), coll)
+
+    def test_fallback(self):
+        coll = np.arange(20)
+        # functions which don't opt in run per element
+        xf = t.comp(
+            t.map(a.vectorized(lambda x: x * 3)),
+            t.map(lambda x: x if x % 2 else -x),
+            t.filter(a.vectorized(lambda x: x > 5)),
+            t.dedupe(),
+        )
+        res, rest = a.vectorize(xf, coll)
+        self.assertEqual(list(range(0, 60, 3)), res.tolist())
+        self.assertEqual(
+            [9, 15, 21, 27, 33, 39, 45, 51, 57], t.into([], rest, res)
+        )
+        self.assertVectorizesLike(xf, coll)
+
+    def test_fallback_values(self):
+        dbl = t.map(lambda x: x * 2)
+        inc = t.map(lambda x: x + 1)
+        xf = t.comp(t.comp(t.dedupe(), dbl), t.comp(inc, inc, inc, inc))
+        self.assertEqual([6], a.into([], xf, np.array([1])))
+        self.assertEqual([6], a.transduce(xf, t.conj, [], np.array([1])))
+        # values transduced per element are Python values, like with `into`
+        xf = t.comp(t.map(lambda x: x if x % 2 else -x), t.take(2))
+        self.assertEqual([int, int], [type(x) for x in a.into([], xf, np.arange(3))])
+
+    def test_python_semantics(self):
+        # functions which don't opt in are never called with the array
+        calls = []
+
+        def power(x):
+            calls.append(x)
+            return x ** 40
+
+        self.assertEqual([3 ** 40, 4 ** 40], a.into([], t.map(power), np.arange(3, 5)))
+        self.assertEqual(2, len(calls))
+        with self.assertRaises(ZeroDivisionError):
+            a.into([], t.map(lambda x: 10 // x), np.arange(3))
+        with self.assertRaises(ValueError):
+            a.into([], t.map(a.vectorized(np.sum)), np.arange(3))
+
+    def test_partition(self):
+        parts = a.into([], t.comp(t.drop(1), t.partition(3)), np.arange(8))
+        self.assertEqual([[1, 2, 3], [4, 5, 6], [7]], [p.tolist() for p in parts])
+        xf = t.comp(t.partition(4), t.map(lambda p: int(p.sum())))
+        self.assertEqual([6, 22, 17], a.into([], xf, np.arange(10)))
+
+    def test_partition_views(self):
+        coll = np.arange(10)
+        parts = list(t.partition(4, coll, views=True))
+        self.assertEqual(
+            [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]], [p.tolist() for p in parts]
+        )
+        self.assertTrue(all(p.base is coll for p in parts))
+
+    def test_not_an_array(self):
+        xf = t.map(lambda x: x + 1)
+        self.assertEqual([1, 2, 3], a.into([], xf, range(3)))
+        self.assertEqual(6, a.transduce(xf, lambda x, y: x + y, 0, range(3)))
@@ -0,0 +1,114 @@
+import unittest
+
+import transducers as t
+from transducers.caching import Cache
+
+
+class CountingFn:
+    def __init__(self, f):
+        self.f = f
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.f(*args)
+
+
+class CacheTests(unittest.TestCase):
+    def test_lru(self):
+        cache = Cache(max_size=2)
+        f = CountingFn(lambda x: x * 10)
+        memo = cache.memoize(f)
+        res = [memo(x) for x in [1, 2, 1, 3, 2, 1]]
+        self.assertEqual([10, 20, 10, 30, 20, 10], res)
+        # 3 evicts 2 (1 was used more recently), 2 evicts 1, 1 evicts 3
+        self.assertEqual(5, f.calls)
+        self.assertEqual(
+            {"hits": 1, "misses": 5, "evictions": 3, "hit_rate": 1 / 6},
+            cache.stats.snapshot(),
+        )
+        self.assertEqual(2, len(cache))
+
+    def test_lfu(self):
+        cache = Cache(max_size=2, policy="lfu")
+        f = CountingFn(lambda x: x * 10)
+        memo = cache.memoize(f)
+        for x in [1, 1, 1, 2, 3, 2, 1]:
+            memo(x)
+        # 3 evicts 2 (used less than 1), 2 evicts 3 (the least recently used
+        # of the values used once)
+        self.assertEqual(4, f.calls)
+        self.assertEqual({1, 2}, set(cache.values))
+
+    def test_max_bytes(self):
+        cache = Cache(max_size=None, max_bytes=1000)
+        memo = cache.memoize(lambda n: "x" * n)
+        for n in range(100, 110):
+            memo(n)
+        self.assertLessEqual(cache.bytes, 1000)
+        # (each result is about 150 bytes)
+        self.assertEqual(4, cache.stats.evictions)
+        # results larger than the cache aren't cached
+        memo(2000)
+        memo(2000)
+        self.assertEqual(0, cache.stats.hits)
+
+    def test_key(self):
+        cache = Cache(key=lambda s: s.lower())
+        f = CountingFn(str.strip)
+        res = t.into([], t.map(f, cache=cache), ["a", "A", "b"])
+        self.assertEqual(["a", "a", "b"], res)
+        self.assertEqual(2, f.calls)
+
+    def test_one_function(self):
+        cache = Cache()
+
+        def double(x):
+            return x * 2
+
+        t.into([], t.map(double, cache=cache), [1, 2])
+        # the same function can be memoized again
+        self.assertEqual([4], t.into([], t.map(double, cache=cache), [2]))
+        with self.assertRaises(ValueError):
+            t.map(lambda x: x * 3, cache=cache)
+        cache.clear()
+        self.assertEqual([6], t.into([], t.map(lambda x: x * 3, cache=cache), [2]))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Cache(policy="fifo")
+        with self.assertRaises(ValueError):
+            Cache(scope="process")
+
+
+class CachedTransducerTests(unittest.TestCase):
+    def test_shared(self):
+        cache = Cache()
+        f = CountingFn(lambda x: x % 3)
+        xf = t.map(f, cache=cache)
+        self.assertEqual([0, 1, 2, 0, 1], t.into([], xf, range(5)))
+        self.assertEqual([0, 1, 2, 0, 1], t.into([], xf, range(5)))
+        self.assertEqual(5, f.calls)
+        self.assertEqual(5, cache.stats.hits)
+        # the memoized function is a regular map stage
+        self.assertEqual("map", t.transducers.stages_of(xf)[0][0])
+
+    def test_transduction_scope(self):
+        cache = Cache(scope="transduction")
+        f = CountingFn(lambda x: x % 3)
+        xf = t.keep(f, cache=cache)
+        self.assertEqual([0, 1, 2, 0, 1], t.into([], xf, range(5)))
+        self.assertEqual([0, 1, 2, 0, 1], t.into([], xf, range(5)))
+        self.assertEqual(10, f.calls)
+        self.assertEqual(0, len(cache))
+        # counted on the cache passed in
+        self.assertEqual(10, cache.stats.misses)
+
+    def test_generators(self):
+        cache = Cache(scope="transduction")
+        f = CountingFn(lambda x: None if x % 2 else x)
+        self.assertEqual([0, 2, 0], list(t.keep(f, [0, 1, 2, 0, 1], cache=cache)))
+        self.assertEqual(3, f.calls)
+        add = CountingFn(lambda x, y: x + y)
+        self.assertEqual([3, 3], list(t.map(add, [1, 1], [2, 2], cache=cache)))
+        self.assertEqual(1, add.calls)
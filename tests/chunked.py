@@ -0,0 +1,71 @@
+import unittest
+
+import transducers as t
+import transducers.chunked as c
+import transducers.utils as u
+
+
+def square(x):
+    return x ** 2
+
+
+class ChunkedTests(unittest.TestCase):
+    def test_chunks(self):
+        self.assertEqual([range(0, 3), range(3, 5)], list(c.chunks(range(5), 3)))
+        self.assertEqual([[0, 1, 2], [3, 4]], list(c.chunks(iter(range(5)), 3)))
+        self.assertEqual([[(1, 2)], [(3, 4)]], list(c.chunks({1: 2, 3: 4}, 1)))
+        self.assertEqual([], list(c.chunks([], 3)))
+
+    def test_transduce(self):
+        xf = t.comp(t.filter(lambda x: x % 2 == 1), t.map(lambda x: x + 1))
+        self.assertEqual(6, c.transduce(xf, lambda x, y: x + y, 0, range(5)))
+        self.assertEqual(106, c.transduce(xf, u.add, 100, range(5), chunk_size=2))
+
+    def test_matches_transduce(self):
+        xfs = [
+            t.map(square),
+            t.comp(t.remove(lambda x: x % 3), t.take(7)),
+            t.comp(t.keep(lambda x: x if x % 5 else None), t.drop(3), t.take(9)),
+            t.comp(t.map(lambda x: x % 7), t.distinct(), t.map(square)),
+            t.comp(t.drop(2), t.partition(4), t.take(3), t.map(u.sum)),
+            t.comp(t.take(20), t.partition(3), t.take_nth(2)),
+            t.comp(t.concat(), t.map(square), t.take(5)),
+        ]
+        for xf in xfs:
+            for n in [0, 1, 10, 63, 64, 100]:
+                source = [[x] for x in range(n)] if xf is xfs[-1] else range(n)
+                for size in [1, 3, 32]:
+                    self.assertEqual(
+                        t.transduce(xf, t.conj, [], source),
+                        c.transduce(xf, t.conj, [], source, chunk_size=size),
+                    )
+                    self.assertEqual(
+                        t.into([], xf, source), c.into([], xf, source, size)
+                    )
+
+    def test_long_per_element_runs(self):
+        # a run of 5 stages without a chunk aware version keeps its order
+        dbl = t.map_indexed(lambda i, x: x * 2)
+        inc = t.map_indexed(lambda i, x: x + 1)
+        xf = t.comp(dbl, inc, inc, inc, inc)
+        self.assertEqual([6], t.into([], xf, [1]))
+        self.assertEqual([6], c.into([], xf, [1]))
+        self.assertEqual([6], c.transduce(xf, t.conj, [], [1]))
+
+    def test_take_stops_reading(self):
+        seen = []
+
+        def source():
+            for x in range(1000):
+                seen.append(x)
+                yield x
+
+        xf = t.comp(t.map(square), t.take(5))
+        self.assertEqual([0, 1, 4, 9, 16], c.into([], xf, source(), 4))
+        self.assertEqual(list(range(8)), seen)
+
+    def test_into(self):
+        xf = t.map(lambda c: c.upper())
+        self.assertEqual("HELLO", c.into("", xf, "hello", 2))
+        xf = t.map(lambda kv: kv[::-1])
+        self.assertEqual({2: 1, 4: 3}, c.into({}, xf, {1: 2, 3: 4}))
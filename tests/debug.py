@@ -0,0 +1,138 @@
+import cProfile
+import pstats
+import sys
+import unittest
+import warnings
+
+import transducers as t
+import transducers.debug as d
+from transducers.transducers import can_short_circuit
+import transducers.transducers as tt
+import transducers.utils as u
+
+
+class InstrumentTests(unittest.TestCase):
+    def test_instrument(self):
+        xf = d.instrument(t.filter(lambda x: x % 4 == 0), sample_every=1)
+        self.assertEqual("filter", xf.stats.name)
+        self.assertEqual([0, 4, 8], t.into([], xf, range(10)))
+        snap = d.snapshot(xf)[0]
+        self.assertEqual(10, snap["inputs"])
+        self.assertEqual(3, snap["outputs"])
+        self.assertEqual(0.3, snap["selectivity"])
+        self.assertEqual(1, snap["completions"])
+        self.assertEqual(10, snap["samples"])
+        self.assertGreater(snap["cumulative_time"], 0)
+        self.assertGreaterEqual(snap["cumulative_time"], snap["time"])
+
+        # counts accumulate over transductions until reset
+        t.into([], xf, range(10))
+        self.assertEqual(20, xf.stats.inputs)
+        xf.stats.reset()
+        self.assertEqual(0, d.snapshot(xf)[0]["inputs"])
+
+    def test_instrument_stages(self):
+        xf = d.instrument_stages(
+            t.comp(t.map(lambda x: x + 1), t.partition(3), t.take(2)), name="job"
+        )
+        self.assertEqual([[1, 2, 3], [4, 5, 6]], t.into([], xf, range(100)))
+        snaps = d.snapshot(xf)
+        names = ["job/0:map", "job/1:partition", "job/2:take"]
+        self.assertEqual(names, [s["name"] for s in snaps])
+        self.assertEqual([6, 6, 2], [s["inputs"] for s in snaps])
+        self.assertEqual([6, 2, 2], [s["outputs"] for s in snaps])
+        self.assertEqual([0, 0, 1], [s["reduced"] for s in snaps])
+
+    def test_instrument_long_pipeline(self):
+        dbl = t.map(lambda x: x * 2)
+        inc = t.map(lambda x: x + 1)
+        xf = t.comp(t.comp(dbl, inc), t.comp(inc, inc, inc))
+        self.assertEqual([6], t.into([], d.instrument_stages(xf), [1]))
+
+    def test_instrument_keeps_fast_path(self):
+        self.assertFalse(tt.can_short_circuit(d.instrument_stages(t.map(abs))))
+        self.assertTrue(tt.can_short_circuit(d.instrument_stages(t.take(1))))
+
+    def test_profiler_names(self):
+        xf = d.instrument_stages(t.comp(t.map(abs), t.filter(bool)), name="p")
+        profile = cProfile.Profile()
+        profile.runcall(t.into, [], xf, range(100))
+        names = {name for (_, _, name) in pstats.Stats(profile).stats}
+        self.assertIn("stage:p/0:map", names)
+        self.assertIn("stage:p/1:filter", names)
+
+
+class GaugeTests(unittest.TestCase):
+    def test_distinct(self):
+        xf = d.gauge(t.comp(t.map(lambda x: x % 100), t.distinct()), sample_every=10)
+        self.assertEqual(list(range(100)), t.into([], xf, range(1000)))
+        map_gauge, distinct_gauge = xf.gauges
+        self.assertEqual(0, map_gauge.samples)
+        snap = distinct_gauge.snapshot()
+        self.assertEqual("1:distinct", snap["name"])
+        self.assertEqual(1000, snap["values"])
+        self.assertEqual(101, snap["samples"])
+        self.assertEqual(100, snap["entries"])
+        self.assertEqual(100, snap["peak_entries"])
+        self.assertGreater(snap["peak_bytes"], 100 * 24)
+
+    def test_partition(self):
+        xf = d.gauge(t.partition(4), name="batches", sample_every=1)
+        self.assertEqual([[0, 1, 2, 3], [4]], t.into([], xf, range(5)))
+        (g,) = xf.gauges
+        self.assertEqual("batches/0:partition", g.name)
+        self.assertEqual(3, g.peak_entries)
+        # measured on completion, before flushing
+        self.assertEqual(1, g.entries)
+
+    def test_exceeded(self):
+        xf = d.gauge(t.distinct(), sample_every=1, max_entries=10)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            t.into([], xf, range(20))
+        self.assertEqual(1, len(caught))
+        self.assertIs(ResourceWarning, caught[0].category)
+
+        xf = d.gauge(t.distinct(), max_bytes=1000, on_exceed="raise")
+        with self.assertRaises(MemoryError):
+            t.into([], xf, range(1000))
+        with self.assertRaises(ValueError):
+            d.gauge(t.distinct(), on_exceed="ignore")
+
+    def test_long_pipeline(self):
+        dbl = t.map(lambda x: x * 2)
+        inc = t.map(lambda x: x + 1)
+        xf = t.comp(t.comp(dbl, t.distinct()), t.comp(inc, inc, inc, inc))
+        self.assertEqual([6], t.into([], d.gauge(xf), [1]))
+
+    def test_no_stages(self):
+        xf = d.gauge(tt.identity)
+        self.assertEqual([], xf.gauges)
+        self.assertFalse(hasattr(tt.identity, "gauges"))
+        self.assertFalse(can_short_circuit(xf))
+        self.assertEqual([1, 2], t.into([], xf, [1, 2]))
+
+    def test_keeps_short_circuit(self):
+        self.assertFalse(can_short_circuit(d.gauge(t.distinct())))
+        self.assertTrue(can_short_circuit(d.gauge(t.take(1))))
+
+    def test_group_by(self):
+        g = d.StateGauge("groups", sample_every=10)
+        groups = u.group_by(lambda x: x % 3, range(100), gauge=g)
+        self.assertEqual(list(range(0, 100, 3)), groups[0])
+        self.assertEqual(3, g.entries)
+        self.assertEqual(11, g.samples)
+        self.assertGreater(g.bytes, 100 * 24)
+
+    def test_chunked_conj(self):
+        g = d.StateGauge("conj", sample_every=1)
+        rf = d.gauge_rf(t.chunked_conj(), g)
+        self.assertEqual((0, 1, 2), t.transduce(t.map(lambda x: x), rf, (), range(3)))
+        self.assertEqual(4, g.samples)
+        self.assertEqual(3, g.peak_entries)
+
+    def test_approximate_size(self):
+        self.assertEqual(sys.getsizeof(b"abc"), d.approximate_size(b"abc"))
+        small = d.approximate_size([[0] * 10])
+        large = d.approximate_size([[0] * 10] * 100)
+        self.assertGreater(large, 50 * small)
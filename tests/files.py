@@ -0,0 +1,174 @@
+import io
+import os
+import struct
+import tempfile
+import unittest
+
+import transducers as t
+import transducers.files as f
+
+
+class FileSourceTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def write(self, name: str, data: bytes) -> str:
+        path = os.path.join(self.dir.name, name)
+        with open(path, "wb") as out:
+            out.write(data)
+        return path
+
+    def test_lines(self):
+        text = "".join(f"line {i}\n" for i in range(1000)) + "last"
+        path = self.write("lines.txt", text.encode())
+        expected = text.split("\n")
+        # blocks which split lines
+        for block_size in (7, 64, 0):
+            src = f.lines(path, encoding="utf-8", block_size=block_size)
+            self.assertEqual(expected, t.into([], src))
+            self.assertEqual(expected, list(src))
+        self.assertEqual(
+            [b"line 1", b"line 11"],
+            t.into([], t.filter(lambda l: l.endswith(b"1")), f.lines(path))[:2],
+        )
+
+    def test_crlf(self):
+        path = self.write("crlf.txt", b"a\r\nb\r\n\r\nc")
+        self.assertEqual([b"a", b"b", b"", b"c"], list(f.lines(path, block_size=3)))
+        # CRLFs straddling blocks
+        path = self.write("straddle.txt", b"abc\r\ndef\r\n")
+        for block_size in (1, 2, 4, 5):
+            src = f.lines(path, block_size=block_size)
+            self.assertEqual([b"abc", b"def"], list(src))
+
+    def test_encoded(self):
+        text = "ünï\r\ncödé\n\nλ\r\n€"
+        path = self.write("utf8.txt", text.encode())
+        # blocks which split characters and CRLFs
+        for block_size in (1, 2, 3, 5, 0):
+            src = f.lines(path, encoding="utf-8", block_size=block_size)
+            self.assertEqual(["ünï", "cödé", "", "λ", "€"], list(src))
+
+    def test_empty(self):
+        path = self.write("empty.txt", b"")
+        self.assertEqual([], t.into([], f.lines(path)))
+        self.assertEqual([], list(f.records(path, "<i")))
+
+    def test_reduced(self):
+        path = self.write("lines.txt", b"\n".join(b"x" * 10 for _ in range(10000)))
+        read = []
+
+        class CountingLines(f.Lines):
+            def batches(self):
+                for batch in super().batches():
+                    read.append(batch)
+                    yield batch
+
+        src = CountingLines(path, block_size=1024)
+        self.assertEqual(3, len(t.into([], t.take(3), src)))
+        self.assertEqual(1, len(read))
+
+    def test_records(self):
+        data = b"".join(struct.pack("<iH", i, i * 2) for i in range(1000))
+        path = self.write("records.bin", data)
+        for block_size in (6, 100, 0):
+            src = f.records(path, "<iH", block_size=block_size)
+            self.assertEqual([(i, i * 2) for i in range(1000)], t.into([], src))
+        xf = t.comp(t.map(lambda r: r[1]), t.take(3))
+        self.assertEqual([0, 2, 4], t.into([], xf, f.records(path, "<iH")))
+
+        path = self.write("partial.bin", data + b"\0")
+        with self.assertRaises(ValueError):
+            t.into([], f.records(path, "<iH"))
+
+
+class FileSinkTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.dir.name, name)
+
+    def test_lines(self):
+        path = self.path("out.txt")
+        writes = []
+        with f.lines_sink(path, buffer_size=100) as sink:
+            stream_writelines = sink.write_all
+
+            def counting(parts):
+                writes.append(len(parts))
+                stream_writelines(parts)
+
+            sink.write_all = counting
+            self.assertIs(sink, t.into(sink, t.map(lambda x: x * 2), range(250)))
+            # conjoining writes right away
+            t.conj(sink, "end")
+        self.assertEqual([100, 100, 50, 1], writes)
+        with open(path) as text:
+            expected = [str(x * 2) for x in range(250)] + ["end"]
+            self.assertEqual(expected, text.read().split())
+
+    def test_compressed(self):
+        for suffix in (".gz", ".bz2", ".xz"):
+            path = self.path("out.txt" + suffix)
+            with f.lines_sink(path, binary=True) as sink:
+                t.into(sink, t.map(lambda x: b"%d" % x), range(1000))
+            res = t.into([], f.lines(path, block_size=100))
+            self.assertEqual([b"%d" % x for x in range(1000)], res)
+        with open(path, "rb") as raw:
+            self.assertNotEqual(b"0\n", raw.read(2))
+
+    def test_jsonl(self):
+        values = [{"id": i, "tags": ["a"] * (i % 3)} for i in range(100)]
+        for name in ("out.jsonl", "out.jsonl.gz"):
+            path = self.path(name)
+            with f.jsonl_sink(path, buffer_size=7) as sink:
+                t.into(sink, values)
+            self.assertEqual(values, t.into([], f.jsonl(path, block_size=64)))
+            xf = t.comp(t.map(lambda v: v["id"]), t.take(3))
+            self.assertEqual([0, 1, 2], t.into([], xf, f.jsonl(path)))
+
+    def test_csv(self):
+        path = self.path("out.csv")
+        rows = [[str(i), f"name, {i}", "multi\nline"] for i in range(10)]
+        with f.csv_sink(path) as sink:
+            t.into(sink, rows)
+        self.assertEqual(rows, t.into([], f.csv_rows(path)))
+        # blocks which split characters, CRLFs and quoted fields
+        rows = [["ünï", "cödé\r\nλ", "€"]] * 3
+        with f.csv_sink(path) as sink:
+            t.into(sink, rows)
+        for block_size in (1, 2, 3, 7):
+            self.assertEqual(rows, list(f.csv_rows(path, block_size=block_size)))
+
+        path = self.path("out.csv.bz2")
+        with f.csv_sink(path, header=["id", "name"]) as sink:
+            t.into(sink, t.map(lambda i: {"id": i, "name": f"n{i}"}), range(3))
+        self.assertEqual(
+            [{"id": "0", "name": "n0"}, {"id": "1", "name": "n1"}],
+            t.into([], t.take(2), f.csv_rows(path, dicts=True)),
+        )
+
+    def test_jsonl_value_per_line(self):
+        path = self.path("values.jsonl")
+        with open(path, "w") as out:
+            out.write('1\n\n "two" \r\n')
+        self.assertEqual([1, "two"], list(f.jsonl(path)))
+        for text in ("1,2\n", '{"a":\n1}\n', '"a\n",\n"b"\n'):
+            with open(path, "w") as out:
+                out.write(text)
+            with self.assertRaises(ValueError):
+                list(f.jsonl(path))
+
+    def test_stream(self):
+        out = io.StringIO()
+        sink = f.jsonl_sink(out)
+        t.into(sink, [1, "two", None])
+        sink.close()
+        self.assertEqual('1\n"two"\nnull\n', out.getvalue())
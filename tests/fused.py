@@ -0,0 +1,91 @@
+import unittest
+
+import transducers as t
+import transducers.fused as fz
+import transducers.transducers as tt
+import transducers.utils as u
+
+
+def square(x):
+    return x ** 2
+
+
+class FuseTests(unittest.TestCase):
+    def assertFusesLike(self, xf, f, init, coll):
+        self.assertEqual(t.transduce(xf, f, init(), coll), t.fuse(xf)(f, init(), coll))
+
+    def test_fuse(self):
+        xf = t.comp(t.map(square), t.filter(lambda x: x % 3 == 0), t.take(5))
+        self.assertEqual([0, 9, 36, 81, 144], t.fuse(xf)(t.conj, [], range(100)))
+        self.assertEqual(270, t.fuse(xf)(u.add, 0, range(100)))
+
+    def test_fuse_matches_transduce(self):
+        xfs = [
+            t.map(square),
+            t.comp(t.remove(lambda x: x % 2), t.map_indexed(lambda i, x: (i, x))),
+            t.comp(t.keep(lambda x: x if x % 5 else None), t.drop(3), t.take(7)),
+            t.comp(t.map(lambda x: x % 7), t.distinct(), t.take_nth(2)),
+            t.comp(t.map(lambda x: x // 3), t.dedupe(), t.partition(4)),
+            t.comp(t.partition(3), t.take_nth(7)),
+            t.comp(t.partition(5), t.map(u.sum), t.partition(3), t.take(4)),
+            t.comp(t.drop(10), t.partition(4), t.take(100)),
+        ]
+        for xf in xfs:
+            for n in [0, 1, 10, 63, 64, 100]:
+                self.assertFusesLike(xf, t.conj, list, range(n))
+
+    def test_fuse_long_comp(self):
+        dbl = t.map(lambda x: x * 2)
+        inc = t.map(lambda x: x + 1)
+        flat = t.comp(dbl, inc, inc, inc, inc)
+        nested = t.comp(t.comp(dbl, inc), t.comp(inc, inc, inc))
+        for xf in [flat, nested]:
+            self.assertEqual([6], t.transduce(xf, t.conj, [], [1]))
+            self.assertEqual([6], t.fuse(xf)(t.conj, [], [1]))
+
+    def test_fuse_reduced_rf(self):
+        def until_3(acc, *xs):
+            if not xs:
+                return acc
+            acc = acc + [xs[0]]
+            return tt.Reduced(acc) if len(acc) == 3 else acc
+
+        xf = t.comp(t.map(square), t.filter(lambda x: x % 2))
+        self.assertEqual([1, 9, 25], t.fuse(xf)(until_3, [], range(100)))
+        # stages halting the loop without a short circuiting reducing function
+        xf = t.comp(t.map(square), t.take(3))
+        self.assertEqual([0, 1, 4], t.fuse(xf)(t.conj, [], range(100)))
+
+    def test_fuse_conj(self):
+        xf = t.comp(t.map(square), t.take_nth(2))
+        for init in [list, tuple, set, frozenset]:
+            self.assertFusesLike(xf, t.conj, init, range(7))
+        xf = t.comp(t.map(str), t.take(12))
+        self.assertFusesLike(xf, t.conj, str, range(100))
+        xf = t.map(lambda x: (x, square(x)))
+        self.assertFusesLike(xf, t.conj, dict, range(10))
+
+    def test_fuse_cache(self):
+        xf1 = t.comp(t.map(square), t.take(3))
+        xf2 = t.comp(t.map(lambda x: -x), t.take(2))
+        self.assertEqual([0, 1, 4], t.fuse(xf1)(t.conj, [], range(10)))
+        self.assertEqual([0, -1], t.fuse(xf2)(t.conj, [], range(10)))
+        shape = ("map", "take")
+        self.assertIs(fz.compile_shape(shape), fz.compile_shape(shape))
+
+    def test_fuse_fallback(self):
+        xf = t.comp(t.concat(), t.map(square))
+        self.assertEqual(["xform", "map"], [name for name, _, _ in xf.stages])
+        self.assertEqual([0, 1, 0, 1, 4], t.fuse(xf)(t.conj, [], [range(2), range(3)]))
+
+    def test_fuse_take_stops_reading(self):
+        seen = []
+
+        def source():
+            for x in range(100):
+                seen.append(x)
+                yield x
+
+        xf = t.comp(t.filter(lambda x: x % 2), t.take(3))
+        self.assertEqual([1, 3, 5], t.fuse(xf)(t.conj, [], source()))
+        self.assertEqual(list(range(6)), seen)
@@ -0,0 +1,61 @@
+import sys
+import unittest
+
+import transducers.membership as m
+
+
+class WindowTests(unittest.TestCase):
+    def test_bounded(self):
+        w = m.Window(100)
+        for x in range(10000):
+            self.assertTrue(w.add(x))
+        self.assertEqual(100, len(w))
+        self.assertEqual(list(range(9900, 10000)), list(w))
+        self.assertIn(9950, w)
+        self.assertNotIn(0, w)
+        self.assertFalse(w.add(9950))
+        self.assertTrue(w.add(0))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            m.Window(0)
+
+
+class BloomFilterTests(unittest.TestCase):
+    def test_sizing(self):
+        b = m.BloomFilter(10000, 0.01)
+        # about 9.6 bits and 7 hashes per value
+        self.assertEqual(95851, b.size)
+        self.assertEqual(7, b.hashes)
+        self.assertLess(sys.getsizeof(b), 13000)
+
+    def test_false_positive_rate(self):
+        b = m.BloomFilter(10000, 0.01)
+        for x in range(10000):
+            b.add(x)
+        false_positives = sum(x in b for x in range(10000, 20000))
+        self.assertLess(false_positives, 200)
+        # size is fixed past capacity
+        size = sys.getsizeof(b)
+        for x in range(100000):
+            b.add(x)
+        self.assertEqual(size, sys.getsizeof(b))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            m.BloomFilter(0)
+        with self.assertRaises(ValueError):
+            m.BloomFilter(10, 1.5)
+
+
+class BitmapTests(unittest.TestCase):
+    def test_bitmap(self):
+        b = m.Bitmap(1 << 20)
+        self.assertTrue(b.add(12345))
+        self.assertIn(12345, b)
+        self.assertNotIn(-1, b)
+        self.assertFalse(b.add(12345))
+        self.assertEqual(1, len(b))
+        self.assertEqual(1 << 17, len(b.bits))
+        with self.assertRaises(ValueError):
+            b.add(-1)
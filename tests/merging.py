@@ -0,0 +1,93 @@
+import random
+import unittest
+
+import transducers as t
+import transducers.merging as mg
+
+
+class MergeTests(unittest.TestCase):
+    def setUp(self):
+        rand = random.Random(7)
+        self.shards = [sorted(rand.sample(range(100), 30)) for _ in range(5)]
+
+    def test_merge_sorted(self):
+        merged = mg.merge_sorted(*self.shards)
+        self.assertEqual(sorted(x for s in self.shards for x in s), list(merged))
+        # works as a source of transduce/into, and is lazy
+        xf = t.comp(t.filter(lambda x: x % 2), t.take(3))
+        expected = sorted(x for s in self.shards for x in s if x % 2)[:3]
+        self.assertEqual(expected, t.into([], xf, mg.merge_sorted(*self.shards)))
+
+        words = [["b", "cc"], ["a", "bb", "ddd"]]
+        self.assertEqual(
+            ["b", "a", "cc", "bb", "ddd"], list(mg.merge_sorted(*words, key=len))
+        )
+        self.assertEqual([3, 2, 1], list(mg.merge_sorted([3, 1], [2], reverse=True)))
+
+    def test_set_operations(self):
+        sets = [set(s) for s in self.shards]
+        self.assertEqual(sorted(set.union(*sets)), list(mg.union(*self.shards)))
+        self.assertEqual(
+            sorted(set.intersection(*sets[:2])), list(mg.intersection(*self.shards[:2]))
+        )
+        self.assertEqual(
+            sorted(sets[0].difference(*sets[1:])),
+            list(mg.difference(*self.shards)),
+        )
+        # duplicates within a source
+        self.assertEqual([1, 2], list(mg.intersection([1, 1, 2], [1, 2, 2])))
+        self.assertEqual([3], list(mg.difference([1, 3, 3], [1, 2])))
+
+    def test_key(self):
+        a = [(1, "a"), (2, "a"), (4, "a")]
+        b = [(2, "b"), (3, "b"), (4, "b")]
+        first = lambda x: x[0]
+        self.assertEqual(
+            [(1, "a"), (2, "a"), (3, "b"), (4, "a")], list(mg.union(a, b, key=first))
+        )
+        self.assertEqual([(2, "a"), (4, "a")], list(mg.intersection(a, b, key=first)))
+        self.assertEqual([(1, "a")], list(mg.difference(a, b, key=first)))
+
+
+class MergeJoinTests(unittest.TestCase):
+    left = [(1, "a"), (2, "b"), (2, "c"), (4, "d")]
+    right = [(0, "w"), (2, "x"), (2, "y"), (3, "z")]
+
+    def join(self, how):
+        first = lambda x: x[0]
+        combine = lambda l, r: (l and l[1], r and r[1])
+        joined = mg.merge_join(self.left, self.right, first, how=how, combine=combine)
+        return list(joined)
+
+    def test_inner(self):
+        self.assertEqual(
+            [("b", "x"), ("b", "y"), ("c", "x"), ("c", "y")], self.join("inner")
+        )
+
+    def test_outer(self):
+        self.assertEqual(
+            [(None, "w"), ("a", None), ("b", "x"), ("b", "y"), ("c", "x"), ("c", "y")]
+            + [(None, "z"), ("d", None)],
+            self.join("outer"),
+        )
+        self.assertEqual(
+            [("a", None), ("b", "x"), ("b", "y"), ("c", "x"), ("c", "y"), ("d", None)],
+            self.join("left"),
+        )
+        self.assertEqual(
+            [(None, "w"), ("b", "x"), ("b", "y"), ("c", "x"), ("c", "y"), (None, "z")],
+            self.join("right"),
+        )
+
+    def test_default(self):
+        self.assertEqual([(2, 2), (3, 3)], list(mg.merge_join([1, 2, 3], [2, 3, 4])))
+        xf = t.map(lambda pair: pair[0] * 10)
+        self.assertEqual([20, 30], t.into([], xf, mg.merge_join([1, 2, 3], [2, 3, 4])))
+        with self.assertRaises(ValueError):
+            mg.merge_join([], [], how="cross")
+
+    def test_none_keys(self):
+        self.assertEqual([(None, None)], list(mg.merge_join([None], [None])))
+        left = [(None, "a"), (None, "b")]
+        joined = mg.merge_join(left, [(None, "x")], lambda x: x[0], how="outer")
+        self.assertEqual([(left[0], (None, "x")), (left[1], (None, "x"))], list(joined))
@@ -0,0 +1,127 @@
+import inspect
+import threading
+import time
+import unittest
+from unittest import mock
+
+import transducers as t
+import transducers.parallel as par
+import transducers.transducers as tt
+import transducers.utils as u
+
+
+class FoldTests(unittest.TestCase):
+    def test_fold(self):
+        xf = t.comp(t.filter(lambda x: x % 3 == 0), t.map(lambda x: x * 2))
+        expected = t.transduce(xf, u.add, 0, range(10000))
+        self.assertEqual(expected, par.fold(xf, u.add, u.add, range(10000)))
+        self.assertEqual(
+            expected,
+            par.fold(xf, u.add, u.add, list(range(10000)), n=7, workers=2),
+        )
+        # sources which can't be sliced are read into partitions
+        self.assertEqual(
+            expected,
+            par.fold(xf, u.add, u.add, iter(range(10000)), n=100, workers=2),
+        )
+
+    def test_fold_combine(self):
+        def combine(*args):
+            return [] if not args else args[0] + args[1]
+
+        xf = t.map(lambda x: x * x)
+        res = par.fold(xf, t.conj, combine, range(1000), n=64, workers=3)
+        self.assertEqual([x * x for x in range(1000)], res)
+
+    def test_fold_completes_once(self):
+        def joined(acc, *xs):
+            return acc + [str(xs[0])] if xs else ",".join(acc)
+
+        def combine(*args):
+            return [] if not args else args[0] + args[1]
+
+        xf = t.map(lambda x: x * x)
+        expected = t.transduce(xf, joined, [], range(100))
+        self.assertEqual(expected, par.fold(xf, joined, combine, range(100), n=7))
+
+    def test_fold_reduced(self):
+        def until_100(acc, *xs):
+            if not xs:
+                return acc
+            acc = acc + xs[0]
+            return tt.Reduced(acc) if xs[0] == 100 else acc
+
+        res = par.fold(t.map(tt.identity), until_100, u.add, range(1000), n=30)
+        self.assertEqual(sum(range(101)), res)
+
+    def test_fold_not_picklable(self):
+        # worker processes which aren't forked get pickled stage functions
+        with mock.patch.object(
+            par.multiprocessing, "get_all_start_methods", return_value=["spawn"]
+        ):
+            with self.assertRaisesRegex(TypeError, "picklable"):
+                par.fold(t.map(lambda x: x * 2), u.add, u.add, range(100))
+            with self.assertRaisesRegex(TypeError, "picklable"):
+                par.fold(t.map(abs), lambda a, b: a + b, u.add, range(100))
+
+    def test_fold_stateful(self):
+        # stateful transducers can't be folded in parallel
+        xf = t.comp(t.map(lambda x: x + 1), t.take(10))
+        self.assertEqual(55, par.fold(xf, u.add, u.add, range(1000), n=3))
+
+
+class PmapTests(unittest.TestCase):
+    def test_pmap(self):
+        res = par.pmap(lambda x: x * 2, range(100), workers=4)
+        self.assertTrue(inspect.isgenerator(res))
+        self.assertEqual([x * 2 for x in range(100)], list(res))
+        res = par.pmap(lambda x, y: x + y, range(5), range(10, 20))
+        self.assertEqual([10, 12, 14, 16, 18], list(res))
+
+    def test_pmap_ordered(self):
+        def slow_inverse(x):
+            time.sleep((10 - x) / 1000)
+            return x
+
+        xf = t.comp(par.pmap(slow_inverse, workers=10), t.map(lambda x: x + 1))
+        self.assertEqual(list(range(1, 11)), t.into([], xf, range(10)))
+
+    def test_pmap_bounded(self):
+        lock = threading.Lock()
+        running = 0
+        most = 0
+
+        def track(x):
+            nonlocal running, most
+            with lock:
+                running += 1
+                most = max(most, running)
+            time.sleep(0.001)
+            with lock:
+                running -= 1
+            return x
+
+        xf = par.pmap(track, workers=8, max_in_flight=3)
+        self.assertEqual(list(range(50)), t.into([], xf, range(50)))
+        self.assertLessEqual(most, 3)
+
+    def test_pmap_take(self):
+        xf = t.comp(par.pmap(lambda x: x * x, workers=2), t.take(4))
+        self.assertEqual([0, 1, 4, 9], t.into([], xf, range(100000000)))
+
+    def test_pmap_shuts_down_on_error(self):
+        threads = set()
+
+        def record(x):
+            threads.add(threading.current_thread())
+            return x
+
+        def fail(acc, *xs):
+            if xs and xs[0] == 5:
+                raise ValueError(xs[0])
+            return acc
+
+        with self.assertRaises(ValueError):
+            t.transduce(par.pmap(record, workers=2), fail, None, range(100))
+        self.assertTrue(threads)
+        self.assertFalse(any(thread.is_alive() for thread in threads))
@@ -0,0 +1,155 @@
+import random
+import unittest
+
+import transducers as t
+import transducers.persistent as ps
+import transducers.transducers as tt
+
+
+class Collider:
+    """
+    A key with a chosen hash, to force hash collisions.
+    """
+
+    def __init__(self, name, h):
+        self.name = name
+        self.h = h
+
+    def __hash__(self):
+        return self.h
+
+    def __eq__(self, other):
+        return isinstance(other, Collider) and self.name == other.name
+
+
+class VectorTests(unittest.TestCase):
+    def test_vector(self):
+        for n in [0, 1, 31, 32, 33, 1024, 1056, 1057, 40000]:
+            v = ps.vector(*range(n))
+            self.assertEqual(n, len(v))
+            self.assertEqual(list(range(n)), list(v))
+            if n:
+                self.assertEqual(n - 1, v[-1])
+                self.assertEqual(n // 2, v[n // 2])
+
+    def test_structural_sharing(self):
+        v1 = ps.vector(*range(2000))
+        v2 = v1.conj(2000)
+        v3 = v1.assoc(5, "five")
+        self.assertEqual(2000, len(v1))
+        self.assertEqual(2001, len(v2))
+        self.assertEqual(5, v1[5])
+        self.assertEqual("five", v3[5])
+        self.assertEqual(list(range(2000)), list(v1))
+        # untouched parts of the tree are shared
+        self.assertTrue(v1.root.array[1] is v3.root.array[1])
+        self.assertTrue(v1.root is v2.root)
+
+    def test_transient(self):
+        v = ps.vector(1, 2, 3)
+        tv = v.transient()
+        for x in range(100):
+            tv.conj(x)
+        tv.assoc(0, "zero")
+        v2 = tv.persistent()
+        self.assertEqual([1, 2, 3], list(v))
+        self.assertEqual(["zero", 2, 3] + list(range(100)), list(v2))
+        self.assertRaises(RuntimeError, tv.conj, 1)
+
+    def test_protocols(self):
+        v = t.into(ps.EMPTY_VECTOR, t.map(lambda x: x * 2), range(100))
+        self.assertTrue(isinstance(v, ps.PersistentVector))
+        self.assertEqual([x * 2 for x in range(100)], list(v))
+        self.assertTrue(tt.is_immutable(v))
+        self.assertEqual(ps.vector(0, 1), t.conj(tt.empty(v), 0, 1))
+        v = t.into_new(t.map(lambda x: x + 1), ps.vector(0, 1, 2))
+        self.assertEqual(ps.vector(1, 2, 3), v)
+
+    def test_reduce(self):
+        v = ps.vector(*range(100))
+        self.assertEqual(4950, t.reduce(lambda acc, x: acc + x, 0, v))
+        self.assertEqual([0, 1, 2], t.into([], t.take(3), v))
+        self.assertEqual(list(range(90, 100)), t.into([], t.drop(90), v))
+
+
+class HashMapTests(unittest.TestCase):
+    def test_hash_map(self):
+        d = {x: str(x) for x in range(5000)}
+        m = ps.hash_map(d)
+        self.assertEqual(5000, len(m))
+        self.assertEqual(d, m)
+        self.assertEqual("42", m[42])
+        self.assertEqual(None, m.get(-1))
+        self.assertFalse(-1 in m)
+        self.assertRaises(KeyError, m.__getitem__, -1)
+
+        m2 = m.assoc(-1, "x").dissoc(42)
+        self.assertEqual(5000, len(m2))
+        self.assertTrue(42 in m)
+        self.assertFalse(42 in m2)
+        self.assertEqual("x", m2[-1])
+        self.assertTrue(m.dissoc("missing") is m)
+        self.assertTrue(m.assoc(1, m[1]) is m)
+
+    def test_random_ops(self):
+        rng = random.Random(42)
+        d = {}
+        m = ps.EMPTY_MAP
+        for _ in range(20000):
+            k = rng.randrange(3000)
+            if rng.random() < 0.3:
+                d.pop(k, None)
+                m = m.dissoc(k)
+            else:
+                d[k] = rng.random()
+                m = m.assoc(k, d[k])
+        self.assertEqual(d, m)
+        self.assertEqual(len(d), len(m))
+
+    def test_collisions(self):
+        a, b, c = Collider("a", 7), Collider("b", 7), Collider("c", 7 + 2 ** 40)
+        m = ps.hash_map({a: 1, b: 2}).assoc(c, 3).assoc(Collider("d", 8), 4)
+        self.assertEqual(4, len(m))
+        self.assertEqual([1, 2, 3], [m[a], m[b], m[c]])
+        m2 = m.dissoc(a)
+        self.assertEqual(2, m2[b])
+        self.assertFalse(a in m2)
+        self.assertEqual(2, len(m2.dissoc(b)))
+        self.assertEqual(1, len(m2.dissoc(b).dissoc(c)))
+
+    def test_transient(self):
+        m = ps.hash_map(a=1)
+        tm = m.transient()
+        for x in range(1000):
+            tm.assoc(x, x)
+        tm.dissoc("a").dissoc(5)
+        m2 = tm.persistent()
+        self.assertEqual({"a": 1}, m)
+        self.assertEqual(999, len(m2))
+        self.assertFalse(5 in m2)
+        self.assertRaises(RuntimeError, tm.assoc, 1, 1)
+
+    def test_protocols(self):
+        m = t.into(ps.EMPTY_MAP, t.map(lambda x: (x, x * x)), range(10))
+        self.assertEqual({x: x * x for x in range(10)}, m)
+        # transduces from (key, value) tuples, like dict
+        inverted = t.into_new(t.map(lambda kv: (kv[1], kv[0])), m)
+        self.assertTrue(isinstance(inverted, ps.PersistentHashMap))
+        self.assertEqual({x * x: x for x in range(10)}, inverted)
+        self.assertEqual({1: 2, 3: 4}, t.conj(ps.EMPTY_MAP, (1, 2), (3, 4)))
+
+
+class HashSetTests(unittest.TestCase):
+    def test_hash_set(self):
+        s = ps.hash_set(*range(100), *range(50))
+        self.assertEqual(set(range(100)), s)
+        s2 = s.conj(100).disj(0)
+        self.assertTrue(0 in s)
+        self.assertFalse(0 in s2)
+        self.assertTrue(s.conj(1) is s)
+
+    def test_protocols(self):
+        s = t.into(ps.EMPTY_SET, t.map(lambda x: x % 7), range(100))
+        self.assertTrue(isinstance(s, ps.PersistentHashSet))
+        self.assertEqual(set(range(7)), s)
+        self.assertEqual({0, 1, 2}, t.conj(ps.EMPTY_SET, 0, 1, 2, 1))
@@ -42,3 +42,31 @@ class ProtocolTests(unittest.TestCase):
 
     def test_protocol_incomplete(self):
         pass
+
+    def test_protocol_hierarchy(self):
+        sized = p.protocol("size")
+        sized.extend(list, ("size", len))
+
+        class MyList(list):
+            pass
+
+        # subclasses use the implementation of their base type
+        self.assertEqual(3, sized.size(MyList([1, 2, 3])))
+        self.assertRaises(ValueError, sized.size, (1, 2))
+
+        # extending object provides a default for every type
+        sized.extend(object, ("size", lambda _: -1))
+        self.assertEqual(-1, sized.size((1, 2)))
+        self.assertEqual(3, sized.size(MyList([1, 2, 3])))
+
+        # the most specific implementation wins, even after dispatch was cached
+        sized.extend(MyList, ("size", lambda l: 2 * len(l)))
+        self.assertEqual(6, sized.size(MyList([1, 2, 3])))
+        self.assertEqual(3, sized.size([1, 2, 3]))
+
+        self.assertTrue(sized.implementation("size", bool) is not None)
+        self.assertEqual(len, sized.implementation("size", list))
+
+    def test_protocol_reserved(self):
+        self.assertRaises(ValueError, p.protocol, "extend")
+        self.assertRaises(ValueError, p.protocol, "implementation")
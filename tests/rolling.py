@@ -0,0 +1,54 @@
+import inspect
+import math
+import random
+import statistics
+import unittest
+
+import transducers as t
+
+
+def windows(size, coll):
+    return [coll[i - size : i] for i in range(size, len(coll) + 1)]
+
+
+class RollingTests(unittest.TestCase):
+    def setUp(self):
+        rand = random.Random(42)
+        self.values = [rand.randint(-100, 100) for _ in range(500)]
+
+    def assertRollsLike(self, rolling, aggregate, size=7):
+        expected = [aggregate(w) for w in windows(size, self.values)]
+        gen = rolling(size, self.values)
+        self.assertTrue(inspect.isgenerator(gen))
+        for res in (list(gen), t.into([], rolling(size), self.values)):
+            self.assertEqual(len(expected), len(res))
+            for e, r in zip(expected, res):
+                self.assertTrue(math.isclose(e, r, abs_tol=1e-9), (e, r))
+
+    def test_sum(self):
+        self.assertRollsLike(t.rolling_sum, sum)
+        self.assertEqual([3, 5, 7], list(t.rolling_sum(2, [1, 2, 3, 4])))
+
+    def test_mean(self):
+        self.assertRollsLike(t.rolling_mean, statistics.mean)
+
+    def test_var(self):
+        self.assertRollsLike(t.rolling_var, statistics.variance)
+        self.assertRollsLike(
+            lambda *args: t.rolling_var(*args, ddof=0), statistics.pvariance
+        )
+        self.assertTrue(math.isnan(next(t.rolling_var(1, [1.0]))))
+
+    def test_min_max(self):
+        self.assertRollsLike(t.rolling_min, min)
+        self.assertRollsLike(t.rolling_max, max)
+        for size in (1, 2, 50):
+            self.assertRollsLike(t.rolling_min, min, size)
+            self.assertRollsLike(t.rolling_max, max, size)
+
+    def test_pipeline(self):
+        xf = t.comp(t.map(lambda x: x * 2), t.rolling_max(3), t.take(2))
+        self.assertEqual([6, 8], t.into([], xf, [1, 3, 2, 4, 0]))
+        self.assertEqual([], t.into([], t.rolling_sum(3), [1, 2]))
+        with self.assertRaises(ValueError):
+            t.rolling_sum(0)
@@ -1,7 +1,9 @@
+import array
 import unittest
 import inspect
 
 import transducers as t
+import transducers.transducers as tt
 import transducers.utils as u
 
 
@@ -47,6 +49,11 @@ class CompTests(unittest.TestCase):
         self.assertEqual(inc_then_square(7), square(inc(7)))
         self.assertNotEqual(square_then_inc(8), inc_then_square(8))
 
+        # compositions of more functions apply them from right to left too
+        f = t.comp(square, inc, inc, inc, inc)
+        self.assertEqual(square(inc(inc(inc(inc(1))))), f(1))
+        self.assertEqual(t.comp(square, t.comp(inc, inc, inc, inc))(1), f(1))
+
     def test_comp_arity(self):
         f = t.comp(inc, add3)
         self.assertEqual(13, f(3, 4, 5))
@@ -201,6 +208,149 @@ class DedupeTests(unittest.TestCase):
         self.assertEqual("abcbabc", t.into_new(t.dedupe(), "aaabbcbabbccc"))
 
 
+class DistinctTests(unittest.TestCase):
+    def test_window(self):
+        coll = [1, 2, 1, 3, 4, 1, 2, 5, 2]
+        # 1 stays in the window of 3 (it keeps being seen), 2 drops out of it
+        self.assertEqual(
+            [1, 2, 3, 4, 2, 5], t.into([], t.distinct(mode="window", max_size=3), coll)
+        )
+        self.assertEqual(
+            [1, 2, 3, 4, 2, 5], list(t.distinct(coll, mode="window", max_size=3))
+        )
+
+    def test_window_ttl(self):
+        now = 0.0
+        xf = t.distinct(mode="window", max_size=10, ttl=5, clock=lambda: now)
+        f = xf(t.conj)
+        acc: list = []
+        for now, x in [(0, "a"), (1, "b"), (4, "a"), (7, "b"), (8, "a"), (14, "a")]:
+            acc = f(acc, x)
+        self.assertEqual(["a", "b", "b", "a"], acc)
+
+    def test_bloom(self):
+        xf = t.distinct(mode="bloom", capacity=1000, error_rate=0.01)
+        res = t.into([], xf, [x % 1000 for x in range(3000)])
+        # no false negatives, few false positives
+        self.assertEqual(len(res), len(set(res)))
+        self.assertGreater(len(res), 970)
+
+    def test_bitmap(self):
+        xf = t.distinct(mode="bitmap", size=100)
+        self.assertEqual([5, 0, 99], t.into([], xf, [5, 0, 5, 99, 0]))
+        with self.assertRaises(ValueError):
+            t.into([], xf, [100])
+
+    def test_bad_modes(self):
+        with self.assertRaises(ValueError):
+            t.distinct(mode="sorted")
+        with self.assertRaises(TypeError):
+            t.distinct(mode="window")
+        with self.assertRaises(TypeError):
+            t.distinct(max_size=3)
+
+
+class MultiSourceTests(unittest.TestCase):
+    def test_transduce(self):
+        xs, ys = [1, 2, 3, 4], [10, 20, 30]
+        xf = t.map(add2)
+        self.assertEqual(66, t.transduce(xf, u.add, 0, xs, ys))
+        self.assertEqual([11, 22, 33], t.into([], xf, xs, ys))
+        self.assertEqual([111, 222], t.into([], t.map(add3), xs, ys, [100, 200]))
+
+    def test_stages(self):
+        xs, ys = range(10), range(100, 110)
+        xf = t.comp(
+            t.filter(lambda x, y: x % 2 == 0),
+            t.take(3),
+            t.map_indexed(lambda i, x, y: (i, x, y)),
+        )
+        self.assertEqual(
+            [(0, 0, 100), (1, 2, 102), (2, 4, 104)], t.into([], xf, xs, ys)
+        )
+
+        xf = t.keep(lambda x, y: x * y if x > 7 else None)
+        self.assertEqual([864, 981], t.into([], xf, xs, ys))
+
+        # values are passed on as separate arguments
+        steps = []
+
+        def rf(acc, *xs):
+            if xs:
+                steps.append(xs)
+            return acc
+
+        t.transduce(t.filter(lambda x, y: x < y), rf, None, [1, 5], [2, 3])
+        self.assertEqual([(1, 2)], steps)
+
+        # three and more collections, until the shortest ends
+        xf = t.map(lambda *xs: sum(xs))
+        self.assertEqual([111, 114], t.into([], xf, [1, 2], [10, 11], [100, 101, 102]))
+        self.assertEqual([1, 4], t.into([], xf, [0, 1], [0, 1], [0, 1], [1, 1, 1]))
+        self.assertEqual([111], t.into([], t.comp(xf, t.take(1)), [1, 2], [10], [100]))
+
+    def test_unsupported_stages(self):
+        xs, ys = range(4), range(10, 14)
+        for xf in [t.partition(2), t.partition(2, buffer=[None, None])]:
+            with self.assertRaises(TypeError):
+                t.transduce(xf, t.conj, [], xs, ys)
+        # values can be tupled first
+        xf = t.comp(t.map(lambda x, y: (x, y)), t.partition(2))
+        self.assertEqual(
+            [[(0, 10), (1, 11)], [(2, 12), (3, 13)]], t.into([], xf, xs, ys)
+        )
+
+    def test_generators(self):
+        self.assertEqual([11, 22], list(t.keep(add2, [1, 2], [10, 20])))
+        self.assertEqual(
+            [(0, 1, 10), (1, 2, 20)],
+            list(t.map_indexed(lambda i, x, y: (i, x, y), [1, 2], [10, 20])),
+        )
+
+
+class Blocks:
+    """
+    A collection stored in blocks, which reduces itself block by block.
+    """
+
+    def __init__(self, *blocks):
+        self.blocks = blocks
+        self.reduced_blocks = 0
+
+    def __iter__(self):
+        raise AssertionError("Blocks should be reduced, not iterated.")
+
+
+def reduce_blocks(coll, f, init):
+    for block in coll.blocks:
+        coll.reduced_blocks += 1
+        for x in block:
+            init = f(init, x)
+            if isinstance(init, tt.Reduced):
+                return init.value
+    return init
+
+
+tt.reducible.extend(Blocks, ("reduce", reduce_blocks))
+
+
+class ReducibleTests(unittest.TestCase):
+    def test_reduce(self):
+        coll = Blocks([1, 2], [3], [4, 5])
+        self.assertEqual(15, t.reduce(u.add, 0, coll))
+        self.assertEqual(3, coll.reduced_blocks)
+
+    def test_transduce(self):
+        coll = Blocks([1, 2], [3], [4, 5])
+        self.assertEqual([2, 4, 6, 8, 10], t.into([], t.map(lambda x: x * 2), coll))
+        self.assertEqual((1, 2, 3, 4, 5), t.into((), coll))
+
+        # reduced steps are honoured
+        coll = Blocks([1, 2], [3], [4, 5])
+        self.assertEqual([1, 2, 3], t.into([], t.take(3), coll))
+        self.assertEqual(2, coll.reduced_blocks)
+
+
 class IntoTests(unittest.TestCase):
     def test_into_from_to(self):
         l = list(range(10))
@@ -298,7 +448,7 @@ class TransducerTests(unittest.TestCase):
     def test_basic(self):
         xf = t.comp(t.filter(lambda x: x % 2 == 1), t.map(lambda x: x + 1))
 
-        # we can use 2-arity lambda to do addition (because of safe_completing wrapper)
+        # we can use 2-arity lambda to do addition (because of completing wrapper)
         res = t.transduce(xf, lambda x, y: x + y, 0, range(5))
         self.assertEqual(6, res)
 
@@ -410,6 +560,73 @@ class PartitionTest(unittest.TestCase):
             t.transduce(xf, t.conj, {}, range(1, 31)),
         )
 
+    def test_partition_views(self):
+        payload = bytes(range(10))
+        # lists by default, like the transducer
+        parts = list(t.partition(4, payload))
+        self.assertEqual([[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]], parts)
+        self.assertEqual(t.into([], t.partition(4), payload), parts)
+
+        parts = list(t.partition(4, payload, views=True))
+        self.assertTrue(all(isinstance(part, memoryview) for part in parts))
+        self.assertEqual([b"\0\1\2\3", b"\4\5\6\7", b"\10\11"], parts)
+        self.assertIs(payload, parts[0].obj)
+
+        numbers = array.array("i", range(5))
+        parts = list(t.partition(2, numbers, views=True))
+        self.assertEqual([[0, 1], [2, 3], [4]], [part.tolist() for part in parts])
+        numbers[0] = 42
+        self.assertEqual(42, parts[0][0])
+
+        xf = t.map(bytes)
+        self.assertEqual(
+            [b"\x00\x01\x02\x03", b"\x04\x05\x06\x07", b"\x08\x09"],
+            t.into([], xf, t.partition(4, payload, views=True)),
+        )
+        with self.assertRaises(TypeError):
+            t.partition(4, range(10), views=True)
+        with self.assertRaises(TypeError):
+            t.partition(4, views=True)
+
+    def test_partition_buffer(self):
+        buffer = bytearray(3)
+        # generator
+        parts = [bytes(part) for part in t.partition(3, range(7), buffer=buffer)]
+        self.assertEqual([b"\x00\x01\x02", b"\x03\x04\x05", b"\x06"], parts)
+
+        # transducing
+        xf = t.comp(t.partition(3, buffer=buffer), t.map(sum))
+        self.assertEqual([3, 12, 6], t.into([], xf, range(7)))
+        # every full part is the buffer itself
+        buffer = [None] * 2
+        parts = t.into([], t.partition(2, buffer=buffer), "abcde")
+        self.assertEqual([buffer, buffer, ["e"]], parts)
+        self.assertIs(buffer, parts[1])
+        # (holding the values of the last part)
+        self.assertEqual(["e", "d"], buffer)
+
+        with self.assertRaises(ValueError):
+            t.partition(4, buffer=buffer)
+
+
+class WindowTest(unittest.TestCase):
+    def test_window(self):
+        # generator
+        res = t.window(3, range(6))
+        self.assertTrue(inspect.isgenerator(res))
+        self.assertEqual([(0, 1, 2), (1, 2, 3), (2, 3, 4), (3, 4, 5)], list(res))
+        self.assertEqual([(0, 1, 2), (2, 3, 4)], list(t.window(3, range(6), step=2)))
+
+        # transducing
+        xf = t.window(2, step=3)
+        self.assertEqual([(0, 1), (3, 4), (6, 7)], t.into([], xf, range(9)))
+        self.assertEqual([], t.into([], xf, range(1)))
+        xf = t.comp(t.window(2, step=2), t.map(sum))
+        self.assertEqual([1, 5], t.into([], xf, range(5)))
+
+        with self.assertRaises(ValueError):
+            t.window(0)
+
 
 class KeepTest(unittest.TestCase):
     def test_keep(self):
@@ -450,3 +667,119 @@ class TakeNthTest(unittest.TestCase):
         xf = t.comp(t.partition(3), t.take_nth(7))
         res = t.into([], xf, range(60))
         self.assertEqual([[0, 1, 2], [21, 22, 23], [42, 43, 44]], res)
+
+
+class GenerateTest(unittest.TestCase):
+    def test_generate(self):
+        xf = t.comp(
+            t.map(lambda x: x ** 2), t.filter(lambda x: x % 3 == 0), t.take(5)
+        )
+        res = t.generate(xf, range(1, 1000000000))
+        self.assertTrue(inspect.isgenerator(res))
+        self.assertEqual([9, 36, 81, 144, 225], list(res))
+
+    def test_generate_laziness(self):
+        seen = []
+
+        def source():
+            for x in range(100):
+                seen.append(x)
+                yield x
+
+        res = t.generate(t.comp(t.filter(lambda x: x % 2), t.take(3)), source())
+        self.assertEqual(1, next(res))
+        self.assertEqual([0, 1], seen)
+        self.assertEqual([3, 5], list(res))
+        self.assertEqual(list(range(6)), seen)
+
+    def test_generate_completion(self):
+        xf = t.comp(t.partition(3), t.map(len))
+        self.assertEqual([3, 3, 1], list(t.generate(xf, range(7))))
+
+    def test_eduction(self):
+        ed = t.eduction(t.map(lambda x: x + 1), t.partition(2), range(5))
+        self.assertEqual([[1, 2], [3, 4], [5]], list(ed))
+        # eductions can be iterated more than once
+        self.assertEqual([[1, 2], [3, 4], [5]], t.into([], ed))
+        self.assertEqual([0, 1, 2], list(t.eduction(range(3))))
+
+
+class StagesTest(unittest.TestCase):
+    def test_stages(self):
+        square = t.map(lambda x: x * x)
+        self.assertEqual([("map", square.stages[0][1], square)], list(square.stages))
+        self.assertEqual(1, len(tt.stages_of(t.concat())))
+        self.assertEqual("xform", tt.stages_of(t.concat())[0][0])
+
+        xf = t.comp(t.filter(None), t.comp(t.take(3), t.concat()), square)
+        self.assertEqual(
+            ["filter", "take", "xform", "map"], [name for name, _, _ in xf.stages]
+        )
+        self.assertEqual((3,), xf.stages[1][1])
+
+        # plain functions composed with comp have no stages
+        self.assertFalse(hasattr(t.comp(inc, inc), "stages"))
+
+
+class SubclassTest(unittest.TestCase):
+    def test_subclasses(self):
+        from collections import OrderedDict, defaultdict
+
+        class MyList(list):
+            pass
+
+        self.assertEqual([1, 2, 3], t.into(MyList(), t.map(inc), range(3)))
+        d = t.into(defaultdict(list), t.map(lambda x: (x, [x])), range(2))
+        self.assertEqual({0: [0], 1: [1]}, d)
+        self.assertEqual([(1, 2)], t.into([], OrderedDict([(1, 2)])))
+
+
+class ShortCircuitTest(unittest.TestCase):
+    def test_can_short_circuit(self):
+        self.assertFalse(tt.can_short_circuit(t.map(inc)))
+        self.assertFalse(tt.can_short_circuit(t.comp(t.map(inc), t.distinct())))
+        self.assertTrue(tt.can_short_circuit(t.comp(t.map(inc), t.take(3))))
+        # undeclared transducers and reducing functions are assumed to
+        self.assertTrue(tt.can_short_circuit(t.comp(t.map(inc), t.concat())))
+        self.assertTrue(tt.can_short_circuit(add2))
+        self.assertFalse(tt.can_short_circuit(t.conj))
+        self.assertFalse(tt.can_short_circuit(t.chunked_conj()))
+        self.assertFalse(tt.can_short_circuit(tt.identity))
+
+    def test_reducing_function_reduced(self):
+        def add_until_10(acc, *xs):
+            if not xs:
+                return acc
+            acc += xs[0]
+            return tt.Reduced(acc) if acc >= 10 else acc
+
+        self.assertEqual(10, t.transduce(t.map(inc), add_until_10, 0, range(100)))
+
+    def test_into_immutable(self):
+        self.assertEqual("abcd", t.into("ab", "cd"))
+        self.assertEqual(frozenset(range(100)), t.into(frozenset(), range(100)))
+
+
+class TransientTest(unittest.TestCase):
+    def test_transient(self):
+        builder = tt.transient("ab")
+        t.conj(builder, "c", "de")
+        self.assertEqual("abcde", tt.persistent("", builder))
+        self.assertFalse(tt.has_transient([]))
+        self.assertTrue(tt.has_transient(frozenset()))
+
+    def test_into_immutable_builders(self):
+        self.assertEqual("hello, world", t.into("hello", ", world"))
+        fs = t.into(frozenset([1]), t.map(lambda x: x % 5), range(100))
+        self.assertEqual(frozenset(range(5)), fs)
+        self.assertEqual((0, 1, 4, 9), t.into((0,), t.map(square), range(1, 4)))
+        self.assertEqual((1, 2), t.into_new(t.map(inc), (0, 1)))
+        self.assertEqual(b"IBM", t.into_new(t.map(lambda b: b - 1), b"JCN"))
+        self.assertEqual(b"ab\x00cd", t.into(b"ab", [0, b"cd"]))
+
+    def test_conj_tuple_bytes(self):
+        self.assertEqual((1, 2, 3), t.conj((1,), 2, 3))
+        self.assertEqual(b"abc", t.conj(b"a", ord("b"), b"c"))
+        b = bytearray(b"a")
+        self.assertTrue(b is t.conj(b, 98, b"cd"))
+        self.assertEqual(bytearray(b"abcd"), b)
@@ -2,7 +2,9 @@ import unittest
 import inspect
 
 import transducers.utils as u
+from transducers.caching import Cache
 import transducers as t
+from transducers.transducers import identity
 
 
 class UtilsTests(unittest.TestCase):
@@ -40,6 +42,17 @@ class UtilsTests(unittest.TestCase):
         d4 = u.map_kvs(lambda k: k + k, lambda v: v * v, d)
         self.assertEqual({"aa": 0, "bb": 1, "cc": 4, "dd": 9}, d4)
 
+    def test_dict_map_cache(self):
+        cache = Cache()
+        d = {"a": 1, "b": 2, "c": 1}
+        d1 = u.map_vals(lambda v: v + 1, d, cache)
+        self.assertEqual({"a": 2, "b": 3, "c": 2}, d1)
+        self.assertEqual(1, cache.stats.hits)
+        keys = Cache()
+        d2 = u.map_kvs(str.upper, str, d, key_cache=keys, val_cache=Cache())
+        self.assertEqual({"A": "1", "B": "2", "C": "1"}, d2)
+        self.assertEqual(3, keys.stats.misses)
+
     def test_group_by(self):
         a1 = {"a": "a1", "b": 0}
         a2 = {"a": "a2", "b": 1}
@@ -84,3 +97,84 @@ class UtilsTests(unittest.TestCase):
         nums = u.reapply(lambda x: x + 1, 0)
         self.assertTrue(inspect.isgenerator(nums))
         self.assertEqual(list(range(100)), list(t.take(100, nums)))
+
+
+class GroupingTests(unittest.TestCase):
+    def test_grouping(self):
+        words = ["apple", "avocado", "banana", "blueberry", "cherry", "apricot"]
+        first = lambda w: w[0]
+
+        count = u.grouping(first, t.map(lambda w: 1), u.add, 0)
+        self.assertEqual(
+            {"a": 3, "b": 2, "c": 1}, t.transduce(identity, count, {}, words)
+        )
+
+        firsts = u.grouping(first, t.take(2), t.conj, [])
+        self.assertEqual(
+            {"a": ["apple", "avocado"], "b": ["banana", "blueberry"], "c": ["cherry"]},
+            t.transduce(identity, firsts, {}, words),
+        )
+
+        # groups are completed
+        parts = u.grouping(lambda x: x % 2, t.partition(2), t.conj, [])
+        self.assertEqual(
+            {0: [[0, 2], [4]], 1: [[1, 3]]}, t.transduce(identity, parts, {}, range(5))
+        )
+
+    def test_grouped(self):
+        sums = u.grouped(lambda x: x % 3, identity, u.add, 0)
+        self.assertEqual([(0, 18), (1, 22), (2, 26)], t.into([], sums, range(12)))
+        xf = t.comp(sums, t.take(1))
+        self.assertEqual([(0, 18)], t.into([], xf, range(12)))
+
+        # only the reductions are held
+        xf = u.grouped(lambda x: x % 3, identity, u.add, 0)
+        rf = xf(t.conj)
+        for x in range(1000):
+            rf([], x)
+        self.assertEqual(3, len(rf.state()))
+
+
+class JoinTests(unittest.TestCase):
+    users = [
+        {"id": 1, "name": "ada", "team": "a"},
+        {"id": 2, "name": "bob", "team": "b"},
+        {"id": 3, "name": "cy", "team": "a"},
+    ]
+    events = [{"user": 1, "n": 10}, {"user": 4, "n": 11}, {"user": 3, "n": 12}]
+
+    def test_build_index(self):
+        names = u.build_index(lambda d: d["id"], self.users, lambda d: d["name"])
+        self.assertEqual({1: "ada", 2: "bob", 3: "cy"}, names)
+        self.assertEqual(u.index(len, ["a", "bb"]), u.build_index(len, ["a", "bb"]))
+        teams = u.build_index(
+            lambda d: d["team"], self.users, lambda d: d["name"], many=True
+        )
+        self.assertEqual({"a": ("ada", "cy"), "b": ("bob",)}, teams)
+
+    def test_join(self):
+        names = u.build_index(lambda d: d["id"], self.users, lambda d: d["name"])
+        user = lambda e: e["user"]
+        xf = u.join(names, user, combine=lambda e, name: (e["n"], name))
+        self.assertEqual([(10, "ada"), (12, "cy")], t.into([], xf, self.events))
+
+        xf = u.join(names, user, how="left")
+        self.assertEqual(
+            [(self.events[0], "ada"), (self.events[1], None), (self.events[2], "cy")],
+            t.into([], xf, self.events),
+        )
+        with self.assertRaises(ValueError):
+            u.join(names, user, how="outer")
+
+    def test_join_many(self):
+        teams = u.group_by(lambda d: d["team"], self.users)
+        xf = u.join_many(
+            teams, lambda x: x, combine=lambda team, user: f"{team}:{user['name']}"
+        )
+        self.assertEqual(["a:ada", "a:cy", "b:bob"], t.into([], xf, ["a", "c", "b"]))
+        xf = u.join_many(teams, lambda x: x, how="left", combine=lambda t, u: u)
+        self.assertEqual([None], t.into([], xf, ["c"]))
+
+        # reduced within a group
+        xf = t.comp(u.join_many(teams, lambda x: x), t.take(1))
+        self.assertEqual([("a", self.users[0])], t.into([], xf, ["a", "b"]))
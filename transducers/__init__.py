@@ -5,11 +5,14 @@ from transducers.transducers import (
     chunked_conj,
     complement,
     comp,
+    completing,
     concat,
     distinct,
     dedupe,
     drop,
+    eduction,
     filter,
+    generate,
     into,
     into_new,
     iterator,
@@ -22,4 +25,13 @@ from transducers.transducers import (
     take,
     take_nth,
     transduce,
+    window,
+)
+from transducers.fused import fuse
+from transducers.rolling import (
+    rolling_max,
+    rolling_mean,
+    rolling_min,
+    rolling_sum,
+    rolling_var,
 )
@@ -0,0 +1,158 @@
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Deque, List
+
+from transducers.typing import Fn
+import transducers.transducers as t
+
+
+DEFAULT_LIMIT = 16
+
+
+async def __aclose(it):
+    if hasattr(it, "aclose"):
+        await it.aclose()
+
+
+async def __aiter(source) -> AsyncIterator:
+    """
+    Iterate `source`, which may be an async or a regular iterable. An async
+    iterator of `source` is closed (if it can be) when the iteration ends or
+    is closed.
+    """
+    if hasattr(source, "__aiter__"):
+        it = source.__aiter__()
+        try:
+            async for x in it:
+                yield x
+        finally:
+            await __aclose(it)
+    else:
+        for x in t.iterator(source):
+            yield x
+
+
+def __buffering(buffer: List, *xs) -> List:
+    if xs:
+        buffer.append(xs[0])
+    return buffer
+
+
+async def __amap_generator(f: Fn, limit: int, source) -> AsyncIterator:
+    """
+    Await `f` on the values of `source`, with up to `limit` calls running at
+    once. Yields results in the order of their inputs.
+    """
+    pending: Deque = deque()
+    it = __aiter(source)
+    try:
+        async for x in it:
+            pending.append(asyncio.ensure_future(f(x)))
+            while len(pending) >= limit or (pending and pending[0].done()):
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
+        await __aclose(it)
+
+
+def amap(f: Fn, *rest, limit: int = DEFAULT_LIMIT):
+    """
+    Map values of an (async) iterable with the coroutine function `f`, with
+    up to `limit` calls to `f` running at once. Results keep the order of
+    their inputs.
+
+    Without a collection, returns a transducer which can only be run by
+    `atransduce` (and `ainto`).
+    """
+    if rest:
+        if len(rest) == 1:
+            return __amap_generator(f, max(1, limit), rest[0])
+        raise TypeError("Can't `amap` on more than one collection.")
+
+    @t.staged("amap", f, max(1, limit))
+    def xform(rf):
+        raise TypeError("Transducing `amap` can only be used with `atransduce`.")
+
+    return xform
+
+
+async def __agenerate(xform: Fn, source) -> AsyncIterator:
+    """
+    Like `generate` for an async `source`.
+    """
+    buffer: List = []
+    f = xform(__buffering)
+    it = __aiter(source)
+    try:
+        async for x in it:
+            res = f(buffer, x)
+            if buffer:
+                for y in buffer:
+                    yield y
+                buffer.clear()
+            if isinstance(res, t.Reduced):
+                break
+    finally:
+        await __aclose(it)
+    f(buffer)
+    for y in buffer:
+        yield y
+
+
+def __pipeline(xform: Fn, source):
+    """
+    Split `xform` at its `amap` stages. Returns an async iterator of the
+    values going into the last run of (synchronous) stages and a transducer
+    of those stages.
+    """
+    sync: List[Fn] = []
+    for name, args, stage in t.stages_of(xform):
+        if name == "amap":
+            if sync:
+                source = __agenerate(t.comp(*sync), source)
+                sync = []
+            f, limit = args
+            source = __amap_generator(f, limit, source)
+        else:
+            sync.append(stage)
+    return __aiter(source), t.comp(*sync) if sync else t.identity
+
+
+async def atransduce(xform: Fn, f: Fn, init, source):
+    """
+    Like `transduce` for an async (or regular) iterable `source`. `xform` may
+    include `amap` stages. When the reduction is reduced (with `Reduced`),
+    iteration of `source` is cancelled.
+    """
+    it, xform = __pipeline(xform, source)
+    f = xform(t.completing(f))
+    try:
+        async for x in it:
+            init = f(init, x)
+            if isinstance(init, t.Reduced):
+                init = init.value
+                break
+    finally:
+        await __aclose(it)
+    return f(init)
+
+
+async def ainto(init, *rest):
+    """
+    Like `into` for an async (or regular) iterable source.
+    """
+    if len(rest) == 1:
+        xform, source = t.identity, rest[0]
+    elif len(rest) == 2:
+        xform, source = rest
+    else:
+        raise TypeError("Can't `ainto` without a source or with more than one source.")
+    if t.has_transient(init):
+        builder = await atransduce(xform, t.conj, t.transient(init), source)
+        return t.persistent(init, builder)
+    if t.is_immutable(init):
+        return await atransduce(xform, t.chunked_conj(), init, source)
+    return await atransduce(xform, t.conj, init, source)
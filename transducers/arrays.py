@@ -0,0 +1,164 @@
+# Optional NumPy backend. When the source of a transduction is a 1 dimensional
+# `numpy.ndarray`, the leading stages of the transducer are run as array
+# operations (ufuncs, boolean masks, slicing, `numpy.unique` and reshaping)
+# instead of one value at a time. Whatever can't be vectorized runs through the
+# regular (per element) transducers.
+#
+# `map` and `filter`/`remove` stages are only vectorized when their function
+# opts in: NumPy ufuncs, and functions marked with `vectorized`, are called
+# once with the whole array. Any other function runs per element, as array
+# operations can differ from Python's (e.g. overflowing int64 values, or
+# dividing by zero without raising).
+from typing import Dict, Iterable, List, Optional
+
+from transducers.typing import Fn
+import transducers.transducers as t
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+
+def is_array(coll) -> bool:
+    """
+    Whether `coll` is a 1 dimensional NumPy array.
+    """
+    return np is not None and isinstance(coll, np.ndarray) and coll.ndim == 1
+
+
+def vectorized(f: Fn) -> Fn:
+    """
+    Mark `f` (a function of `map`, `filter` or `remove`) as taking a whole
+    array, returning the array of its results (or a boolean mask for
+    `filter` and `remove`), so that its stage is vectorized.
+    """
+    f.vectorized = True  # type: ignore
+    return f
+
+
+def __is_vectorized(f: Fn) -> bool:
+    return isinstance(f, np.ufunc) or getattr(f, "vectorized", False)
+
+
+def __same_length(name: str, res, a):
+    if not isinstance(res, np.ndarray) or res.shape != a.shape:
+        raise ValueError(
+            f"Vectorized `{name}` function didn't return an array of the same "
+            "length."
+        )
+    return res
+
+
+def __map(f: Fn, a):
+    if not __is_vectorized(f):
+        return None
+    return __same_length("map", f(a), a)
+
+
+def __filter(pred: Fn, a):
+    negated = getattr(pred, "complement_of", None)
+    f = pred if negated is None else negated
+    if not __is_vectorized(f):
+        return None
+    mask = __same_length("filter", f(a), a)
+    if mask.dtype != np.bool_:
+        raise ValueError("Vectorized `filter` function didn't return a mask.")
+    return a[mask] if negated is None else a[~mask]
+
+
+def __take(n: int, a):
+    return a[: max(n, 0)]
+
+
+def __drop(n: int, a):
+    return a[max(n, 0) :]
+
+
+def __take_nth(n: int, a):
+    return a[::n]
+
+
+def __distinct(a):
+    # np.unique sorts, so keep the first occurrences in their original order
+    _, first = np.unique(a, return_index=True)
+    return a[np.sort(first)]
+
+
+__VECTORIZED: Dict[str, Fn] = {
+    "map": __map,
+    "filter": __filter,
+    "take": __take,
+    "drop": __drop,
+    "take_nth": __take_nth,
+    "distinct": __distinct,
+}
+
+
+def __partition(size: int, a) -> List:
+    """
+    Split `a` into parts of `size` values. Parts are views of `a`.
+    """
+    whole = len(a) // size * size
+    parts = list(a[:whole].reshape(-1, size))
+    if whole < len(a):
+        parts.append(a[whole:])
+    return parts
+
+
+def __values(res):
+    """
+    The values of `res` to transduce per element, as Python values (rather
+    than NumPy scalars) when `res` is an array.
+    """
+    return res.tolist() if isinstance(res, np.ndarray) else res
+
+
+def vectorize(xform: Fn, a):
+    """
+    Run as many of the leading stages of `xform` over the array `a` as can be
+    vectorized. Returns the resulting values and a transducer for the stages
+    that remain (`identity` if none remain).
+    """
+    stages = t.stages_of(xform)
+    res = a
+    for i, (name, args, _) in enumerate(stages):
+        if name == "partition":
+            res = __partition(args[0], res)
+            i += 1
+            break
+        step: Optional[Fn] = __VECTORIZED.get(name)
+        vectorized = step(*args, res) if step is not None else None
+        if vectorized is None:
+            break
+        res = vectorized
+    else:
+        i = len(stages)
+
+    rest = [stage for _, _, stage in stages[i:]]
+    return res, t.comp(*rest) if rest else t.identity
+
+
+def transduce(xform: Fn, f: Fn, init, coll: Iterable):
+    """
+    Like `transduce`, but vectorizes the leading stages of `xform` when `coll`
+    is a NumPy array.
+    """
+    if not is_array(coll):
+        return t.transduce(xform, f, init, coll)
+    res, rest = vectorize(xform, coll)
+    return t.transduce(rest, f, init, __values(res))
+
+
+def into(init, xform: Fn, coll: Iterable):
+    """
+    Like `into`, but vectorizes the leading stages of `xform` when `coll` is a
+    NumPy array.
+    """
+    if not is_array(coll):
+        return t.into(init, xform, coll)
+    res, rest = vectorize(xform, coll)
+    if rest is t.identity:
+        # nothing left to transduce, conj all values at once
+        return t.conj(init, *__values(res))
+    return t.into(init, rest, __values(res))
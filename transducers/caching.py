@@ -0,0 +1,190 @@
+from collections import OrderedDict
+import sys
+from typing import Dict, Optional
+
+from transducers.typing import Fn
+
+
+# Bounded caches to memoize (pure) functions, e.g. `map(parse, cache=...)`.
+#
+# A cache holds up to `max_size` results and/or results of up to `max_bytes`
+# (as measured by `sys.getsizeof`), evicting the least recently used ("lru")
+# or least frequently used ("lfu", least recently used first among equally
+# used) results first.
+#
+# A "shared" cache keeps its results across transductions, a "transduction"
+# scoped cache starts empty for each transduction (and generator). Either way
+# the hit/miss statistics are counted on the cache passed in (`stats`).
+
+POLICIES = ("lru", "lfu")
+SCOPES = ("shared", "transduction")
+
+
+class CacheStats:
+    __slots__ = ("hits", "misses", "evictions")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+    def snapshot(self) -> Dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+
+def _default_key(*args):
+    return args[0] if len(args) == 1 else args
+
+
+class Cache:
+    def __init__(
+        self,
+        max_size: Optional[int] = 1024,
+        policy: str = "lru",
+        max_bytes: Optional[int] = None,
+        key: Optional[Fn] = None,
+        scope: str = "shared",
+    ):
+        """
+        A cache of up to `max_size` results (unbounded with None) and results
+        of up to `max_bytes`. Results are keyed by `key` applied to the
+        arguments of the memoized function (by default the argument itself,
+        or the tuple of the arguments), which must be hashable.
+
+        A cache memoizes one function (see `memoize`): its results are only
+        keyed by the arguments.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown cache policy ({policy}).")
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown cache scope ({scope}).")
+        self.max_size = max_size
+        self.policy = policy
+        self.max_bytes = max_bytes
+        self.key = key or _default_key
+        self.scope = scope
+        self.stats = CacheStats()
+        self.function: Optional[Fn] = None
+        self.values: Dict = {}
+        self.sizes: Dict = {}
+        self.bytes = 0
+        # lru: keys from the least recently used, lfu: keys by number of uses,
+        # each from the least recently used
+        self.order: OrderedDict = OrderedDict()
+        self.uses: Dict = {}
+        self.buckets: Dict[int, OrderedDict] = {}
+        self.least_uses = 0
+
+    def clear(self):
+        """
+        Remove all results, also unbinding the cache from its function.
+        """
+        self.function = None
+        for table in (self.values, self.sizes, self.order, self.uses, self.buckets):
+            table.clear()
+        self.bytes = 0
+        self.least_uses = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def scoped(self) -> "Cache":
+        """
+        The cache to use for one transduction: the cache itself if it is
+        shared, else a new empty cache (counting into the same `stats`).
+        """
+        if self.scope == "shared":
+            return self
+        cache = Cache(self.max_size, self.policy, self.max_bytes, self.key)
+        cache.stats = self.stats
+        return cache
+
+    def memoize(self, f: Fn) -> Fn:
+        """
+        Memoize `f` with the cache. The cache is bound to the first function
+        it memoizes: memoizing another one raises a ValueError (rather than
+        returning results of the first for the same arguments).
+        """
+        if self.function is None:
+            self.function = f
+        elif self.function != f:
+            raise ValueError("A cache can only memoize one function.")
+        key, values, stats = self.key, self.values, self.stats
+        touch, put = self._touch, self._put
+
+        def memoized(*args):
+            k = key(*args)
+            if k in values:
+                stats.hits += 1
+                touch(k)
+                return values[k]
+            stats.misses += 1
+            res = f(*args)
+            put(k, res)
+            return res
+
+        memoized.__wrapped__ = f  # type: ignore
+        return memoized
+
+    def _touch(self, k):
+        if self.policy == "lru":
+            self.order.move_to_end(k)
+            return
+        n = self.uses[k]
+        bucket = self.buckets[n]
+        del bucket[k]
+        if not bucket:
+            del self.buckets[n]
+            if self.least_uses == n:
+                self.least_uses = n + 1
+        self.uses[k] = n + 1
+        self.buckets.setdefault(n + 1, OrderedDict())[k] = None
+
+    def _put(self, k, value):
+        size = sys.getsizeof(value) if self.max_bytes is not None else 0
+        if (self.max_bytes is not None and size > self.max_bytes) or (
+            self.max_size is not None and self.max_size <= 0
+        ):
+            return
+        # make room first, so the new result is never the one evicted
+        while self.values and (
+            (self.max_size is not None and len(self.values) >= self.max_size)
+            or (self.max_bytes is not None and self.bytes + size > self.max_bytes)
+        ):
+            self._evict()
+        self.values[k] = value
+        self.sizes[k] = size
+        self.bytes += size
+        if self.policy == "lru":
+            self.order[k] = None
+        else:
+            self.uses[k] = 1
+            self.buckets.setdefault(1, OrderedDict())[k] = None
+            self.least_uses = 1
+
+    def _evict(self):
+        if self.policy == "lru":
+            k, _ = self.order.popitem(last=False)
+        else:
+            bucket = self.buckets[self.least_uses]
+            k, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self.buckets[self.least_uses]
+                self.least_uses = min(self.buckets, default=0)
+            del self.uses[k]
+        del self.values[k]
+        self.bytes -= self.sizes.pop(k)
+        self.stats.evictions += 1
@@ -0,0 +1,211 @@
+import builtins
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from transducers.typing import Fn
+import transducers.transducers as t
+
+
+DEFAULT_CHUNK_SIZE = 512
+
+# a chunk step takes a chunk (a list or slice of values) and returns the
+# transformed chunk and whether the stage is done (i.e. reduced)
+ChunkStep = Callable[[List], Tuple[List, bool]]
+# a stage is its chunk step and a completion function which returns any
+# values the stage still holds
+Stage = Tuple[ChunkStep, Callable[[], List]]
+
+
+def chunks(coll: Iterable, size: int = DEFAULT_CHUNK_SIZE) -> Iterable:
+    """
+    Read `coll` in chunks of (up to) `size` values. Lists, tuples and ranges
+    are sliced, any other collection is read through its `iterator`.
+    """
+    if isinstance(coll, (list, tuple, range)):
+        for i in range(0, len(coll), size):
+            yield coll[i : i + size]
+        return
+    it = iter(t.iterator(coll))
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def __nothing() -> List:
+    return []
+
+
+def __map(f: Fn) -> Stage:
+    def step(chunk):
+        return list(builtins.map(f, chunk)), False
+
+    return step, __nothing
+
+
+def __filter(pred: Fn) -> Stage:
+    def step(chunk):
+        return list(builtins.filter(pred, chunk)), False
+
+    return step, __nothing
+
+
+def __keep(f: Fn) -> Stage:
+    def step(chunk):
+        return [x for x in builtins.map(f, chunk) if x is not None], False
+
+    return step, __nothing
+
+
+def __take(n: int) -> Stage:
+    left = n
+
+    def step(chunk):
+        nonlocal left
+        if len(chunk) < left:
+            left -= len(chunk)
+            return chunk, False
+        chunk = chunk[: builtins.max(left, 0)]
+        left = 0
+        return chunk, True
+
+    return step, __nothing
+
+
+def __drop(n: int) -> Stage:
+    left = n
+
+    def step(chunk):
+        nonlocal left
+        if left <= 0:
+            return chunk, False
+        dropped = builtins.min(left, len(chunk))
+        left -= dropped
+        return chunk[dropped:], False
+
+    return step, __nothing
+
+
+__CHUNK_STAGES: Dict[str, Callable[..., Stage]] = {
+    "map": __map,
+    "filter": __filter,
+    "keep": __keep,
+    "take": __take,
+    "drop": __drop,
+}
+
+
+def __per_element(xform: Fn) -> Stage:
+    """
+    Run the (per element) transducer `xform` over each value of a chunk.
+    """
+    buffer: List = []
+    done = False
+
+    def buffering(acc, *xs):
+        if xs:
+            acc.append(xs[0])
+        return acc
+
+    f = xform(buffering)
+
+    def step(chunk):
+        nonlocal buffer, done
+        for x in chunk:
+            if isinstance(f(buffer, x), t.Reduced):
+                done = True
+                break
+        res, buffer = buffer, []
+        return res, done
+
+    def complete():
+        nonlocal buffer
+        f(buffer)
+        res, buffer = buffer, []
+        return res
+
+    return step, complete
+
+
+def __plan(xform: Fn) -> List[Stage]:
+    """
+    Build the stages of one chunked transduction of `xform`. Runs of stages
+    without a chunk aware version are grouped and run per element.
+    """
+    plan: List[Stage] = []
+    pending: List[Fn] = []
+    for name, args, stage in t.stages_of(xform):
+        if name in __CHUNK_STAGES:
+            if pending:
+                plan.append(__per_element(t.comp(*pending)))
+                pending = []
+            plan.append(__CHUNK_STAGES[name](*args))
+        else:
+            pending.append(stage)
+    if pending:
+        plan.append(__per_element(t.comp(*pending)))
+    return plan
+
+
+def __run(plan: List[Stage], start: int, chunk) -> Tuple[List, bool]:
+    done = False
+    for step, _ in plan[start:]:
+        if not len(chunk):
+            break
+        chunk, halted = step(chunk)
+        done = done or halted
+    return chunk, done
+
+
+def __reduce_chunk(f: Fn, init, chunk) -> Tuple[object, bool]:
+    for x in chunk:
+        init = f(init, x)
+        if isinstance(init, t.Reduced):
+            return init.value, True
+    return init, False
+
+
+def __transduce(plan: List[Stage], reduce_chunk: Fn, init, coll, chunk_size: int):
+    for chunk in chunks(coll, chunk_size):
+        chunk, done = __run(plan, 0, chunk)
+        init, reduced = reduce_chunk(init, chunk)
+        if done or reduced:
+            break
+    # complete each stage in order, passing what it held to the stages after it
+    for i, (_, complete) in enumerate(plan):
+        chunk, _ = __run(plan, i + 1, complete())
+        init, _ = reduce_chunk(init, chunk)
+    return init
+
+
+def transduce(xform: Fn, f: Fn, init, coll: Iterable, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Like `transduce` but reads `coll` in chunks of `chunk_size` values. Stages
+    with a chunk aware version (map, filter, remove, keep, take and drop)
+    handle a whole chunk per call, any other stage runs per element.
+    """
+    f = t.completing(f)
+    plan = __plan(xform)
+
+    def reduce_chunk(acc, chunk):
+        return __reduce_chunk(f, acc, chunk)
+
+    return f(__transduce(plan, reduce_chunk, init, coll, chunk_size))
+
+
+def into(init, xform: Fn, coll: Iterable, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Like `into` but reads `coll` in chunks of `chunk_size` values (see
+    `transduce`), conjoining each transformed chunk onto `init` at once.
+    Collections with a `transient` builder are built with it.
+    """
+    plan = __plan(xform)
+
+    def reduce_chunk(acc, chunk):
+        return t.conj(acc, *chunk), False
+
+    if t.has_transient(init):
+        builder = __transduce(plan, reduce_chunk, t.transient(init), coll, chunk_size)
+        return t.persistent(init, builder)
+    return __transduce(plan, reduce_chunk, init, coll, chunk_size)
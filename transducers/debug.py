@@ -1,3 +1,13 @@
+import builtins
+from itertools import islice
+import sys
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Optional
+import warnings
+
+import transducers.transducers as t
+
+
 def spy(f):
     """
     Wrap f with debugging output.
@@ -22,3 +32,316 @@ def spy(f):
     wrapped.__doc__ = f.__doc__
     wrapped.__name__ = name
     return wrapped
+
+
+class StageStats:
+    """
+    Counters for one instrumented stage of a transducer pipeline. Counts
+    accumulate over every transduction the stage is used in.
+
+    Wall time is measured for every `sample_every`th value (and extrapolated
+    to all values): `time` is the time spent in the stage itself and
+    `cumulative_time` includes the stages after it.
+    """
+
+    __slots__ = (
+        "name",
+        "sample_every",
+        "inputs",
+        "outputs",
+        "reduced",
+        "completions",
+        "samples",
+        "sampled_ns",
+        "sampled_self_ns",
+    )
+
+    def __init__(self, name: str, sample_every: int = 64):
+        self.name = name
+        self.sample_every = max(1, sample_every)
+        self.reset()
+
+    def reset(self):
+        self.inputs = 0
+        self.outputs = 0
+        self.reduced = 0
+        self.completions = 0
+        self.samples = 0
+        self.sampled_ns = 0
+        self.sampled_self_ns = 0
+
+    def snapshot(self) -> Dict:
+        """
+        The current counters (and values derived from them) as a dict.
+        """
+        scale = self.inputs / self.samples if self.samples else 0
+        return {
+            "name": self.name,
+            "inputs": self.inputs,
+            "outputs": self.outputs,
+            "selectivity": self.outputs / self.inputs if self.inputs else None,
+            "reduced": self.reduced,
+            "completions": self.completions,
+            "samples": self.samples,
+            "time": self.sampled_self_ns * scale / 1e9,
+            "cumulative_time": self.sampled_ns * scale / 1e9,
+        }
+
+
+def __named(f, name: str):
+    """
+    Rename the code of `f`, so that profilers report it as `name`.
+    """
+    f.__code__ = f.__code__.replace(co_name=name)
+    f.__name__ = f.__qualname__ = name
+    return f
+
+
+def instrument(xform, name: Optional[str] = None, sample_every: int = 64):
+    """
+    Wrap the transducer `xform` with counters of the values going in and out
+    of it, the `Reduced` results it returns (rather than passes on from the
+    stages after it) and (sampled) wall time. The
+    returned transducer keeps its counters as `stats` (a `StageStats`).
+    """
+    if name is None:
+        stages = t.stages_of(xform)
+        name = stages[0][0] if len(stages) == 1 else "xform"
+    stats = StageStats(name, sample_every)
+
+    def instrumented(rf):
+        sampling = False
+        downstream_ns = 0
+        # the last result of the stages after this one, to tell apart Reduced
+        # results of this stage from those it passes on
+        downstream = None
+
+        def counted(acc, *xs):
+            nonlocal downstream_ns, downstream
+            if not xs:
+                return rf(acc)
+            stats.outputs += 1
+            if sampling:
+                start = perf_counter_ns()
+                downstream = rf(acc, *xs)
+                downstream_ns += perf_counter_ns() - start
+            else:
+                downstream = rf(acc, *xs)
+            return downstream
+
+        f = xform(counted)
+
+        def step(acc, *xs):
+            nonlocal sampling, downstream_ns
+            if not xs:
+                stats.completions += 1
+                return f(acc)
+            stats.inputs += 1
+            if stats.inputs % stats.sample_every:
+                res = f(acc, *xs)
+            else:
+                sampling = True
+                downstream_ns = 0
+                start = perf_counter_ns()
+                res = f(acc, *xs)
+                elapsed = perf_counter_ns() - start
+                sampling = False
+                stats.samples += 1
+                stats.sampled_ns += elapsed
+                stats.sampled_self_ns += elapsed - downstream_ns
+            if isinstance(res, t.Reduced) and res is not downstream:
+                stats.reduced += 1
+            return res
+
+        return __named(step, f"stage:{name}")
+
+    instrumented.stats = stats  # type: ignore
+    instrumented.short_circuits = t.can_short_circuit(xform)  # type: ignore
+    return instrumented
+
+
+def instrument_stages(xform, name: Optional[str] = None, sample_every: int = 64):
+    """
+    Instrument each stage of the transducer `xform` (see `instrument`). Stages
+    are named by their position and transducer, prefixed by `name`. The
+    returned transducer keeps the counters of its stages as `stats` (a list
+    of `StageStats`).
+    """
+    prefix = f"{name}/" if name else ""
+    stages = [
+        instrument(stage, f"{prefix}{i}:{stage_name}", sample_every)
+        for i, (stage_name, _, stage) in enumerate(t.stages_of(xform))
+    ] or [instrument(xform, f"{prefix}0:xform", sample_every)]
+    instrumented = t.comp(*stages)
+    instrumented.stats = [stage.stats for stage in stages]  # type: ignore
+    return instrumented
+
+
+def snapshot(xform) -> List[Dict]:
+    """
+    Snapshots of the counters of an instrumented transducer (one per stage).
+    """
+    stats = xform.stats
+    return [s.snapshot() for s in (stats if isinstance(stats, list) else [stats])]
+
+
+def approximate_size(obj, sample: int = 16, depth: int = 2) -> int:
+    """
+    Approximate the size in bytes of `obj` and what it contains (down to
+    `depth` levels of containers), by measuring up to `sample` of its values
+    with `sys.getsizeof` and extrapolating to all of them.
+    """
+    size = sys.getsizeof(obj)
+    if depth <= 0 or isinstance(obj, (str, bytes, bytearray)):
+        return size
+    try:
+        n = len(obj)
+    except TypeError:
+        return size
+    if not n or not hasattr(obj, "__iter__"):
+        return size
+    if isinstance(obj, dict):
+        items = list(islice(obj.items(), sample))
+        sampled = builtins.sum(
+            approximate_size(k, sample, depth - 1)
+            + approximate_size(v, sample, depth - 1)
+            for k, v in items
+        )
+    else:
+        items = list(islice(iter(obj), sample))
+        sampled = builtins.sum(approximate_size(x, sample, depth - 1) for x in items)
+    return size + sampled * n // len(items)
+
+
+class StateGauge:
+    """
+    Measures the live state (e.g. the set of `distinct` or the buffer of
+    `partition`) of a stateful stage: its number of entries and approximate
+    size in bytes (see `approximate_size`), measured every `sample_every`
+    values and on completion.
+
+    If the state grows beyond `max_entries` or `max_bytes`, the gauge warns
+    (with a `ResourceWarning`, once until it is reset) or, when `on_exceed` is
+    "raise", raises a `MemoryError`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        sample_every: int = 1024,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        on_exceed: str = "warn",
+    ):
+        if on_exceed not in ("warn", "raise"):
+            raise ValueError(f"Unknown `on_exceed` ({on_exceed}).")
+        self.name = name
+        self.sample_every = max(1, sample_every)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.on_exceed = on_exceed
+        self.reset()
+
+    def reset(self):
+        self.values = 0
+        self.samples = 0
+        self.entries = 0
+        self.bytes = 0
+        self.peak_entries = 0
+        self.peak_bytes = 0
+        self.warned = False
+
+    def tick(self, state: Callable):
+        """
+        Count a value going into the stage, measuring `state()` every
+        `sample_every` values.
+        """
+        self.values += 1
+        if not self.values % self.sample_every:
+            self.measure(state())
+
+    def measure(self, state):
+        self.samples += 1
+        self.entries = len(state)
+        self.bytes = approximate_size(state)
+        self.peak_entries = max(self.peak_entries, self.entries)
+        self.peak_bytes = max(self.peak_bytes, self.bytes)
+        if self.max_entries is not None and self.entries > self.max_entries:
+            self.__exceeded(f"{self.entries} entries (max {self.max_entries})")
+        elif self.max_bytes is not None and self.bytes > self.max_bytes:
+            self.__exceeded(f"~{self.bytes} bytes (max {self.max_bytes})")
+
+    def __exceeded(self, detail: str):
+        message = f"State of '{self.name}' grew to {detail}."
+        if self.on_exceed == "raise":
+            raise MemoryError(message)
+        if not self.warned:
+            self.warned = True
+            warnings.warn(message, ResourceWarning, stacklevel=4)
+
+    def snapshot(self) -> Dict:
+        return {
+            "name": self.name,
+            "values": self.values,
+            "samples": self.samples,
+            "entries": self.entries,
+            "bytes": self.bytes,
+            "peak_entries": self.peak_entries,
+            "peak_bytes": self.peak_bytes,
+        }
+
+
+def gauge_rf(rf: Callable, gauge: StateGauge) -> Callable:
+    """
+    Measure the state of the (stateful) reducing function `rf` with `gauge`.
+    `rf` must expose its live state as `rf.state()`, like the reducing
+    functions of `distinct`, `partition` and `chunked_conj` do.
+    """
+    state = rf.state  # type: ignore
+
+    def gauged(acc, *xs):
+        if not xs:
+            gauge.measure(state())
+            return rf(acc)
+        gauge.tick(state)
+        return rf(acc, *xs)
+
+    gauged.short_circuits = t.can_short_circuit(rf)  # type: ignore
+    return gauged
+
+
+def gauge(xform, name: Optional[str] = None, **options):
+    """
+    Measure the state of each stateful stage of the transducer `xform` (see
+    `StateGauge`, which takes the `options`). The returned transducer keeps
+    a gauge for each stage as `gauges`; gauges of stages without state stay
+    empty.
+    """
+    prefix = f"{name}/" if name else ""
+    gauges = []
+    stages = []
+    for i, (stage_name, _, stage) in enumerate(t.stages_of(xform)):
+        g = StateGauge(f"{prefix}{i}:{stage_name}", **options)
+        gauges.append(g)
+        stages.append(__gauged(stage, g))
+    if stages:
+        gauged = t.comp(*stages)
+    else:
+        # wrap a transducer without stages (like `identity`) anew, so that
+        # `gauges` isn't set on the (shared) transducer itself
+        def fresh(rf):
+            return xform(rf)
+
+        fresh.short_circuits = t.can_short_circuit(xform)  # type: ignore
+        gauged = fresh
+    gauged.gauges = gauges  # type: ignore
+    return gauged
+
+
+def __gauged(xform, g: StateGauge):
+    def gauged(rf):
+        rf2 = xform(rf)
+        return gauge_rf(rf2, g) if hasattr(rf2, "state") else rf2
+
+    gauged.short_circuits = t.can_short_circuit(xform)  # type: ignore
+    return gauged
@@ -0,0 +1,469 @@
+import bz2
+import codecs
+import csv
+import gzip
+import io
+import json
+import lzma
+import mmap
+import os
+import struct
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from transducers.typing import Fn
+import transducers.transducers as t
+
+
+# File sources, which scan files in large blocks (instead of reading them line
+# by line), through a memory map of the file unless it is compressed. They are
+# reducible (so `transduce` and `into` run their own loop over each block, and
+# stop reading the file once the reduction is reduced) and iterable.
+#
+# File sinks, which buffer the values conjoined onto them (by `into`) and
+# write them out in large blocks.
+#
+# Files are compressed with `compression` ("gzip", "bz2" or "lzma"). By default
+# ("infer"), it is inferred from the suffix of the file's path.
+
+DEFAULT_BLOCK_SIZE = 1 << 20
+DEFAULT_BUFFER_SIZE = 4096
+
+COMPRESSIONS: Dict[str, Fn] = {"gzip": gzip.open, "bz2": bz2.open, "lzma": lzma.open}
+SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".xz": "lzma", ".lzma": "lzma"}
+
+
+# Module private helpers are named `__name`, except for those used in class
+# bodies, where such names would be mangled (`_name`).
+
+
+def __compression(path, compression: Optional[str]) -> Optional[str]:
+    if compression == "infer":
+        return SUFFIXES.get(os.path.splitext(os.fspath(path))[1])
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression ({compression}).")
+    return compression
+
+
+def __open(path, mode: str, compression: Optional[str], **kwargs):
+    compression = __compression(path, compression)
+    if compression is None:
+        return open(path, mode, **kwargs)
+    if "b" not in mode and "t" not in mode:
+        mode += "t"
+    return COMPRESSIONS[compression](path, mode, **kwargs)
+
+
+def _blocks(path, block_size: int, compression="infer") -> Iterator[bytes]:
+    """
+    Read the file at `path` in blocks of `block_size` bytes, through a memory
+    map of the file, or decompressing it.
+    """
+    compression = __compression(path, compression)
+    if compression is not None:
+        with __open(path, "rb", compression) as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                yield block
+        return
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for start in range(0, len(mm), block_size):
+                yield mm[start : start + block_size]
+
+
+def __reduce_batches(batches: Iterator[List], f, init):
+    try:
+        for batch in batches:
+            for x in batch:
+                init = f(init, x)
+                if isinstance(init, t.Reduced):
+                    return init.value
+        return init
+    finally:
+        batches.close()  # type: ignore
+
+
+class Lines:
+    """
+    The lines of a file (separated by b"\n", without their line endings, i.e.
+    without a b"\r" before it either), as `bytes`, or as `str` when an
+    `encoding` is given. The lines of a block are decoded at once, so the
+    encoding must be one in which b"\n" only encodes a newline (e.g. UTF-8).
+    """
+
+    __slots__ = ("path", "encoding", "block_size", "compression")
+
+    def __init__(
+        self,
+        path,
+        encoding: Optional[str] = None,
+        block_size: int = 0,
+        compression: Optional[str] = "infer",
+    ):
+        self.path = path
+        self.encoding = encoding
+        self.block_size = block_size or DEFAULT_BLOCK_SIZE
+        self.compression = compression
+
+    def batches(self) -> Iterator[List]:
+        """
+        The lines of the file, in lists of the lines of each block.
+        """
+        rest = b""
+        for block in _blocks(self.path, self.block_size, self.compression):
+            end = block.rfind(b"\n")
+            if end < 0:
+                rest += block
+                continue
+            # the complete lines of the block (and the line it finishes) are
+            # split (and decoded) at once
+            yield self.__split(rest + block[:end])
+            rest = block[end + 1 :]
+        if rest:
+            yield self.__split(rest)
+
+    def __split(self, chunk: bytes) -> List:
+        # only look for line endings to strip in chunks with any (CRLF files).
+        # A chunk ends right before a b"\n", or at the end of the file.
+        if b"\r" in chunk:
+            chunk = chunk.replace(b"\r\n", b"\n")
+            if chunk.endswith(b"\r"):
+                chunk = chunk[:-1]
+        if self.encoding is None:
+            return chunk.split(b"\n")
+        return chunk.decode(self.encoding).split("\n")
+
+    def __iter__(self) -> Iterator:
+        for batch in self.batches():
+            yield from batch
+
+
+class Records:
+    """
+    The fixed-size binary records of a file, unpacked with the `struct` format
+    `fmt` (as tuples, see `struct.iter_unpack`).
+    """
+
+    __slots__ = ("path", "struct", "block_size", "compression")
+
+    def __init__(
+        self,
+        path,
+        fmt: str,
+        block_size: int = 0,
+        compression: Optional[str] = "infer",
+    ):
+        self.path = path
+        self.compression = compression
+        self.struct = struct.Struct(fmt)
+        # blocks hold whole records
+        size = self.struct.size
+        block_size = block_size or DEFAULT_BLOCK_SIZE
+        self.block_size = max(size, block_size // size * size)
+
+    def batches(self) -> Iterator:
+        """
+        The records of the file, in iterators of the records of each block.
+        """
+        for block in _blocks(self.path, self.block_size, self.compression):
+            if len(block) % self.struct.size:
+                raise ValueError(
+                    f"File size not a multiple of the record size "
+                    f"({self.struct.size})."
+                )
+            yield self.struct.iter_unpack(block)
+
+    def __iter__(self) -> Iterator:
+        for batch in self.batches():
+            yield from batch
+
+
+class JsonLines(Lines):
+    """
+    The values of a JSON Lines file (UTF-8 encoded, with a value per line),
+    decoded a block of lines at a time.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, path, block_size: int = 0, compression="infer"):
+        super().__init__(path, "utf-8", block_size, compression)
+
+    def batches(self) -> Iterator[List]:
+        # each (non blank) line is decoded by itself, as one JSON value
+        decode = json.JSONDecoder().decode
+        for batch in super().batches():
+            yield [decode(line) for line in batch if line.strip()]
+
+
+class CsvRows:
+    """
+    The rows of a CSV file, as lists (or as dicts keyed by the header row,
+    with `dicts`), read by `csv.reader` with the format parameters `fmt`.
+    The file is read and decoded in blocks of `block_size` bytes.
+    """
+
+    __slots__ = ("path", "dicts", "encoding", "compression", "block_size", "fmt")
+
+    def __init__(
+        self,
+        path,
+        dicts: bool = False,
+        encoding: str = "utf-8",
+        compression: Optional[str] = "infer",
+        block_size: int = 0,
+        **fmt,
+    ):
+        self.path = path
+        self.dicts = dicts
+        self.encoding = encoding
+        self.compression = compression
+        self.block_size = block_size or DEFAULT_BLOCK_SIZE
+        self.fmt = fmt
+
+    def __iter__(self) -> Iterator:
+        reader = csv.DictReader if self.dicts else csv.reader
+        yield from reader(self.__lines(), **self.fmt)
+
+    def __lines(self) -> Iterator[str]:
+        # decode each block at once, and pass on its complete lines (with their
+        # line endings, like a file opened with newline="")
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        rest = ""
+        for block in _blocks(self.path, self.block_size, self.compression):
+            text = rest + decoder.decode(block)
+            end = text.rfind("\n") + 1
+            rest = text[end:]
+            yield from io.StringIO(text[:end], newline="")
+        rest += decoder.decode(b"", final=True)
+        yield from io.StringIO(rest, newline="")
+
+
+def lines(
+    path, encoding: Optional[str] = None, block_size: int = 0, compression="infer"
+) -> Lines:
+    """
+    A source of the lines of the file at `path` (see `Lines`), read in blocks
+    of `block_size` bytes.
+
+    into([], comp(filter(lambda l: b"ERROR" in l), take(10)), lines("app.log"))
+    """
+    return Lines(path, encoding, block_size, compression)
+
+
+def records(path, fmt: str, block_size: int = 0, compression="infer") -> Records:
+    """
+    A source of the binary records of the file at `path` (see `Records`), read
+    in blocks of about `block_size` bytes.
+    """
+    return Records(path, fmt, block_size, compression)
+
+
+def jsonl(path, block_size: int = 0, compression="infer") -> JsonLines:
+    """
+    A source of the values of the JSON Lines file at `path` (see `JsonLines`).
+    """
+    return JsonLines(path, block_size, compression)
+
+
+def csv_rows(
+    path, dicts: bool = False, block_size: int = 0, compression="infer", **fmt
+) -> CsvRows:
+    """
+    A source of the rows of the CSV file at `path` (see `CsvRows`), read in
+    blocks of `block_size` bytes.
+    """
+    return CsvRows(path, dicts, compression=compression, block_size=block_size, **fmt)
+
+
+# sinks
+
+
+class Sink:
+    """
+    A target for `into` which writes values to a `stream`: values are encoded
+    with `encode` and written (as a list of encoded values) with `write_all`.
+
+    Conjoining onto a sink writes right away. `into` conjoins onto its
+    `transient` builder instead, which buffers `buffer_size` values at a time
+    and writes what is left when the builder is made `persistent` (at the end
+    of `into`).
+
+    A sink opened from a path owns its file: close the sink (e.g. using it as a
+    context manager) to close the file, which finishes compressed files.
+    """
+
+    def __init__(
+        self,
+        stream,
+        encode: Fn,
+        write_all: Callable[[List], object],
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        owned: bool = False,
+    ):
+        self.stream = stream
+        self.encode = encode
+        self.write_all = write_all
+        self.buffer_size = max(1, buffer_size)
+        self.owned = owned
+
+    def write(self, values: Iterable):
+        self.write_all([self.encode(x) for x in values])
+        return self
+
+    def close(self):
+        if self.owned:
+            self.stream.close()
+
+    def __enter__(self) -> "Sink":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SinkBuilder:
+    """
+    The buffering (transient) builder of a `Sink`.
+    """
+
+    __slots__ = ("sink", "buffer")
+
+    def __init__(self, sink: Sink):
+        self.sink = sink
+        self.buffer: List = []
+
+    def conj_one(self, x) -> "SinkBuilder":
+        self.buffer.append(self.sink.encode(x))
+        if len(self.buffer) >= self.sink.buffer_size:
+            self.flush()
+        return self
+
+    def conj(self, values: Iterable) -> "SinkBuilder":
+        buffer, encode = self.buffer, self.sink.encode
+        for x in values:
+            buffer.append(encode(x))
+            if len(buffer) >= self.sink.buffer_size:
+                self.flush()
+                buffer = self.buffer
+        return self
+
+    def flush(self) -> Sink:
+        if self.buffer:
+            self.sink.write_all(self.buffer)
+            self.buffer = []
+        return self.sink
+
+
+def __target(target, mode: str, compression, **kwargs):
+    """
+    Get the stream to write to `target` (a path or a stream), and whether it
+    was opened (so is owned by the sink).
+    """
+    if isinstance(target, (str, bytes, os.PathLike)):
+        return __open(target, mode, compression, **kwargs), True
+    return target, False
+
+
+def lines_sink(
+    target,
+    encode: Optional[Fn] = None,
+    binary: bool = False,
+    mode: str = "w",
+    encoding: str = "utf-8",
+    compression="infer",
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> Sink:
+    """
+    A sink writing values as lines (encoded by `encode`, to `str`, or to
+    `bytes` when `binary`) to `target`, a path (opened with `mode`) or a
+    stream. By default, values are written as `str(x)`, or as they are when
+    `binary`.
+    """
+    if encode is None:
+        encode = t.identity if binary else str
+    if binary:
+        stream, owned = __target(target, mode + "b", compression)
+    else:
+        stream, owned = __target(target, mode, compression, encoding=encoding)
+    newline = b"\n" if binary else "\n"
+
+    def encode_line(x):
+        return encode(x) + newline  # type: ignore
+
+    return Sink(stream, encode_line, stream.writelines, buffer_size, owned)
+
+
+def jsonl_sink(
+    target,
+    mode: str = "w",
+    compression="infer",
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    **dumps,
+) -> Sink:
+    """
+    A sink writing values as JSON Lines to `target`, a path (opened with
+    `mode`) or a stream. `dumps` are options of the `json.JSONEncoder`.
+    """
+    encoder = json.JSONEncoder(**{"separators": (",", ":"), **dumps})
+    stream, owned = __target(target, mode, compression, encoding="utf-8")
+
+    def write_all(values: List):
+        stream.write("\n".join(values) + "\n")
+
+    return Sink(stream, encoder.encode, write_all, buffer_size, owned)
+
+
+def csv_sink(
+    target,
+    header: Optional[List[str]] = None,
+    mode: str = "w",
+    encoding: str = "utf-8",
+    compression="infer",
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    **fmt,
+) -> Sink:
+    """
+    A sink writing values (sequences of fields, or dicts when a `header` is
+    given) as CSV rows to `target`, a path (opened with `mode`) or a stream,
+    with the `csv.writer` format parameters `fmt`. The header row is written
+    when the sink is created.
+    """
+    stream, owned = __target(target, mode, compression, encoding=encoding, newline="")
+    writerows: Fn
+    if header is None:
+        writerows = csv.writer(stream, **fmt).writerows
+    else:
+        writer = csv.DictWriter(stream, header, **fmt)
+        writer.writeheader()
+        writerows = writer.writerows
+    return Sink(stream, t.identity, writerows, buffer_size, owned)
+
+
+def __reduce_source(source, f, init):
+    return __reduce_batches(source.batches(), f, init)
+
+
+t.reducible.extend(Lines, ("reduce", __reduce_source))
+t.reducible.extend(Records, ("reduce", __reduce_source))
+
+t.collection.extend(
+    Sink,
+    ("conj_one", lambda sink, x: sink.write((x,))),
+    ("conj_iterable", lambda sink, values: sink.write(values)),
+    ("is_immutable", lambda _: False),
+)
+
+t.collection.extend(
+    SinkBuilder,
+    ("conj_one", SinkBuilder.conj_one),
+    ("conj_iterable", lambda builder, values: builder.conj(values)),
+    ("is_immutable", lambda _: False),
+)
+
+t.transients.extend(
+    Sink,
+    ("transient", SinkBuilder),
+    ("persistent", lambda _, builder: builder.flush()),
+)
@@ -0,0 +1,158 @@
+from functools import lru_cache, partial
+from typing import Any, Dict, List, Tuple
+
+from transducers.typing import Fn
+import transducers.transducers as t
+
+
+# Source templates for each fusable stage. `{i}` is replaced with the index of
+# the stage in the pipeline, `a{i}` is the argument the stage was created with
+# and any other names suffixed with `{i}` are the stage's state. Each value is
+# pushed through the stages in a single pass `while` loop, so `break` drops the
+# current value, and setting `halt` stops the reduction after the current
+# value.
+__SETUP: Dict[str, List[str]] = {
+    "map": [],
+    "map_indexed": ["c{i} = 0"],
+    "filter": [],
+    "keep": [],
+    "take": ["n{i} = a{i}"],
+    "drop": ["n{i} = a{i}"],
+    "take_nth": ["c{i} = 0"],
+    "distinct": ["s{i} = set()"],
+    "dedupe": ["l{i} = stub"],
+    "partition": ["b{i} = []"],
+}
+
+__STEP: Dict[str, List[str]] = {
+    "map": ["x = a{i}(x)"],
+    "map_indexed": ["x = a{i}(c{i}, x)", "c{i} += 1"],
+    "filter": ["if not a{i}(x):", "    break"],
+    "keep": ["x = a{i}(x)", "if x is None:", "    break"],
+    "take": [
+        "if n{i} <= 0:",
+        "    halt = True",
+        "    break",
+        "n{i} -= 1",
+        "if n{i} <= 0:",
+        "    halt = True",
+    ],
+    "drop": ["if n{i} > 0:", "    n{i} -= 1", "    break"],
+    "take_nth": ["c{i} += 1", "if (c{i} - 1) % a{i}:", "    break"],
+    "distinct": ["if x in s{i}:", "    break", "s{i}.add(x)"],
+    "dedupe": ["if l{i} is not stub and not x != l{i}:", "    break", "l{i} = x"],
+    "partition": [
+        "b{i}.append(x)",
+        "if len(b{i}) < a{i}:",
+        "    break",
+        "x = b{i}",
+        "b{i} = []",
+    ],
+}
+
+# pushing a value into the reducing function, checking whether it ended the
+# reduction (with `Reduced`) only when it can
+__REDUCE = [
+    "init = rf(init, x)",
+    "if isinstance(init, Reduced):",
+    "    init = init.value",
+    "    halt = True",
+]
+
+__REDUCE_UNCHECKED = ["init = rf(init, x)"]
+
+
+def __indent(lines: List[str], depth: int) -> List[str]:
+    return [("    " * depth) + line for line in lines]
+
+
+def __steps(shape: Tuple[str, ...], start: int, short_circuits: bool) -> List[str]:
+    """
+    Source lines to push `x` through the stages of `shape` from `start` onward
+    and into the reducing function.
+    """
+    lines: List[str] = []
+    for i in range(start, len(shape)):
+        lines.extend(line.format(i=i) for line in __STEP[shape[i]])
+    lines.extend(__REDUCE if short_circuits else __REDUCE_UNCHECKED)
+    if all(line.strip() != "break" for line in lines):
+        return lines
+    return ["while True:"] + __indent(lines + ["break"], 1)
+
+
+@lru_cache(maxsize=None)
+def compile_shape(shape: Tuple[str, ...], short_circuits: bool = True) -> Fn:
+    """
+    Generate (and cache) a single loop function for a pipeline of the given
+    `shape` (the names of its stages, in order), for a reducing function
+    which can end the reduction early (`short_circuits`) or not. The returned
+    function is called with the reducing function, its completion, the
+    initial value, the source and then the argument of each stage.
+    """
+    halts = short_circuits or "take" in shape
+    params = ", ".join(f"a{i}" for i in range(len(shape)))
+    lines = [f"def fused(rf, complete, init, coll, {params}):"]
+    if halts:
+        lines.append("    halt = False")
+    for i, name in enumerate(shape):
+        lines.extend(__indent([line.format(i=i) for line in __SETUP[name]], 1))
+    lines.append("    for x in iterator(coll):")
+    lines.extend(__indent(__steps(shape, 0, short_circuits), 2))
+    if halts:
+        lines.append("        if halt:")
+        lines.append("            break")
+    # flush partially filled partitions (in pipeline order) on completion
+    for i, name in enumerate(shape):
+        if name == "partition":
+            lines.append(f"    if b{i}:")
+            lines.append(f"        x = b{i}")
+            lines.extend(__indent(__steps(shape, i + 1, short_circuits), 2))
+    lines.append("    return complete(init)")
+
+    namespace: Dict[str, Any] = {
+        "iterator": t.iterator,
+        "Reduced": t.Reduced,
+        "stub": object(),
+    }
+    exec("\n".join(lines), namespace)
+    return namespace["fused"]
+
+
+# built in collections conjoin values onto a collection of their own type, so
+# `conj` onto them can be resolved once for the whole reduction
+__BUILT_IN = (list, set, dict, str, tuple, frozenset, bytes, bytearray)
+
+
+def __resolve_conj(f: Fn, init) -> Fn:
+    if f is t.conj and type(init) in __BUILT_IN:
+        return t.collection.implementation("conj_one", type(init)) or f
+    return f
+
+
+def fuse(xform: Fn) -> Fn:
+    """
+    Compile a transducer built with `comp` from the built in transducers (map,
+    map_indexed, filter, remove, keep, take, drop, take_nth, distinct, dedupe
+    and partition) into a single loop. Returns a function which is called like
+    `transduce` without the transducer, i.e. `fuse(xform)(f, init, coll)`.
+
+    Loops are generated once per pipeline shape and cached. Like `transduce`,
+    they only check for `Reduced` results when the reducing function can
+    return one, and `conj` onto a built in collection is resolved once per
+    reduction. If `xform` has a stage which can't be fused, the returned
+    function falls back to `transduce`.
+    """
+    stages = t.stages_of(xform)
+    if any(name not in __STEP for name, _, _ in stages):
+        return partial(t.transduce, xform)
+
+    shape = tuple(name for name, _, _ in stages)
+    args = tuple(args[0] if args else None for _, args, _ in stages)
+
+    def run(f: Fn, init, coll):
+        # steps only get a `Reduced` check when the reducing function can
+        # return one (stages halt the loop themselves)
+        fused = compile_shape(shape, t.can_short_circuit(f))
+        return fused(__resolve_conj(f, init), t.completing(f), init, coll, *args)
+
+    return run
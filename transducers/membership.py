@@ -0,0 +1,171 @@
+from collections import OrderedDict
+import math
+import sys
+import time
+from typing import Callable, Iterator, Optional
+
+
+# Bounded membership tests for `distinct` on unbounded streams. Each one has a
+# fixed memory ceiling, decided when it is created:
+#
+# - `Window` remembers (exactly) the `max_size` most recently seen values,
+#   optionally forgetting values not seen for `ttl` seconds.
+# - `BloomFilter` remembers all values in a fixed size bit array, at the cost
+#   of reporting some new values as seen (false positives).
+# - `Bitmap` remembers (exactly) all integers of a small domain `[0, size)`,
+#   with one bit per integer.
+#
+# `add(x)` remembers `x` and returns whether it is new (i.e. was not seen),
+# `x in ...` tests whether `x` was seen without remembering it.
+
+MASK64 = (1 << 64) - 1
+
+
+class Window:
+    __slots__ = ("max_size", "ttl", "clock", "seen")
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_size < 1:
+            raise ValueError(f"Window size must be positive ({max_size}).")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        # values by the time they were last seen, least recently seen first
+        self.seen: OrderedDict = OrderedDict()
+
+    def add(self, x) -> bool:
+        seen = self.seen
+        now = self.clock() if self.ttl is not None else 0
+        if self.ttl is not None:
+            expired = now - self.ttl
+            while seen and next(iter(seen.values())) <= expired:
+                seen.popitem(last=False)
+        new = x not in seen
+        seen[x] = now
+        if new:
+            if len(seen) > self.max_size:
+                seen.popitem(last=False)
+        else:
+            seen.move_to_end(x)
+        return new
+
+    def __contains__(self, x) -> bool:
+        if x not in self.seen:
+            return False
+        return self.ttl is None or self.seen[x] > self.clock() - self.ttl
+
+    def __len__(self) -> int:
+        return len(self.seen)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.seen)
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sys.getsizeof(self.seen)
+
+
+def _mix(h: int) -> int:
+    """
+    Scramble the bits of the 64 bit integer `h` (the splitmix64 finalizer), as
+    `hash` of small integers is the integer itself.
+    """
+    h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & MASK64
+    return h ^ (h >> 31)
+
+
+class BloomFilter:
+    __slots__ = ("capacity", "error_rate", "size", "hashes", "count", "bits")
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        A filter sized for `capacity` values with a false positive rate of
+        `error_rate`, using `-capacity * ln(error_rate) / ln(2)^2` bits. Past
+        `capacity` values the rate of false positives grows, but the size
+        doesn't.
+        """
+        if capacity < 1:
+            raise ValueError(f"Bloom filter capacity must be positive ({capacity}).")
+        if not 0 < error_rate < 1:
+            raise ValueError(
+                f"Bloom filter error rate must be in (0, 1) ({error_rate})."
+            )
+        self.capacity = capacity
+        self.error_rate = error_rate
+        bits = -capacity * math.log(error_rate) / math.log(2) ** 2
+        self.size = max(8, math.ceil(bits))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def __positions(self, x) -> Iterator[int]:
+        # double hashing: the i-th position is h1 + i * h2
+        h1 = _mix(hash(x) & MASK64)
+        h2 = _mix(h1 ^ MASK64) | 1
+        size = self.size
+        return ((h1 + i * h2) % size for i in range(self.hashes))
+
+    def add(self, x) -> bool:
+        bits = self.bits
+        new = False
+        for pos in self.__positions(x):
+            byte, bit = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & bit:
+                bits[byte] |= bit
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def __contains__(self, x) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & 1 << (pos & 7) for pos in self.__positions(x))
+
+    def __len__(self) -> int:
+        """
+        Number of values added (and reported as new).
+        """
+        return self.count
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sys.getsizeof(self.bits)
+
+
+class Bitmap:
+    __slots__ = ("size", "count", "bits")
+
+    def __init__(self, size: int):
+        """
+        A bitmap of the integers in `[0, size)`, using `size / 8` bytes.
+        """
+        if size < 1:
+            raise ValueError(f"Bitmap size must be positive ({size}).")
+        self.size = size
+        self.count = 0
+        self.bits = bytearray((size + 7) // 8)
+
+    def add(self, x: int) -> bool:
+        if not 0 <= x < self.size:
+            raise ValueError(
+                f"Value out of the bitmap's domain [0, {self.size}) ({x})."
+            )
+        byte, bit = x >> 3, 1 << (x & 7)
+        if self.bits[byte] & bit:
+            return False
+        self.bits[byte] |= bit
+        self.count += 1
+        return True
+
+    def __contains__(self, x: int) -> bool:
+        return 0 <= x < self.size and bool(self.bits[x >> 3] & 1 << (x & 7))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sys.getsizeof(self.bits)
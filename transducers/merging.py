@@ -0,0 +1,150 @@
+import heapq
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+from transducers.typing import Fn
+import transducers.transducers as t
+
+
+# Sources combining sorted sources (sorted by `key`, by default the values
+# themselves), by merging them with a heap: each runs in O(n log k) time for k
+# sources of n values in total, and holds O(k) values at a time (except
+# `merge_join`, which holds a group of equal keys of its right source).
+#
+# The set operations (`union`, `intersection` and `difference`) treat values
+# with equal keys as the same value, and produce each key once.
+
+__first = itemgetter(0)
+# the (key, group) of an exhausted source of `merge_join`
+__end: Any = object()
+__no_group: Tuple[Any, Iterator] = (__end, iter(()))
+
+
+def merge_sorted(*sources: Iterable, key: Optional[Fn] = None, reverse=False):
+    """
+    Merge the sorted `sources` into one sorted source. Values with equal keys
+    keep the order of their sources.
+    """
+    return heapq.merge(*(t.iterator(s) for s in sources), key=key, reverse=reverse)
+
+
+def __tagged(i: int, source: Iterable, key: Optional[Fn]) -> Iterator:
+    if key is None:
+        return ((x, i, x) for x in t.iterator(source))
+    return ((key(x), i, x) for x in t.iterator(source))
+
+
+def __groups(sources, key: Optional[Fn]) -> Iterator:
+    """
+    The groups of values with equal keys of the merged `sources`, as
+    `(key, entries)` with entries `(key, index of source, value)`.
+    """
+    merged = heapq.merge(
+        *(__tagged(i, s, key) for i, s in enumerate(sources)), key=__first
+    )
+    return groupby(merged, __first)
+
+
+def union(*sources: Iterable, key: Optional[Fn] = None) -> Iterator:
+    """
+    The values of any of the sorted `sources`, once per key (the first of
+    each).
+    """
+    for _, entries in __groups(sources, key):
+        yield next(entries)[2]
+
+
+def intersection(*sources: Iterable, key: Optional[Fn] = None) -> Iterator:
+    """
+    The values of the sorted `sources` with a key found in all of them, once
+    per key (the first of each).
+    """
+    for _, entries in __groups(sources, key):
+        first = next(entries)
+        found = {first[1]}
+        found.update(i for _, i, _ in entries)
+        if len(found) == len(sources):
+            yield first[2]
+
+
+def difference(source: Iterable, *others: Iterable, key: Optional[Fn] = None):
+    """
+    The values of the sorted `source` with a key found in none of the sorted
+    `others`, once per key (the first of each).
+    """
+    for _, entries in __groups((source, *others), key):
+        first = next(entries)
+        if first[1] == 0 and all(i == 0 for _, i, _ in entries):
+            yield first[2]
+
+
+JOINS = ("inner", "left", "right", "outer")
+
+
+def __pairs(combine: Fn, lefts, rights) -> Iterator:
+    for left in lefts:
+        for right in rights:
+            yield combine(left, right)
+
+
+def merge_join(
+    left: Iterable,
+    right: Iterable,
+    left_key: Optional[Fn] = None,
+    right_key: Optional[Fn] = None,
+    how: str = "inner",
+    combine: Optional[Fn] = None,
+) -> Iterator:
+    """
+    Join the sorted sources `left` and `right` on equal keys (`left_key` of
+    left values and `right_key` of right values, by default `left_key`),
+    producing `combine(left value, right value)` (by default a tuple) for each
+    pair of values with equal keys, in order.
+
+    An "inner" join (`how`) only pairs values with equal keys, a "left",
+    "right" or "outer" join also pairs values of the left, right or either
+    source without a match with None.
+    """
+    if how not in JOINS:
+        raise ValueError(f"Unknown join ({how}).")
+    left_key = left_key or t.identity
+    return __merge_join(
+        left,
+        right,
+        left_key,
+        right_key or left_key,
+        how in ("left", "outer"),
+        how in ("right", "outer"),
+        combine or (lambda l, r: (l, r)),
+    )
+
+
+def __merge_join(
+    left, right, left_key, right_key, keep_left, keep_right, combine
+) -> Iterator:
+    lefts = groupby(t.iterator(left), left_key)
+    rights = groupby(t.iterator(right), right_key)
+    lk, lg = next(lefts, __no_group)
+    rk, rg = next(rights, __no_group)
+    while lk is not __end and rk is not __end:
+        # equal keys first, so keys which only support equality (like None)
+        # can be joined
+        if lk == rk:
+            yield from __pairs(combine, lg, list(rg))
+            lk, lg = next(lefts, __no_group)
+            rk, rg = next(rights, __no_group)
+        elif lk < rk:
+            if keep_left:
+                yield from __pairs(combine, lg, (None,))
+            lk, lg = next(lefts, __no_group)
+        else:
+            if keep_right:
+                yield from __pairs(combine, (None,), rg)
+            rk, rg = next(rights, __no_group)
+    while keep_left and lk is not __end:
+        yield from __pairs(combine, lg, (None,))
+        lk, lg = next(lefts, __no_group)
+    while keep_right and rk is not __end:
+        yield from __pairs(combine, (None,), rg)
+        rk, rg = next(rights, __no_group)
@@ -0,0 +1,239 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+import multiprocessing
+import os
+import pickle
+from typing import Deque, Iterable, Optional
+
+from transducers.typing import Fn
+import transducers.transducers as t
+
+
+# stages which can be applied to each partition independently; any other stage
+# depends on the values before it, so pipelines with them are folded serially
+STATELESS_STAGES = {"map", "filter", "keep"}
+
+# the transduction a `fold` worker process is running. Worker processes are
+# forked when the platform supports it, so the transducer, reducing functions
+# and a sliceable source don't have to be pickled; only partition bounds are.
+# Otherwise the job is pickled, with the transducer as the names and functions
+# of its stages (transducers are closures, which can't be pickled).
+__job = None
+
+
+def __start_job(job, rebuild: bool):
+    global __job
+    if rebuild:
+        stages, *rest = job
+        xforms = [getattr(t, name)(f) for name, f in stages]
+        job = (t.comp(*xforms) if xforms else t.identity, *rest)
+    __job = job
+
+
+def __stage_functions(xform: Fn) -> tuple:
+    stages = []
+    for name, args, _ in t.stages_of(xform):
+        negated = getattr(args[0], "complement_of", None)
+        if name == "filter" and negated is not None:
+            stages.append(("remove", negated))
+        else:
+            stages.append((name, args[0]))
+    return tuple(stages)
+
+
+def __reduce_partition(part):
+    xform, f, combinef, coll = __job
+    if isinstance(part, tuple):
+        start, stop = part
+        part = coll[start:stop]
+    f = xform(t.completing(f))
+    acc = combinef()
+    reduced = False
+    for x in t.iterator(part):
+        acc = f(acc, x)
+        if isinstance(acc, t.Reduced):
+            acc = acc.value
+            reduced = True
+            break
+    # partial results are completed once, after being combined
+    return acc, reduced
+
+
+def __is_sliceable(coll: Iterable) -> bool:
+    return (
+        hasattr(coll, "__len__")
+        and hasattr(coll, "__getitem__")
+        and not isinstance(coll, dict)
+    )
+
+
+def __partitions(coll: Iterable, n: int) -> Iterable:
+    """
+    Partitions of `coll` with `n` values each. Sliceable collections are
+    partitioned by (start, stop) bounds, anything else is read into lists.
+    """
+    if __is_sliceable(coll):
+        size = len(coll)  # type: ignore
+        return ((i, min(i + n, size)) for i in range(0, size, n))
+    it = iter(t.iterator(coll))
+    return iter(lambda: list(islice(it, n)), [])
+
+
+def __can_fold(xform: Fn) -> bool:
+    return all(name in STATELESS_STAGES for name, _, _ in t.stages_of(xform))
+
+
+def __check_picklable(job):
+    try:
+        pickle.dumps(job)
+    except Exception as e:
+        raise TypeError(
+            "Can't `fold` in worker processes which aren't forked: the "
+            f"transducer, reducing functions and source must be picklable ({e})."
+        ) from e
+
+
+def fold(
+    xform: Fn,
+    f: Fn,
+    combinef: Fn,
+    coll: Iterable,
+    n: int = 512,
+    workers: Optional[int] = None,
+):
+    """
+    Transduce `coll` in parallel. `coll` is split into partitions of `n`
+    values, each partition is transduced in a separate process (starting from
+    `combinef()`), and the partial results are merged in order with
+    `combinef(a, b)`. The merged result is then completed (with `f` called
+    with 1 arg), like with `transduce`.
+
+    If a partition's reduction is reduced (with `Reduced`), the results of
+    the partitions up to and including it are combined and the remaining
+    partitions are abandoned.
+
+    Only stateless transducers (map, filter, remove and keep) can be applied
+    to each partition independently. Any other transducer is transduced
+    serially (still starting from `combinef()`).
+
+    Worker processes are forked where the platform supports it. Elsewhere
+    (with the "spawn" start method, e.g. on Windows), the functions of the
+    stages of `xform`, `f`, `combinef` and the partitions are pickled, so they
+    can't be lambdas or local functions; a TypeError is raised up front if
+    they can't be pickled.
+    """
+    if not __can_fold(xform):
+        return t.transduce(xform, f, combinef(), coll)
+
+    workers = workers or os.cpu_count() or 1
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+
+    source = coll if __is_sliceable(coll) else None
+    rebuild = context.get_start_method() != "fork"
+    job: tuple
+    if rebuild:
+        job = (__stage_functions(xform), f, combinef, source)
+        __check_picklable(job)
+    else:
+        job = (xform, f, combinef, source)
+    result = combinef()
+    with ProcessPoolExecutor(
+        workers, mp_context=context, initializer=__start_job, initargs=(job, rebuild)
+    ) as pool:
+        # keep a bounded number of partitions in flight, in order
+        pending: Deque = deque()
+        parts = iter(__partitions(coll, n))
+        for part in islice(parts, 2 * workers):
+            pending.append(pool.submit(__reduce_partition, part))
+        while pending:
+            res, reduced = pending.popleft().result()
+            result = combinef(result, res)
+            if reduced:
+                for future in pending:
+                    future.cancel()
+                break
+            for part in islice(parts, 1):
+                pending.append(pool.submit(__reduce_partition, part))
+    return xform(t.completing(f))(result)
+
+
+def __pmap_generator(f: Fn, limit: int, workers: int, colls) -> Iterable:
+    with ThreadPoolExecutor(workers) as pool:
+        pending: Deque = deque()
+        for xs in zip(*(t.iterator(coll) for coll in colls)):
+            pending.append(pool.submit(f, *xs))
+            while len(pending) >= limit or (pending and pending[0].done()):
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def pmap(
+    f: Fn, *rest: Iterable, workers: Optional[int] = None, max_in_flight=None
+):
+    """
+    Like `map` but calls `f` on a pool of `workers` threads, for functions
+    which wait on I/O or release the GIL. Results are passed on in the order
+    of their inputs.
+
+    At most `max_in_flight` calls (twice the number of workers by default) are
+    pending at once; adding another waits for the oldest to finish. The
+    transducer waits for all pending calls when it is completed (called with
+    1 arg) and shuts down its pool, as it does when it is reduced or a call
+    (or a step after it) raises.
+    """
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    limit = max(1, max_in_flight or 2 * workers)
+    if rest:
+        return __pmap_generator(f, limit, workers, rest)
+
+    def xform(rf):
+        pool = None
+        pending: Deque = deque()
+
+        def shutdown():
+            nonlocal pool
+            for future in pending:
+                future.cancel()
+            pending.clear()
+            if pool is not None:
+                pool.shutdown()
+                pool = None
+
+        def rf2(init, *xs):
+            nonlocal pool
+            if not xs:
+                try:
+                    while pending:
+                        init = rf(init, pending.popleft().result())
+                        if isinstance(init, t.Reduced):
+                            init = init.value
+                            break
+                finally:
+                    shutdown()
+                return rf(init)
+            elif len(xs) == 1:
+                # the pool lives until the transduction is completed, reduced
+                # or fails
+                try:
+                    if pool is None:
+                        pool = ThreadPoolExecutor(workers)
+                    pending.append(pool.submit(f, xs[0]))
+                    while len(pending) >= limit or (pending and pending[0].done()):
+                        init = rf(init, pending.popleft().result())
+                        if isinstance(init, t.Reduced):
+                            shutdown()
+                            return init
+                except BaseException:
+                    shutdown()
+                    raise
+                return init
+            raise TypeError(
+                f"Some arities of transducing `pmap` not supported ({1 + len(xs)})."
+            )
+
+        return rf2
+
+    return xform
@@ -0,0 +1,710 @@
+from typing import Iterable, Iterator, List, Optional, Union
+
+import transducers.transducers as t
+
+
+# Persistent (immutable) collections with structural sharing: updates copy
+# only the O(log32 n) nodes on the path to the change and share the rest with
+# the original. Each collection has a transient version for bulk updates,
+# which mutates the nodes it created itself (marked with its `edit` token)
+# instead of copying them.
+#
+# Module private helpers are named `__name`, except for those used in class
+# bodies, where such names would be mangled (`_name`).
+
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+
+_missing = object()
+
+
+class Node:
+    __slots__ = ("edit", "array")
+
+    def __init__(self, edit, array: List):
+        self.edit = edit
+        self.array = array
+
+
+def __editable(node: Node, edit) -> Node:
+    """
+    Return `node` if the transient `edit` owns it, else a copy owned by `edit`.
+    """
+    if edit is not None and node.edit is edit:
+        return node
+    return Node(edit, list(node.array))
+
+
+def _ensure_transient(edit):
+    if edit is None:
+        raise RuntimeError("Transient used after call to persistent.")
+
+
+# vector
+
+
+def _tail_offset(cnt: int) -> int:
+    return 0 if cnt < WIDTH else ((cnt - 1) >> BITS) << BITS
+
+
+def _array_for(vec, i: int) -> List:
+    if not 0 <= i < vec.cnt:
+        raise IndexError("vector index out of range")
+    if i >= _tail_offset(vec.cnt):
+        return vec.tail
+    node = vec.root
+    level = vec.shift
+    while level > 0:
+        node = node.array[(i >> level) & MASK]
+        level -= BITS
+    return node.array
+
+
+def __new_path(edit, level: int, node: Node) -> Node:
+    while level > 0:
+        node = Node(edit, [node])
+        level -= BITS
+    return node
+
+
+def __push_tail(edit, cnt: int, level: int, parent: Node, tail: Node) -> Node:
+    ret = __editable(parent, edit)
+    i = ((cnt - 1) >> level) & MASK
+    if level == BITS:
+        child = tail
+    elif i < len(parent.array):
+        child = __push_tail(edit, cnt, level - BITS, parent.array[i], tail)
+    else:
+        child = __new_path(edit, level - BITS, tail)
+    if i < len(ret.array):
+        ret.array[i] = child
+    else:
+        ret.array.append(child)
+    return ret
+
+
+def _conj_tail(edit, cnt: int, shift: int, root: Node, tail: List):
+    """
+    Push the full `tail` of a vector with `cnt` values into its tree. Returns
+    the new shift and root.
+    """
+    tail_node = Node(edit, tail)
+    if (cnt >> BITS) > (1 << shift):
+        return shift + BITS, Node(edit, [root, __new_path(edit, shift, tail_node)])
+    return shift, __push_tail(edit, cnt, shift, root, tail_node)
+
+
+def _assoc_in(edit, level: int, node: Node, i: int, x) -> Node:
+    ret = __editable(node, edit)
+    if level == 0:
+        ret.array[i & MASK] = x
+    else:
+        j = (i >> level) & MASK
+        ret.array[j] = _assoc_in(edit, level - BITS, node.array[j], i, x)
+    return ret
+
+
+class PersistentVector:
+    """
+    An immutable vector. `conj` appends, `assoc` replaces a value, and both
+    return a new vector sharing structure with the original.
+    """
+
+    __slots__ = ("cnt", "shift", "root", "tail")
+
+    def __init__(self, cnt=0, shift=BITS, root=None, tail=None):
+        self.cnt = cnt
+        self.shift = shift
+        self.root = root if root is not None else Node(None, [])
+        self.tail = tail if tail is not None else []
+
+    def conj(self, x) -> "PersistentVector":
+        if self.cnt - _tail_offset(self.cnt) < WIDTH:
+            tail = self.tail + [x]
+            return PersistentVector(self.cnt + 1, self.shift, self.root, tail)
+        shift, root = _conj_tail(None, self.cnt, self.shift, self.root, self.tail)
+        return PersistentVector(self.cnt + 1, shift, root, [x])
+
+    def assoc(self, i: int, x) -> "PersistentVector":
+        if i == self.cnt:
+            return self.conj(x)
+        if not 0 <= i < self.cnt:
+            raise IndexError("vector index out of range")
+        if i >= _tail_offset(self.cnt):
+            tail = list(self.tail)
+            tail[i & MASK] = x
+            return PersistentVector(self.cnt, self.shift, self.root, tail)
+        root = _assoc_in(None, self.shift, self.root, i, x)
+        return PersistentVector(self.cnt, self.shift, root, self.tail)
+
+    def transient(self) -> "TransientVector":
+        return TransientVector(self)
+
+    def __getitem__(self, i: int):
+        if i < 0:
+            i += self.cnt
+        return _array_for(self, i)[i & MASK]
+
+    def __len__(self) -> int:
+        return self.cnt
+
+    def __iter__(self) -> Iterator:
+        for i in range(0, self.cnt, WIDTH):
+            yield from _array_for(self, i)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (PersistentVector, list, tuple)):
+            return len(self) == len(other) and all(
+                x == y for x, y in zip(self, other)
+            )
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        return f"vector({', '.join(repr(x) for x in self)})"
+
+
+class TransientVector:
+    """
+    A mutable version of a `PersistentVector`, for building a vector in bulk.
+    `persistent` returns the built vector and ends the transient.
+    """
+
+    __slots__ = ("cnt", "shift", "root", "tail", "edit")
+
+    def __init__(self, vec: PersistentVector):
+        self.edit = object()
+        self.cnt = vec.cnt
+        self.shift = vec.shift
+        self.root = vec.root
+        self.tail = list(vec.tail)
+
+    def conj(self, x) -> "TransientVector":
+        _ensure_transient(self.edit)
+        if self.cnt - _tail_offset(self.cnt) < WIDTH:
+            self.tail.append(x)
+        else:
+            self.shift, self.root = _conj_tail(
+                self.edit, self.cnt, self.shift, self.root, self.tail
+            )
+            self.tail = [x]
+        self.cnt += 1
+        return self
+
+    def assoc(self, i: int, x) -> "TransientVector":
+        _ensure_transient(self.edit)
+        if i == self.cnt:
+            return self.conj(x)
+        if not 0 <= i < self.cnt:
+            raise IndexError("vector index out of range")
+        if i >= _tail_offset(self.cnt):
+            self.tail[i & MASK] = x
+        else:
+            self.root = _assoc_in(self.edit, self.shift, self.root, i, x)
+        return self
+
+    def persistent(self) -> PersistentVector:
+        _ensure_transient(self.edit)
+        self.edit = None
+        return PersistentVector(self.cnt, self.shift, self.root, self.tail)
+
+    def __getitem__(self, i: int):
+        _ensure_transient(self.edit)
+        if i < 0:
+            i += self.cnt
+        return _array_for(self, i)[i & MASK]
+
+    def __len__(self) -> int:
+        return self.cnt
+
+
+def vector(*xs) -> PersistentVector:
+    """
+    Create a persistent vector of the values `xs`.
+    """
+    tv = EMPTY_VECTOR.transient()
+    for x in xs:
+        tv.conj(x)
+    return tv.persistent()
+
+
+EMPTY_VECTOR = PersistentVector()
+
+
+# hash array mapped trie (map and set)
+
+
+def _hash(key) -> int:
+    return hash(key) & 0xFFFFFFFF
+
+
+def _bitpos(h: int, shift: int) -> int:
+    return 1 << ((h >> shift) & MASK)
+
+
+def _index(bitmap: int, bit: int) -> int:
+    return bin(bitmap & (bit - 1)).count("1")
+
+
+class BitmapNode:
+    """
+    A trie node holding up to 32 entries, each either a (key, value) tuple
+    or a child node. `bitmap` has a bit set for each present entry.
+    """
+
+    __slots__ = ("edit", "bitmap", "array")
+
+    def __init__(self, edit, bitmap: int, array: List):
+        self.edit = edit
+        self.bitmap = bitmap
+        self.array = array
+
+    def find(self, shift: int, h: int, key, default):
+        bit = _bitpos(h, shift)
+        if not self.bitmap & bit:
+            return default
+        entry = self.array[_index(self.bitmap, bit)]
+        if isinstance(entry, tuple):
+            return entry[1] if entry[0] == key else default
+        return entry.find(shift + BITS, h, key, default)
+
+    def __editable(self, edit) -> "BitmapNode":
+        if edit is not None and self.edit is edit:
+            return self
+        return BitmapNode(edit, self.bitmap, list(self.array))
+
+    def assoc(self, edit, shift: int, h: int, key, val, added: List):
+        bit = _bitpos(h, shift)
+        i = _index(self.bitmap, bit)
+        if self.bitmap & bit:
+            entry = self.array[i]
+            if isinstance(entry, tuple):
+                if entry[0] == key:
+                    if entry[1] is val:
+                        return self
+                    new = (key, val)
+                else:
+                    added[0] = True
+                    new = _create_node(
+                        edit, shift + BITS, entry, _hash(entry[0]), (key, val), h
+                    )
+            else:
+                new = entry.assoc(edit, shift + BITS, h, key, val, added)
+                if new is entry:
+                    return self
+            node = self.__editable(edit)
+            node.array[i] = new
+            return node
+        added[0] = True
+        node = self.__editable(edit)
+        node.bitmap |= bit
+        node.array.insert(i, (key, val))
+        return node
+
+    def dissoc(self, edit, shift: int, h: int, key, removed: List):
+        bit = _bitpos(h, shift)
+        if not self.bitmap & bit:
+            return self
+        i = _index(self.bitmap, bit)
+        entry = self.array[i]
+        if isinstance(entry, tuple):
+            if entry[0] != key:
+                return self
+            removed[0] = True
+            if self.bitmap == bit:
+                return None
+            node = self.__editable(edit)
+            node.bitmap ^= bit
+            del node.array[i]
+            return node
+        new = entry.dissoc(edit, shift + BITS, h, key, removed)
+        if new is entry:
+            return self
+        node = self.__editable(edit)
+        if new is None:
+            if self.bitmap == bit:
+                return None
+            node.bitmap ^= bit
+            del node.array[i]
+        else:
+            node.array[i] = new
+        return node
+
+    def __iter__(self) -> Iterator:
+        for entry in self.array:
+            if isinstance(entry, tuple):
+                yield entry
+            else:
+                yield from entry
+
+
+class CollisionNode:
+    """
+    A node for entries whose keys have the same (32 bit) hash.
+    """
+
+    __slots__ = ("edit", "hash", "array")
+
+    def __init__(self, edit, h: int, array: List):
+        self.edit = edit
+        self.hash = h
+        self.array = array
+
+    def __find_index(self, key) -> int:
+        for i, (k, _) in enumerate(self.array):
+            if k == key:
+                return i
+        return -1
+
+    def find(self, shift: int, h: int, key, default):
+        i = self.__find_index(key)
+        return self.array[i][1] if i >= 0 else default
+
+    def __editable(self, edit) -> "CollisionNode":
+        if edit is not None and self.edit is edit:
+            return self
+        return CollisionNode(edit, self.hash, list(self.array))
+
+    def assoc(self, edit, shift: int, h: int, key, val, added: List):
+        if h != self.hash:
+            # nest this node in a bitmap node and add the new entry to that
+            bit = _bitpos(self.hash, shift)
+            node: Union[BitmapNode, CollisionNode] = BitmapNode(edit, bit, [self])
+            return node.assoc(edit, shift, h, key, val, added)
+        i = self.__find_index(key)
+        if i >= 0 and self.array[i][1] is val:
+            return self
+        node = self.__editable(edit)
+        if i >= 0:
+            node.array[i] = (key, val)
+        else:
+            added[0] = True
+            node.array.append((key, val))
+        return node
+
+    def dissoc(self, edit, shift: int, h: int, key, removed: List):
+        i = self.__find_index(key)
+        if i < 0:
+            return self
+        removed[0] = True
+        if len(self.array) == 1:
+            return None
+        node = self.__editable(edit)
+        del node.array[i]
+        return node
+
+    def __iter__(self) -> Iterator:
+        return iter(self.array)
+
+
+def _create_node(edit, shift: int, entry1: tuple, h1: int, entry2: tuple, h2: int):
+    if h1 == h2:
+        return CollisionNode(edit, h1, [entry1, entry2])
+    added = [False]
+    node = BitmapNode(edit, 0, [])
+    node = node.assoc(edit, shift, h1, entry1[0], entry1[1], added)
+    return node.assoc(edit, shift, h2, entry2[0], entry2[1], added)
+
+
+class PersistentHashMap:
+    """
+    An immutable hash map (a hash array mapped trie). `assoc` and `dissoc`
+    return a new map sharing structure with the original. Like `dict`, it
+    iterates its keys and is conjoined (and transduced) as (key, value)
+    tuples.
+    """
+
+    __slots__ = ("cnt", "root")
+
+    def __init__(self, cnt=0, root=None):
+        self.cnt = cnt
+        self.root = root if root is not None else BitmapNode(None, 0, [])
+
+    def get(self, key, default=None):
+        return self.root.find(0, _hash(key), key, default)
+
+    def assoc(self, key, val) -> "PersistentHashMap":
+        added = [False]
+        root = self.root.assoc(None, 0, _hash(key), key, val, added)
+        if root is self.root:
+            return self
+        return PersistentHashMap(self.cnt + 1 if added[0] else self.cnt, root)
+
+    def dissoc(self, key) -> "PersistentHashMap":
+        removed = [False]
+        root = self.root.dissoc(None, 0, _hash(key), key, removed)
+        if root is self.root:
+            return self
+        return PersistentHashMap(self.cnt - 1, root)
+
+    def transient(self) -> "TransientHashMap":
+        return TransientHashMap(self)
+
+    def items(self) -> Iterator:
+        return iter(self.root)
+
+    def keys(self) -> Iterator:
+        return (k for k, _ in self.root)
+
+    def values(self) -> Iterator:
+        return (v for _, v in self.root)
+
+    def __getitem__(self, key):
+        val = self.get(key, _missing)
+        if val is _missing:
+            raise KeyError(key)
+        return val
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, _missing) is not _missing
+
+    def __len__(self) -> int:
+        return self.cnt
+
+    def __iter__(self) -> Iterator:
+        return self.keys()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (PersistentHashMap, dict)):
+            return len(self) == len(other) and all(
+                k in other and other[k] == v for k, v in self.items()
+            )
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self.items()))
+
+    def __repr__(self) -> str:
+        return f"hash_map({dict(self.items())!r})"
+
+
+class TransientHashMap:
+    """
+    A mutable version of a `PersistentHashMap`, for building a map in bulk.
+    `persistent` returns the built map and ends the transient.
+    """
+
+    __slots__ = ("cnt", "root", "edit")
+
+    def __init__(self, m: PersistentHashMap):
+        self.edit = object()
+        self.cnt = m.cnt
+        self.root = m.root
+
+    def assoc(self, key, val) -> "TransientHashMap":
+        _ensure_transient(self.edit)
+        added = [False]
+        self.root = self.root.assoc(self.edit, 0, _hash(key), key, val, added)
+        if added[0]:
+            self.cnt += 1
+        return self
+
+    def dissoc(self, key) -> "TransientHashMap":
+        _ensure_transient(self.edit)
+        removed = [False]
+        root = self.root.dissoc(self.edit, 0, _hash(key), key, removed)
+        self.root = root if root is not None else BitmapNode(self.edit, 0, [])
+        if removed[0]:
+            self.cnt -= 1
+        return self
+
+    def get(self, key, default=None):
+        _ensure_transient(self.edit)
+        return self.root.find(0, _hash(key), key, default)
+
+    def persistent(self) -> PersistentHashMap:
+        _ensure_transient(self.edit)
+        self.edit = None
+        return PersistentHashMap(self.cnt, self.root)
+
+    def __len__(self) -> int:
+        return self.cnt
+
+
+class PersistentHashSet:
+    """
+    An immutable hash set, backed by a `PersistentHashMap`. `conj` and `disj`
+    return a new set sharing structure with the original.
+    """
+
+    __slots__ = ("map",)
+
+    def __init__(self, m: Optional[PersistentHashMap] = None):
+        self.map = m if m is not None else EMPTY_MAP
+
+    def conj(self, x) -> "PersistentHashSet":
+        m = self.map.assoc(x, x)
+        return self if m is self.map else PersistentHashSet(m)
+
+    def disj(self, x) -> "PersistentHashSet":
+        m = self.map.dissoc(x)
+        return self if m is self.map else PersistentHashSet(m)
+
+    def transient(self) -> "TransientHashSet":
+        return TransientHashSet(self)
+
+    def __contains__(self, x) -> bool:
+        return x in self.map
+
+    def __len__(self) -> int:
+        return len(self.map)
+
+    def __iter__(self) -> Iterator:
+        return self.map.keys()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (PersistentHashSet, set, frozenset)):
+            return len(self) == len(other) and all(x in other for x in self)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self))
+
+    def __repr__(self) -> str:
+        return f"hash_set({', '.join(repr(x) for x in self)})"
+
+
+class TransientHashSet:
+    """
+    A mutable version of a `PersistentHashSet`, for building a set in bulk.
+    `persistent` returns the built set and ends the transient.
+    """
+
+    __slots__ = ("map",)
+
+    def __init__(self, s: PersistentHashSet):
+        self.map = s.map.transient()
+
+    def conj(self, x) -> "TransientHashSet":
+        self.map.assoc(x, x)
+        return self
+
+    def disj(self, x) -> "TransientHashSet":
+        self.map.dissoc(x)
+        return self
+
+    def persistent(self) -> PersistentHashSet:
+        return PersistentHashSet(self.map.persistent())
+
+    def __contains__(self, x) -> bool:
+        return self.map.get(x, _missing) is not _missing
+
+    def __len__(self) -> int:
+        return len(self.map)
+
+
+EMPTY_MAP = PersistentHashMap()
+EMPTY_SET = PersistentHashSet()
+
+
+def hash_map(*args, **kwargs) -> PersistentHashMap:
+    """
+    Create a persistent hash map, from the same arguments as `dict`.
+    """
+    tm = EMPTY_MAP.transient()
+    for k, v in dict(*args, **kwargs).items():
+        tm.assoc(k, v)
+    return tm.persistent()
+
+
+def hash_set(*xs) -> PersistentHashSet:
+    """
+    Create a persistent hash set of the values `xs`.
+    """
+    ts = EMPTY_SET.transient()
+    for x in xs:
+        ts.conj(x)
+    return ts.persistent()
+
+
+# extend the collection, transient, iterator and reducible protocols
+
+
+def __conj_all(coll, iterable: Iterable):
+    tc = coll.transient()
+    for x in iterable:
+        tc = t.conj(tc, x)
+    return tc.persistent()
+
+
+def __assoc_entry(m, kv):
+    k, v = kv
+    return m.assoc(k, v)
+
+
+def __assoc_entries(m, iterable: Iterable):
+    for kv in iterable:
+        m = __assoc_entry(m, kv)
+    return m
+
+
+t.collection.extend(
+    PersistentVector,
+    ("conj_one", lambda v, x: v.conj(x)),
+    ("conj_iterable", __conj_all),
+    ("is_immutable", lambda _: True),
+    ("empty", lambda _: EMPTY_VECTOR),
+)
+
+t.collection.extend(
+    TransientVector,
+    ("conj_one", lambda v, x: v.conj(x)),
+    ("conj_iterable", lambda v, iterable: t.reduce(t.conj, v, iterable)),
+    ("is_immutable", lambda _: False),
+)
+
+t.collection.extend(
+    PersistentHashMap,
+    ("conj_one", __assoc_entry),
+    ("conj_iterable", lambda m, it: __assoc_entries(m.transient(), it).persistent()),
+    ("is_immutable", lambda _: True),
+    ("empty", lambda _: EMPTY_MAP),
+)
+
+t.collection.extend(
+    TransientHashMap,
+    ("conj_one", __assoc_entry),
+    ("conj_iterable", __assoc_entries),
+    ("is_immutable", lambda _: False),
+)
+
+t.collection.extend(
+    PersistentHashSet,
+    ("conj_one", lambda s, x: s.conj(x)),
+    ("conj_iterable", __conj_all),
+    ("is_immutable", lambda _: True),
+    ("empty", lambda _: EMPTY_SET),
+)
+
+t.collection.extend(
+    TransientHashSet,
+    ("conj_one", lambda s, x: s.conj(x)),
+    ("conj_iterable", lambda s, iterable: t.reduce(t.conj, s, iterable)),
+    ("is_immutable", lambda _: False),
+)
+
+for persistent_type in (PersistentVector, PersistentHashMap, PersistentHashSet):
+    t.transients.extend(
+        persistent_type,
+        ("transient", lambda coll: coll.transient()),
+        ("persistent", lambda _, tc: tc.persistent()),
+    )
+
+# like dict, transduce from a hash map as (key, value) tuples
+t.custom_iter.extend(PersistentHashMap, ("iter", lambda m: m.items()))
+
+
+def __reduce_vector(vec: PersistentVector, f, init):
+    # walk the leaf arrays directly, instead of through a generator
+    for i in range(0, vec.cnt, WIDTH):
+        for x in _array_for(vec, i):
+            init = f(init, x)
+            if isinstance(init, t.Reduced):
+                return init.value
+    return init
+
+
+t.reducible.extend(PersistentVector, ("reduce", __reduce_vector))
@@ -1,19 +1,23 @@
-from functools import partial
 import typing
-from typing import Dict, Any, Iterable
+from typing import Dict, Any, Iterable, Optional
 
 
-from transducers.typing import Implementation, Extension
+from transducers.typing import Implementation, Extension, Fn
+
+
+def resolve(impls: Implementation, t: type) -> Optional[Fn]:
+    """
+    Find the implementation for type `t` in `impls`, looking through the
+    types of `t`'s method resolution order (ending with `object`).
+    """
+    for base in t.__mro__:
+        if base in impls:
+            return impls[base]
+    return None
 
 
 def call(name: str, impls: Implementation, o: Any, *args, **kwargs):
-    # TODO support class hierarchy with type and base types in ideal order
-    types = [type(o)]
-    impl = None
-    for t in types:
-        if t in impls:
-            impl = impls[t]
-            break
+    impl = resolve(impls, type(o))
     if callable(impl):
         return impl(o, *args, **kwargs)
     raise ValueError(
@@ -21,23 +25,70 @@ def call(name: str, impls: Implementation, o: Any, *args, **kwargs):
     )
 
 
+def dispatcher(name: str, impls: Implementation, cache: Dict[type, Any]) -> Fn:
+    """
+    Create the function which dispatches protocol method `name` on the type
+    of its first argument. Resolved implementations (and types without one)
+    are cached per type in `cache`.
+    """
+
+    def dispatch(o, *args, **kwargs):
+        t = type(o)
+        try:
+            impl = cache[t]
+        except KeyError:
+            impl = cache[t] = resolve(impls, t)
+        if impl is None:
+            raise ValueError(
+                f"Protocol method '{name}' not implemented for '{t.__name__}'"
+            )
+        return impl(o, *args, **kwargs)
+
+    dispatch.__name__ = name
+    return dispatch
+
+
 class Protocol:
     def __init__(self, interface: Iterable[str]):
         self.__implementations: Dict[str, Implementation] = {}
+        self.__caches: Dict[str, Dict[type, Any]] = {}
         for method in set(interface):
-            if method == "extend":
+            if method in ("extend", "implementation"):
                 raise ValueError(
-                    "Cannot create a protocol with 'extend' (reserved for Protocol class)."
+                    f"Cannot create a protocol with '{method}' "
+                    "(reserved for Protocol class)."
                 )
             self.__implementations[method] = {}
+            self.__caches[method] = {}
+            # bind the dispatching function once, so calling a protocol method
+            # is a regular attribute lookup
+            setattr(
+                self,
+                method,
+                dispatcher(
+                    method, self.__implementations[method], self.__caches[method]
+                ),
+            )
 
     def extend(self, t: type, *impls: Extension):
         for (method, impl) in impls:
             self.__implementations[method][t] = impl
+        # extending a type can change the implementation of its subtypes
+        for cache in self.__caches.values():
+            cache.clear()
+
+    def implementation(self, name: str, t: type) -> Optional[Fn]:
+        """
+        Get the implementation of method `name` for type `t` (or None).
+        """
+        cache = self.__caches[name]
+        try:
+            return cache[t]
+        except KeyError:
+            impl = cache[t] = resolve(self.__implementations[name], t)
+            return impl
 
     def __getattr__(self, name: str):
-        if name in self.__implementations:
-            return partial(call, name, self.__implementations[name])
         raise AttributeError(
             f"'{type(self).__name__}' object has no attribute '{name}'"
         )
@@ -47,7 +98,9 @@ def protocol(*interface: str) -> Protocol:
     """
     Create a new protocol with the given interface. Returns a protocol object.
     The protocol object itself contains the implementations, and must be used
-    to invoke the interface
+    to invoke the interface. Implementations are looked up through the method
+    resolution order of the value's type, so extending a type also extends its
+    subtypes (and extending `object` provides a default).
 
     greeter = protocol("hello")
     greeter.extend(int, ("hello", lambda x: f"Welcome, {x}!"))
@@ -0,0 +1,171 @@
+from collections import deque
+from typing import Any, Callable, Deque, Iterable, Tuple
+
+import transducers.transducers as t
+
+
+# Rolling aggregates over sliding windows of `size` values. Each one emits the
+# aggregate of the last `size` values for every value from the `size`-th on,
+# updating it in O(1) (amortized for min and max) as a value enters and
+# another leaves the window, instead of rescanning the window.
+#
+# An aggregate is a function creating the state of one rolling aggregation:
+# a function `push(x, old)` which adds `x` to the window, removes `old` from it
+# (`__empty` while the window isn't full yet) and returns the aggregate.
+
+__empty = object()
+
+Push = Callable[[object, object], object]
+
+
+def __sum() -> Push:
+    total = 0
+
+    def push(x, old):
+        nonlocal total
+        total += x
+        if old is not __empty:
+            total -= old
+        return total
+
+    return push
+
+
+def __mean(size: int) -> Callable[[], Push]:
+    def aggregate():
+        add = __sum()
+        return lambda x, old: add(x, old) / size
+
+    return aggregate
+
+
+def __var(ddof: int) -> Callable[[], Push]:
+    def aggregate():
+        # Welford's algorithm, extended to remove the value leaving the window
+        n = 0
+        mean = 0.0
+        m2 = 0.0
+
+        def push(x, old):
+            nonlocal n, mean, m2
+            if old is __empty:
+                n += 1
+                delta = x - mean
+                mean += delta / n
+                m2 += delta * (x - mean)
+            else:
+                previous = mean
+                mean += (x - old) / n
+                m2 += (x - old) * (x - mean + old - previous)
+            return max(m2, 0.0) / (n - ddof) if n > ddof else float("nan")
+
+        return push
+
+    return aggregate
+
+
+def __extreme(better: Callable[[Any, Any], bool]) -> Callable[[], Push]:
+    def aggregate():
+        # candidates for the extreme of the window (with their index), from
+        # the oldest: each is better than all the values after it
+        candidates: Deque[Tuple[int, object]] = deque()
+        i = 0
+        n = 0
+
+        def push(x, old):
+            nonlocal i, n
+            while candidates and not better(candidates[-1][1], x):
+                candidates.pop()
+            candidates.append((i, x))
+            i += 1
+            if old is __empty:
+                n += 1
+            elif candidates[0][0] <= i - 1 - n:
+                candidates.popleft()
+            return candidates[0][1]
+
+        return push
+
+    return aggregate
+
+
+def __rolling_generator(size: int, aggregate: Callable[[], Push], coll: Iterable):
+    push = aggregate()
+    w: Deque = deque(maxlen=size)
+    for x in coll:
+        old = w[0] if len(w) == size else __empty
+        w.append(x)
+        res = push(x, old)
+        if len(w) == size:
+            yield res
+
+
+def __rolling(name: str, size: int, aggregate: Callable[[], Push], rest):
+    if size < 1:
+        raise ValueError(f"`{name}` size must be positive ({size}).")
+    if rest:
+        if len(rest) == 1:
+            return __rolling_generator(size, aggregate, rest[0])
+        raise TypeError(f"Can't `{name}` on more than one collection.")
+
+    @t.staged(name, size)
+    def xform(rf):
+        push = aggregate()
+        w: Deque = deque(maxlen=size)
+
+        def rf2(init, *xs):
+            if not xs:
+                return rf(init)
+            elif len(xs) == 1:
+                x = xs[0]
+                old = w[0] if len(w) == size else __empty
+                w.append(x)
+                res = push(x, old)
+                if len(w) == size:
+                    return rf(init, res)
+                return init
+            raise TypeError(
+                f"Some arities of transducing `{name}` not supported ({1 + len(xs)})."
+            )
+
+        rf2.state = lambda: w  # type: ignore
+        return rf2
+
+    return xform
+
+
+def rolling_sum(size: int, *rest: Iterable):
+    """
+    Sums of sliding windows of `size` values. Float sums are updated (not
+    recomputed), so they can accumulate rounding errors over long streams.
+    """
+    return __rolling("rolling_sum", size, __sum, rest)
+
+
+def rolling_mean(size: int, *rest: Iterable):
+    """
+    Means of sliding windows of `size` values.
+    """
+    return __rolling("rolling_mean", size, __mean(size), rest)
+
+
+def rolling_var(size: int, *rest: Iterable, ddof: int = 1):
+    """
+    Variances of sliding windows of `size` values, with `ddof` delta degrees of
+    freedom (by default the sample variance, NaN for windows of one value).
+    """
+    return __rolling("rolling_var", size, __var(ddof), rest)
+
+
+def rolling_min(size: int, *rest: Iterable):
+    """
+    Minimums of sliding windows of `size` values.
+    """
+    return __rolling("rolling_min", size, __extreme(lambda a, b: a < b), rest)
+
+
+def rolling_max(size: int, *rest: Iterable):
+    """
+    Maximums of sliding windows of `size` values.
+    """
+    return __rolling("rolling_max", size, __extreme(lambda a, b: a > b), rest)
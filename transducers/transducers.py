@@ -1,4 +1,7 @@
-from typing import Union, Iterable, Set, List
+import array
+from collections import deque
+import functools
+from typing import Deque, Union, Iterable, Set, List
 
 from transducers.typing import Coll, Fn
 from transducers.protocols import protocol
@@ -17,17 +20,33 @@ def identity(x):
     return x
 
 
+# identity is also the transducer which leaves values unchanged
+identity.stages = ()  # type: ignore
+
+
 def complement(f):
     """
     Returns a function calls `f` and negates the result before returning it.
+    The returned function keeps a reference to `f` as `complement_of`.
     """
 
     def f2(*args):
         return not f(*args)
 
+    f2.complement_of = f  # type: ignore
     return f2
 
 
+def __with_stages(composition, fs):
+    """
+    Record the combined stages of the composed transducers `fs` on
+    `composition` when any of them describes its stages (see `staged`).
+    """
+    if any(hasattr(f, "stages") for f in fs):
+        composition.stages = tuple(s for f in fs for s in stages_of(f))
+    return composition
+
+
 def comp(f, *fs):
     if len(fs) == 0:
         return f
@@ -37,29 +56,29 @@ def comp(f, *fs):
         def composition(*args):
             return f(g(*args))
 
-        return composition
+        return __with_stages(composition, (f, g))
     elif len(fs) == 2:
         g, h = fs
 
         def composition(*args):
             return f(g(h(*args)))
 
-        return composition
+        return __with_stages(composition, (f, g, h))
     elif len(fs) == 3:
         g, h, i = fs
 
         def composition(*args):
             return f(g(h(i(*args))))
 
-        return composition
+        return __with_stages(composition, (f, g, h, i))
     else:
         fs = [f] + list(fs)
         first = fs[-1]
 
         def composition(*args):
-            return reduce(lambda x, f2: f2(x), first(*args), fs[:-1])
+            return reduce(lambda x, f2: f2(x), first(*args), reversed(fs[:-1]))
 
-        return composition
+        return __with_stages(composition, fs)
 
 
 def repeat(x, n=None):
@@ -88,11 +107,11 @@ def conj(coll: Coll, *xs) -> Coll:
     return collection.conj_iterable(coll, xs)
 
 
+conj.short_circuits = False  # type: ignore
+
+
 def is_immutable(coll: Coll) -> bool:
-    try:
-        return collection.is_immutable(coll)
-    except:
-        return False
+    return collection.is_immutable(coll)
 
 
 def empty(coll: Coll) -> Coll:
@@ -102,6 +121,31 @@ def empty(coll: Coll) -> Coll:
     return collection.empty(coll)
 
 
+# declare a protocol for building immutable collections with a mutable
+# (transient) builder, e.g. a list of parts for a str
+transients = protocol("transient", "persistent")
+
+
+def transient(coll: Coll):
+    """
+    Return a new mutable builder holding the values of the immutable `coll`.
+    The builder supports `conj`.
+    """
+    return transients.transient(coll)
+
+
+def persistent(coll: Coll, builder) -> Coll:
+    """
+    Freeze `builder` (returned by `transient(coll)`) into a collection of the
+    same type as `coll`.
+    """
+    return transients.persistent(coll, builder)
+
+
+def has_transient(coll: Coll) -> bool:
+    return transients.implementation("transient", type(coll)) is not None
+
+
 custom_iter = protocol("iter")
 
 
@@ -109,10 +153,7 @@ def iterator(coll: Iterable) -> Iterable:
     """
     Get (possibly custom) iterator for the `coll`.
     """
-    try:
-        return custom_iter.iter(coll)
-    except:
-        return iter(coll)
+    return custom_iter.iter(coll)
 
 
 #  reducer/transducer wrappers
@@ -147,14 +188,14 @@ def preserving_reduced(rf):
     return rf2
 
 
-def __safe_completing(f):
+def completing(f):
     """
     Wrap the function `f` (a reducing function) with a function that will
     return the first argument if `f` does not accept calls with a single
     argument. To be used with transduction. If a reducing function should
     do something different (such as finalize some intermediate state), then
     the reducing function should support single argument (1-arity) calls
-    to override `__safe_completing` behavior.
+    to override `completing` behavior.
     """
 
     def f2(arg, *rest):
@@ -168,28 +209,86 @@ def __safe_completing(f):
     return f2
 
 
+def staged(name: str, *args, short_circuits: bool = False):
+    """
+    Decorate a transducer with a description of its stage: a tuple of the name
+    of the transducer, the arguments it was created with and the transducer
+    itself. `comp` combines the stages of composed transducers, which lets
+    whole pipelines be inspected (see `transducers.fused`).
+
+    `short_circuits` declares whether the transducer can end a reduction
+    early (by returning `Reduced`).
+    """
+
+    def decorate(xform):
+        xform.stages = ((name, args, xform),)
+        xform.short_circuits = short_circuits
+        return xform
+
+    return decorate
+
+
+def stages_of(xform: Fn) -> tuple:
+    """
+    Get the stages of the transducer `xform`. A transducer which doesn't
+    describe its stages is a single opaque stage named "xform".
+    """
+    return getattr(xform, "stages", (("xform", (), xform),))
+
+
+def can_short_circuit(f: Fn) -> bool:
+    """
+    Whether the transducer or reducing function `f` can end a reduction early
+    (by returning `Reduced`). Functions which don't declare it (with a falsy
+    `short_circuits` attribute) are assumed to.
+    """
+    if hasattr(f, "stages"):
+        return any(getattr(stage, "short_circuits", True) for _, _, stage in f.stages)
+    return getattr(f, "short_circuits", True)
+
+
 # transducers
 
 
-def map(f: Fn, *rest: Iterable):
+def __cached(transducer, name: str, f: Fn, cache, rest):
     """
-    Map values of iterable with `f`.
+    Create `transducer` (or its generator) of `f` memoized with `cache` (see
+    `transducers.caching.Cache`). A shared cache memoizes `f` once, other
+    caches memoize it anew for each transduction.
     """
+    if rest:
+        return transducer(cache.scoped().memoize(f), *rest)
+    if cache.scope == "shared":
+        return transducer(cache.memoize(f))
+
+    @staged(f"cached_{name}", f, cache)
+    def xform(rf):
+        return transducer(cache.scoped().memoize(f))(rf)
+
+    return xform
+
+
+def map(f: Fn, *rest: Iterable, cache=None):
+    """
+    Map values of iterable with `f`. With a `cache` (see
+    `transducers.caching.Cache`), results of `f` are memoized.
+    """
+    if cache is not None:
+        return __cached(map, "map", f, cache, rest)
     if rest:
         if len(rest) == 1:
             return (f(x) for x in iterator(rest[0]))
         else:
             return (f(*xs) for xs in zip(*(iterator(r) for r in rest)))
 
+    @staged("map", f)
     def xform(rf):
         def rf2(init, *xs):
             if not xs:
                 return rf(init)
             elif len(xs) == 1:
                 return rf(init, f(xs[0]))
-            raise TypeError(
-                f"Some arities of transducing `map` not supported ({1 + len(xs)})."
-            )
+            return rf(init, f(*xs))
 
         return rf2
 
@@ -204,8 +303,11 @@ def map_indexed(f: Fn, *rest: Iterable):
     if rest:
         if len(rest) == 1:
             return (f(i, x) for i, x in enumerate(iterator(rest[0])))
-        raise TypeError("Can't `map_indexed` on more than one collection.")
+        return (
+            f(i, *xs) for i, xs in enumerate(zip(*(iterator(r) for r in rest)))
+        )
 
+    @staged("map_indexed", f)
     def xform(rf):
         i = 0
 
@@ -213,13 +315,9 @@ def map_indexed(f: Fn, *rest: Iterable):
             nonlocal i
             if not xs:
                 return rf(init)
-            elif len(xs) == 1:
-                res = rf(init, f(i, xs[0]))
-                i += 1
-                return res
-            raise TypeError(
-                f"Some arities of transducing `map_indexed` not supported ({1 + len(xs)})."
-            )
+            res = rf(init, f(i, *xs))
+            i += 1
+            return res
 
         return rf2
 
@@ -235,6 +333,7 @@ def filter(pred: Fn, *rest: Iterable):
             return (x for x in iterator(rest[0]) if pred(x))
         raise TypeError("Can't `filter` on more than one collection.")
 
+    @staged("filter", pred)
     def xform(rf):
         def rf2(init, *xs):
             if not xs:
@@ -244,18 +343,21 @@ def filter(pred: Fn, *rest: Iterable):
                 if pred(x):
                     return rf(init, x)
                 return init
-            raise TypeError(
-                f"Some arities of transducing `filter` not supported ({1 + len(xs)})."
-            )
+            if pred(*xs):
+                return rf(init, *xs)
+            return init
 
         return rf2
 
     return xform
 
 
-def __keep_generator(f: Fn, coll: Iterable) -> Iterable:
-    for x in iterator(coll):
-        res = f(x)
+def __keep_generator(f: Fn, coll: Iterable, *colls: Iterable) -> Iterable:
+    if colls:
+        results = map(f, coll, *colls)
+    else:
+        results = (f(x) for x in iterator(coll))
+    for res in results:
         if res is not None:
             yield res
 
@@ -267,27 +369,25 @@ def remove(pred: Fn, *rest: Iterable):
     return filter(complement(pred), *rest)
 
 
-def keep(f: Fn, *rest: Iterable):
+def keep(f: Fn, *rest: Iterable, cache=None):
     """
-    Map values from iterable, discarding any where f(x) is None.
+    Map values from iterable, discarding any where f(x) is None. With a
+    `cache` (see `transducers.caching.Cache`), results of `f` are memoized.
     """
+    if cache is not None:
+        return __cached(keep, "keep", f, cache, rest)
     if rest:
-        if len(rest) == 1:
-            return __keep_generator(f, rest[0])
-        raise TypeError("Can't `keep` on more than one collection.")
+        return __keep_generator(f, *rest)
 
+    @staged("keep", f)
     def xform(rf):
         def rf2(init, *xs):
             if not xs:
                 return rf(init)
-            elif len(xs) == 1:
-                res = f(xs[0])
-                if res is not None:
-                    return rf(init, res)
-                return init
-            raise TypeError(
-                f"Some arities of transducing `keep` not supported ({1 + len(xs)})."
-            )
+            res = f(*xs)
+            if res is not None:
+                return rf(init, res)
+            return init
 
         return rf2
 
@@ -298,10 +398,11 @@ def __take_generator(n: int, coll: Iterable) -> Iterable:
     """
     Helper function to implement `take` generator.
     """
-    for i, x in enumerate(iterator(coll)):
-        if i < n:
-            yield x
-        else:
+    if n <= 0:
+        return
+    for i, x in enumerate(iterator(coll), 1):
+        yield x
+        if i >= n:
             break
 
 
@@ -311,6 +412,7 @@ def take(n: int, *rest: Iterable):
             return __take_generator(n, rest[0])
         raise TypeError("Can't `take` on more than one collection.")
 
+    @staged("take", n, short_circuits=True)
     def xform(rf):
         seen = n
 
@@ -318,14 +420,13 @@ def take(n: int, *rest: Iterable):
             nonlocal seen
             if not xs:
                 return rf(init)
-            elif len(xs) == 1:
-                if seen > 0:
-                    seen -= 1
-                    return rf(init, xs[0])
+            if seen <= 0:
                 return ensure_reduced(init)
-            raise TypeError(
-                f"Some arities of transducing `take` not supported ({1 + len(xs)})."
-            )
+            seen -= 1
+            init = rf(init, *xs)
+            if seen <= 0:
+                return ensure_reduced(init)
+            return init
 
         return rf2
 
@@ -347,6 +448,7 @@ def drop(n: int, *rest: Iterable):
             return __drop_generator(n, rest[0])
         raise TypeError("Can't `drop` on more than one collection.")
 
+    @staged("drop", n)
     def xform(rf):
         seen = n
 
@@ -376,6 +478,7 @@ def take_nth(n: int, *rest: Iterable):
             )
         raise TypeError("Can't `take_nth` on more than one collection.")
 
+    @staged("take_nth", n)
     def xform(rf):
         indexed = map_indexed(lambda x, y: (x, y))
 
@@ -404,12 +507,55 @@ def __distinct_generator(coll: Iterable) -> Iterable:
             yield x
 
 
-def distinct(*rest: Iterable):
+def __membership(mode: str, options):
+    """
+    Create the bounded membership test of `distinct` for `mode`.
+    """
+    import transducers.membership as m
+
+    kinds = {"window": m.Window, "bloom": m.BloomFilter, "bitmap": m.Bitmap}
+    if mode not in kinds:
+        raise ValueError(f"Unknown `distinct` mode ({mode}).")
+    return kinds[mode](**options)
+
+
+def __bounded_distinct_generator(mode: str, options, coll: Iterable) -> Iterable:
+    seen = __membership(mode, options)
+    for x in coll:
+        if seen.add(x):
+            yield x
+
+
+def distinct(*rest: Iterable, mode: str = "exact", **options):
+    """
+    Remove values seen before. By default ("exact" mode) every value seen is
+    remembered, so memory grows with the number of distinct values. For
+    unbounded streams, a `mode` with a fixed memory ceiling can be used
+    instead, configured by `options`:
+
+    - "window" (`max_size`, `ttl=None`): exactly remember the `max_size` last
+      seen values, forgetting values not seen for `ttl` seconds.
+    - "bloom" (`capacity`, `error_rate=0.01`): a Bloom filter for `capacity`
+      values, which removes some new values (at about `error_rate`).
+    - "bitmap" (`size`): exactly remember integers in `[0, size)`, one bit
+      each.
+
+    See `transducers.membership`.
+    """
+    if mode != "exact":
+        __membership(mode, options)  # fail early on bad options
+    elif options:
+        raise TypeError(f"Options not supported by exact `distinct` ({options}).")
     if rest:
         if len(rest) == 1:
-            return __distinct_generator(rest[0])
-        raise TypeError("Can't `drop` on more than one collection.")
-
+            if mode == "exact":
+                return __distinct_generator(rest[0])
+            return __bounded_distinct_generator(mode, options, rest[0])
+        raise TypeError("Can't `distinct` on more than one collection.")
+    if mode != "exact":
+        return __bounded_distinct(mode, options)
+
+    @staged("distinct")
     def xform(rf):
         s = set()
 
@@ -427,6 +573,30 @@ def distinct(*rest: Iterable):
                 f"Some arities of transducing `distinct` not supported ({1 + len(xs)})."
             )
 
+        # expose the live state, for measuring (see `debug.gauge`)
+        rf2.state = lambda: s  # type: ignore
+        return rf2
+
+    return xform
+
+
+def __bounded_distinct(mode: str, options):
+    @staged("bounded_distinct", mode, options)
+    def xform(rf):
+        seen = __membership(mode, options)
+
+        def rf2(init, *xs):
+            if not xs:
+                return rf(init)
+            elif len(xs) == 1:
+                if seen.add(xs[0]):
+                    return rf(init, xs[0])
+                return init
+            raise TypeError(
+                f"Some arities of transducing `distinct` not supported ({1 + len(xs)})."
+            )
+
+        rf2.state = lambda: seen  # type: ignore
         return rf2
 
     return xform
@@ -447,6 +617,7 @@ def dedupe(*rest: Iterable):
             return __dedupe_generator(rest[0])
         raise TypeError("Can't `dedupe` on more than one collection.")
 
+    @staged("dedupe")
     def xform(rf):
         stub = object()
         last = stub
@@ -486,15 +657,78 @@ def __partition_generator(size: int, coll: Iterable) -> Iterable:
         i = 0
 
 
-def partition(size: int, *rest: Iterable):
+def __is_buffer(coll) -> bool:
+    return isinstance(
+        coll, (bytes, bytearray, memoryview, array.array)
+    ) or hasattr(coll, "__array_interface__")
+
+
+def __viewing(buffer):
+    """
+    Returns a function which gets the first `n` values of `buffer` without
+    copying them: as a view of a NumPy array, a `memoryview` of any other
+    buffer, or the list itself (only copying its values when `n` is less than
+    its length).
+    """
+    if isinstance(buffer, list):
+        return lambda n: buffer if n == len(buffer) else buffer[:n]
+    if not hasattr(buffer, "__array_interface__"):
+        buffer = memoryview(buffer)
+    return lambda n: buffer[:n]
+
+
+def __partition_views(size: int, coll) -> Iterable:
+    if not hasattr(coll, "__array_interface__"):
+        coll = memoryview(coll)
+    for i in range(0, len(coll), size):
+        yield coll[i : i + size]
+
+
+def __buffered_partition_generator(size: int, buffer, coll: Iterable) -> Iterable:
+    view = __viewing(buffer)
+    i = 0
+    for x in coll:
+        buffer[i] = x
+        i += 1
+        if i == size:
+            yield view(i)
+            i = 0
+    if i > 0:
+        yield view(i)
+
+
+def partition(size: int, *rest: Iterable, buffer=None, views: bool = False):
     """
     Partition iterable into parts of size `size`.
+
+    With `views`, the generator form (`partition(size, coll, views=True)`)
+    partitions a `bytes`, `bytearray`, `array.array`, `memoryview` or NumPy
+    array collection into views of the collection (`memoryview`s, or arrays
+    for NumPy) instead of lists, so partitioning doesn't copy its values,
+    e.g. `transduce(xform, f, init, partition(size, coll, views=True))`.
+
+    With a `buffer` (a list, or a mutable buffer like `bytearray(size)` or
+    `array.array`, of at least `size` values), the values of each part are
+    written into `buffer` and the part is a view of it, so no part is
+    allocated. Each part is then only valid until the next one is made, so it
+    must be used (or copied) right away.
     """
+    if buffer is not None and len(buffer) < size:
+        raise ValueError(f"Buffer for `partition` smaller than {size} values.")
+    if views and (len(rest) != 1 or not __is_buffer(rest[0])):
+        raise TypeError("Can't `partition` into views of anything but a buffer.")
     if rest:
         if len(rest) == 1:
+            if buffer is not None:
+                return __buffered_partition_generator(size, buffer, rest[0])
+            if views:
+                return __partition_views(size, rest[0])
             return __partition_generator(size, rest[0])
         raise TypeError("Can't `partition` on more than one collection.")
+    if buffer is not None:
+        return __buffered_partition(size, buffer)
 
+    @staged("partition", size)
     def xform(rf):
         i = 0
         part = []
@@ -503,10 +737,11 @@ def partition(size: int, *rest: Iterable):
             nonlocal i, part
             if not xs:
                 if i > 0:
-                    res = rf(init, part)
+                    init = rf(init, part)
                     part = []
                     i = 0
-                    return res
+                    if isinstance(init, Reduced):
+                        init = init.value
                 return rf(init)
             elif len(xs) == 1:
                 part.append(xs[0])
@@ -517,19 +752,105 @@ def partition(size: int, *rest: Iterable):
                     i = 0
                     return res
                 return init
+            raise TypeError(
+                f"Some arities of transducing `partition` not supported "
+                f"({1 + len(xs)})."
+            )
 
+        rf2.state = lambda: part  # type: ignore
         return rf2
 
     return xform
 
 
-def reduce(f: Fn, init, coll: Iterable):
+def __buffered_partition(size: int, buffer):
+    @staged("buffered_partition", size, buffer)
+    def xform(rf):
+        view = __viewing(buffer)
+        i = 0
+
+        def rf2(init, *xs):
+            nonlocal i
+            if not xs:
+                if i > 0:
+                    init = rf(init, view(i))
+                    i = 0
+                    if isinstance(init, Reduced):
+                        init = init.value
+                return rf(init)
+            elif len(xs) == 1:
+                buffer[i] = xs[0]
+                i += 1
+                if i == size:
+                    i = 0
+                    return rf(init, view(size))
+                return init
+            raise TypeError(
+                f"Some arities of transducing `partition` not supported "
+                f"({1 + len(xs)})."
+            )
+
+        rf2.state = lambda: view(i)  # type: ignore
+        return rf2
+
+    return xform
+
+
+def __window_generator(size: int, step: int, coll: Iterable) -> Iterable:
+    w: Deque = deque(maxlen=size)
+    n = 0
+    for x in coll:
+        w.append(x)
+        n += 1
+        if n >= size and (n - size) % step == 0:
+            yield tuple(w)
+
+
+def window(size: int, *rest: Iterable, step: int = 1):
     """
-    Reduce `coll` onto `init` using the reducing function `f`.
-    Returns the result of the reduction when:
-    - a reduction step yields a value marked as Reduced, or 
-    - there are no more values in `coll` to reduce.
+    Sliding windows of `size` values, as tuples: a window of the last `size`
+    values every `step` values (once there are `size` values). Values left
+    over at the end which don't fill a window are dropped.
     """
+    if size < 1 or step < 1:
+        raise ValueError(f"`window` size and step must be positive ({size}, {step}).")
+    if rest:
+        if len(rest) == 1:
+            return __window_generator(size, step, rest[0])
+        raise TypeError("Can't `window` on more than one collection.")
+
+    @staged("window", size, step)
+    def xform(rf):
+        w: Deque = deque(maxlen=size)
+        n = 0
+
+        def rf2(init, *xs):
+            nonlocal n
+            if not xs:
+                return rf(init)
+            elif len(xs) == 1:
+                w.append(xs[0])
+                n += 1
+                if n >= size and (n - size) % step == 0:
+                    return rf(init, tuple(w))
+                return init
+            raise TypeError(
+                f"Some arities of transducing `window` not supported ({1 + len(xs)})."
+            )
+
+        rf2.state = lambda: w  # type: ignore
+        return rf2
+
+    return xform
+
+
+# declare a protocol for collections which reduce themselves (like Clojure's
+# CollReduce), e.g. with a faster loop than iterating over their values. The
+# reduction must stop at (and unwrap) a step's `Reduced` value
+reducible = protocol("reduce")
+
+
+def __reduce_iterator(coll: Iterable, f: Fn, init):
     for x in iterator(coll):
         init = f(init, x)
         if isinstance(init, Reduced):
@@ -538,14 +859,68 @@ def reduce(f: Fn, init, coll: Iterable):
     return init
 
 
-def transduce(xform: Fn, f: Fn, init, coll: Iterable):
+def reduce(f: Fn, init, coll: Iterable):
+    """
+    Reduce `coll` onto `init` using the reducing function `f`.
+    Returns the result of the reduction when:
+    - a reduction step yields a value marked as Reduced, or 
+    - there are no more values in `coll` to reduce.
+
+    Collections extending the `reducible` protocol reduce themselves, others
+    are reduced over their `iterator`.
+    """
+    return reducible.reduce(coll, f, init)
+
+
+def __reduce_many(f: Fn, init, colls, short_circuits: bool):
+    """
+    Reduce the collections `colls` in lockstep (until the shortest ends), with
+    a step `f(acc, x, y, ...)` per position.
+    """
+    its = [iterator(coll) for coll in colls]
+    # unpacking the zipped values lets `zip` reuse its tuple for each position
+    if len(its) == 2:
+        for x, y in zip(*its):
+            init = f(init, x, y)
+            if short_circuits and isinstance(init, Reduced):
+                return init.value
+        return init
+    if len(its) == 3:
+        for x, y, z in zip(*its):
+            init = f(init, x, y, z)
+            if short_circuits and isinstance(init, Reduced):
+                return init.value
+        return init
+    # with more collections, each position builds a tuple
+    for xs in zip(*its):
+        init = f(init, *xs)
+        if short_circuits and isinstance(init, Reduced):
+            return init.value
+    return init
+
+
+def transduce(xform: Fn, f: Fn, init, coll: Iterable, *colls: Iterable):
     """
     Reduces `coll` onto `init` using the result of applying the transducing
     function `xform` to the reducing function `f`. Returns the result of the
     reduction.
+
+    With more collections, they are reduced in lockstep (until the shortest
+    ends): each step gets a value of each collection, as separate arguments.
+    Transducers `map`, `map_indexed`, `keep`, `filter` and `take` accept
+    these steps, e.g. `transduce(map(operator.mul), add, 0, xs, ys)`.
     """
-    f = xform(__safe_completing(f))
-    ret = reduce(f, init, coll)
+    short_circuits = can_short_circuit(xform) or can_short_circuit(f)
+    f = xform(completing(f))
+    if colls:
+        ret = __reduce_many(f, init, (coll, *colls), short_circuits)
+    elif reducible.implementation("reduce", type(coll)) is not __reduce_iterator:
+        ret = reducible.reduce(coll, f, init)
+    elif short_circuits:
+        ret = __reduce_iterator(coll, f, init)
+    else:
+        # no step can return Reduced, so skip checking for it after each step
+        ret = functools.reduce(f, iterator(coll), init)
     return f(ret)
 
 
@@ -555,18 +930,27 @@ def into(init, *rest):
     `conj`. If a transducing function is provided, applies transducer while reducing
     into `init`.
 
-    Uses a `chunked_conj` if `init` says its immutable, for fewer intermediate
-    collections and using the iterable conj (which is assumed to be a more efficient
-    way of adding to `init`).
+    With a transducing function, several collections can be transduced in
+    lockstep (see `transduce`).
+
+    If `init` has a `transient` builder (like immutable collections, or sinks
+    buffering their output, see `transducers.files`), conjoins onto the
+    builder and freezes (or flushes) it once at the end. Immutable collections
+    without a transient builder use a `chunked_conj`, for fewer intermediate
+    collections and using the iterable conj (which is assumed to be a more
+    efficient way of adding to `init`).
     """
-    rf = chunked_conj() if is_immutable(init) else conj
     if len(rest) == 1:
-        return reduce(rf, init, rest[0])
-    elif len(rest) == 2:
-        xform, coll = rest
-        return transduce(xform, rf, init, coll)
+        xform, colls = identity, rest
+    elif len(rest) >= 2:
+        xform, colls = rest[0], rest[1:]
     else:
-        raise TypeError("Can't `into` without a source or with more than one source.")
+        raise TypeError("Can't `into` without a source.")
+    if has_transient(init):
+        return persistent(init, transduce(xform, conj, transient(init), *colls))
+    if is_immutable(init):
+        return transduce(xform, chunked_conj(), init, *colls)
+    return transduce(xform, conj, init, *colls)
 
 
 def into_new(xform: Fn, coll: Coll) -> Coll:
@@ -577,6 +961,58 @@ def into_new(xform: Fn, coll: Coll) -> Coll:
     return into(empty(coll), xform, coll)
 
 
+def __buffering(buffer: List, *xs) -> List:
+    if xs:
+        buffer.append(xs[0])
+    return buffer
+
+
+def generate(xform: Fn, coll: Iterable) -> Iterable:
+    """
+    Lazily apply the transducing function `xform` to `coll`. Returns a
+    generator which only reads from `coll` as values are requested, and stops
+    reading `coll` as soon as the transducer signals it is done (with
+    `Reduced`).
+    """
+    buffer: List = []
+    f = xform(__buffering)
+    for x in iterator(coll):
+        res = f(buffer, x)
+        if buffer:
+            yield from buffer
+            buffer.clear()
+        if isinstance(res, Reduced):
+            break
+    f(buffer)
+    yield from buffer
+    buffer.clear()
+
+
+class Eduction:
+    """
+    A reiterable application of a transducer to a collection. Each iteration
+    runs the transducer lazily over the collection again with `generate`.
+    """
+
+    def __init__(self, xform: Fn, coll: Iterable):
+        self.xform = xform
+        self.coll = coll
+
+    def __iter__(self):
+        return generate(self.xform, self.coll)
+
+
+def eduction(*args) -> Eduction:
+    """
+    Create an `Eduction` from any number of transducers (composed in order)
+    followed by a collection.
+    """
+    if not args:
+        raise TypeError("Can't `eduction` without a source.")
+    *xforms, coll = args
+    return Eduction(comp(*xforms) if xforms else identity, coll)
+
+
 def __concat_generator(colls: Iterable[Iterable]) -> Iterable:
     for coll in colls:
         yield from coll
@@ -646,9 +1082,14 @@ def chunked_conj(chunk_size=32) -> Fn:
         i = 0
         return res
 
+    chunking_conj.short_circuits = False  # type: ignore
+    chunking_conj.state = lambda: buffer[:i]  # type: ignore
     return chunking_conj
 
 
+# by default, collections are mutable (if they can be conjoined at all)
+collection.extend(object, ("is_immutable", lambda _: False))
+
 # extend collection protocol for built in list, set, dict, str
 collection.extend(
     list,
@@ -690,6 +1131,78 @@ collection.extend(
     ("empty", lambda _: frozenset()),
 )
 
+collection.extend(
+    tuple,
+    ("conj_one", lambda t, x: t + (x,)),
+    ("conj_iterable", lambda t, iterable: t + tuple(iterable)),
+    ("is_immutable", lambda _: True),
+    ("empty", lambda _: ()),
+)
+
+
+def __as_bytes(x) -> bytes:
+    """
+    Bytes for a value conjoined onto bytes: either a single byte (int) or
+    bytes-like.
+    """
+    return bytes((x,)) if isinstance(x, int) else bytes(x)
+
+
+def __extend_bytearray(b: bytearray, iterable: Iterable) -> bytearray:
+    for x in iterable:
+        if isinstance(x, int):
+            b.append(x)
+        else:
+            b.extend(x)
+    return b
+
+
+collection.extend(
+    bytes,
+    ("conj_one", lambda b, x: b + __as_bytes(x)),
+    ("conj_iterable", lambda b, iterable: b + b"".join(map(__as_bytes, iterable))),
+    ("is_immutable", lambda _: True),
+    ("empty", lambda _: b""),
+)
+
+collection.extend(
+    bytearray,
+    ("conj_one", lambda b, x: __extend_bytearray(b, (x,))),
+    ("conj_iterable", __extend_bytearray),
+    ("is_immutable", lambda _: False),
+    ("empty", lambda _: bytearray()),
+)
+
+# transient builders for the built in immutable collections
+transients.extend(
+    str,
+    ("transient", lambda s: [s]),
+    ("persistent", lambda _, parts: "".join(parts)),
+)
+
+transients.extend(
+    frozenset,
+    ("transient", set),
+    ("persistent", lambda _, s: frozenset(s)),
+)
+
+transients.extend(
+    tuple,
+    ("transient", list),
+    ("persistent", lambda _, l: tuple(l)),
+)
+
+transients.extend(
+    bytes,
+    ("transient", bytearray),
+    ("persistent", lambda _, b: bytes(b)),
+)
+
+# by default, iterate with python's iter
+custom_iter.extend(object, ("iter", iter))
+
+reducible.extend(object, ("reduce", __reduce_iterator))
+
 # use dict.items as the iterator accessor for built in dict
 # (lets us transduce from one dict into another dict)
 custom_iter.extend(dict, ("iter", lambda d: d.items()))
@@ -1,27 +1,39 @@
-from typing import Dict, Iterable
+import copy
+from typing import Dict, Iterable, Optional, Tuple
 
 from transducers.typing import Coll, Fn
+import transducers.debug as debug
 import transducers.transducers as t
 
 
-def add(x, *xs):
+def add(*xs):
+    """
+    Add the values `xs` together. Returns 0 with no values.
+    """
     if not xs:
-        return x
+        return 0
     elif len(xs) == 1:
-        return x + xs[0]
-    raise TypeError(f"Too many positional arguments to 'add' ({1 + len(xs)})")
+        return xs[0]
+    elif len(xs) == 2:
+        return xs[0] + xs[1]
+    raise TypeError(f"Too many positional arguments to 'add' ({len(xs)})")
 
 
 def sum(coll: Iterable):
     return t.reduce(add, 0, coll)
 
 
-def mult(x, *xs):
+def mult(*xs):
+    """
+    Multiply the values `xs` together. Returns 1 with no values.
+    """
     if not xs:
-        return x
+        return 1
     elif len(xs) == 1:
-        return x * xs[0]
-    raise TypeError(f"Too many positional arguments to 'mult' ({1 + len(xs)})")
+        return xs[0]
+    elif len(xs) == 2:
+        return xs[0] * xs[1]
+    raise TypeError(f"Too many positional arguments to 'mult' ({len(xs)})")
 
 
 def product(coll: Iterable):
@@ -35,25 +47,39 @@ def invert_dict(d: Dict) -> Coll:
     return t.into_new(__invert_dict, d)
 
 
-def map_kvs(kfn: Fn, vfn: Fn, d: Dict):
+def map_kvs(kfn: Fn, vfn: Fn, d: Dict, key_cache=None, val_cache=None):
+    """
+    Map the keys of `d` with `kfn` and its values with `vfn`. Results of `kfn`
+    and `vfn` can be memoized with (separate) caches (see
+    `transducers.caching.Cache`).
+    """
+    if key_cache is not None:
+        kfn = key_cache.scoped().memoize(kfn)
+    if val_cache is not None:
+        vfn = val_cache.scoped().memoize(vfn)
     xf = t.map(lambda tup: (kfn(tup[0]), vfn(tup[1])))
     return t.into_new(xf, d)
 
 
-def map_keys(f: Fn, d: Dict):
-    return map_kvs(f, t.identity, d)
+def map_keys(f: Fn, d: Dict, cache=None):
+    return map_kvs(f, t.identity, d, key_cache=cache)
 
 
-def map_vals(f: Fn, d: Dict):
-    return map_kvs(t.identity, f, d)
+def map_vals(f: Fn, d: Dict, cache=None):
+    return map_kvs(t.identity, f, d, val_cache=cache)
 
 
-def group_by(f: Fn, coll: Iterable):
+def group_by(f: Fn, coll: Iterable, gauge=None):
     """
     Group the values of `coll` in a dict using the key function `f` on each
     value to determine the group. Returns a dict keyed by the results of `f`
-    on the values of `coll`.
+    on the values of `coll`. To aggregate groups without holding their values,
+    see `grouping`.
+
+    If a `gauge` (a `debug.StateGauge`) is given, it measures the groups while
+    they are built.
     """
+    groups: Dict = {}
 
     def rf(acc, v):
         k = f(v)
@@ -63,7 +89,108 @@ def group_by(f: Fn, coll: Iterable):
             acc[k] = [v]
         return acc
 
-    return t.reduce(rf, {}, coll)
+    rf.state = lambda: groups  # type: ignore
+    if gauge is None:
+        return t.reduce(rf, groups, coll)
+    groups = t.reduce(debug.gauge_rf(rf, gauge), groups, coll)
+    gauge.measure(groups)
+    return groups
+
+
+def __groups(f: Fn, xform: Fn, rf: Fn, init) -> Tuple[Fn, Fn]:
+    """
+    Build the step and completion of a streaming grouping: the step reduces a
+    value into the group (in a dict of groups) of its key, with a reduction
+    of its own (`xform` applied to `rf`, starting from a copy of `init`), and
+    the completion completes the reduction of each group.
+    """
+    rf = t.completing(rf)
+    # the reducing function of each group, or None once it is reduced
+    fs: Dict = {}
+
+    def step(groups: Dict, x):
+        k = f(x)
+        try:
+            g = fs[k]
+        except KeyError:
+            g = fs[k] = xform(rf)
+            groups[k] = copy.copy(init)
+        if g is not None:
+            res = g(groups[k], x)
+            if isinstance(res, t.Reduced):
+                groups[k] = g(res.value)
+                fs[k] = None
+            else:
+                groups[k] = res
+        return groups
+
+    def complete(groups: Dict):
+        for k, g in fs.items():
+            if g is not None:
+                groups[k] = g(groups[k])
+        fs.clear()
+        return groups
+
+    step.state = lambda: fs  # type: ignore
+    return step, complete
+
+
+def grouping(f: Fn, xform: Fn, rf: Fn, init):
+    """
+    Returns a reducing function which groups values by the key function `f`
+    (into a dict), reducing the values of each group as they come with `rf`
+    transformed by `xform`, from a (shallow) copy of `init`. The reduction of
+    each group is completed when the grouping is completed (e.g. by
+    `transduce`). Only the reduction of each group is held, not its values.
+
+    transduce(identity, grouping(len, identity, add, ""), {}, ["a", "bc", "d"])
+    #=> {1: "ad", 2: "bc"}
+
+    Groups which are reduced (e.g. by `take`) ignore further values. The
+    returned function holds the state of the groups, so it should only be
+    used for one reduction.
+    """
+    step, complete = __groups(f, xform, rf, init)
+
+    def grouping_rf(groups, *xs):
+        if not xs:
+            return complete(groups)
+        return step(groups, xs[0])
+
+    grouping_rf.short_circuits = False  # type: ignore
+    grouping_rf.state = step.state  # type: ignore
+    return grouping_rf
+
+
+def grouped(f: Fn, xform: Fn, rf: Fn, init):
+    """
+    Transducer version of `grouping`: groups values by the key function `f`,
+    reducing each group with `rf` transformed by `xform`, and on completion
+    passes a `(key, reduction)` tuple for each group (in the order keys were
+    first seen) downstream.
+    """
+
+    @t.staged("grouped", f, xform, rf, init)
+    def xf(down):
+        step, complete = __groups(f, xform, rf, init)
+        groups: Dict = {}
+
+        def rf2(acc, *xs):
+            if not xs:
+                for kv in complete(groups).items():
+                    acc = down(acc, kv)
+                    if isinstance(acc, t.Reduced):
+                        acc = acc.value
+                        break
+                groups.clear()
+                return down(acc)
+            step(groups, xs[0])
+            return acc
+
+        rf2.state = step.state  # type: ignore
+        return rf2
+
+    return xf
 
 
 def index(f: Fn, coll: Iterable):
@@ -79,6 +206,107 @@ def index(f: Fn, coll: Iterable):
     return t.reduce(rf, {}, coll)
 
 
+def build_index(
+    f: Fn, coll: Iterable, value: Optional[Fn] = None, many: bool = False
+):
+    """
+    Build a lookup dict (for `join`) from `coll` in one pass, keyed by the key
+    function `f`, holding `value(x)` (by default `x`) for each value `x`, to
+    only keep what the join needs. Like `index`, the latest value of a key is
+    kept, or with `many` (for `join_many`), a tuple of all its values.
+    """
+    lookup: Dict = {}
+    if not many:
+        if value is None:
+            return index(f, coll)
+        for x in t.iterator(coll):
+            lookup[f(x)] = value(x)
+        return lookup
+    for x in t.iterator(coll):
+        k = f(x)
+        v = x if value is None else value(x)
+        group = lookup.get(k)
+        if group is None:
+            lookup[k] = [v]
+        else:
+            group.append(v)
+    # tuples are smaller than (over allocated) lists
+    for k, group in lookup.items():
+        lookup[k] = tuple(group)
+    return lookup
+
+
+JOINS = ("inner", "left")
+
+
+def __pair(x, match):
+    return (x, match)
+
+
+def join(lookup: Dict, key_fn: Fn, how: str = "inner", combine: Fn = __pair):
+    """
+    Transducer which joins each value `x` with the value of its key (`key_fn`)
+    in the dict `lookup` (e.g. from `index` or `build_index`), passing on
+    `combine(x, match)` (by default a tuple). Values without a match are
+    dropped by an "inner" join (`how`), or joined with None by a "left" join.
+    """
+    if how not in JOINS:
+        raise ValueError(f"Unknown join ({how}).")
+    missing = object()
+    get = lookup.get
+    left = how == "left"
+
+    @t.staged("join", lookup, key_fn, how, combine)
+    def xform(rf):
+        def rf2(acc, *xs):
+            if not xs:
+                return rf(acc)
+            x = xs[0]
+            match = get(key_fn(x), missing)
+            if match is not missing:
+                return rf(acc, combine(x, match))
+            if left:
+                return rf(acc, combine(x, None))
+            return acc
+
+        return rf2
+
+    return xform
+
+
+def join_many(groups: Dict, key_fn: Fn, how: str = "inner", combine: Fn = __pair):
+    """
+    Like `join`, for a dict `groups` of a collection of values per key (e.g.
+    from `group_by` or `build_index(..., many=True)`): joins each value with
+    each value of its group.
+    """
+    if how not in JOINS:
+        raise ValueError(f"Unknown join ({how}).")
+    get = groups.get
+    left = how == "left"
+
+    @t.staged("join_many", groups, key_fn, how, combine)
+    def xform(rf):
+        def rf2(acc, *xs):
+            if not xs:
+                return rf(acc)
+            x = xs[0]
+            matches = get(key_fn(x))
+            if matches:
+                for match in matches:
+                    acc = rf(acc, combine(x, match))
+                    if isinstance(acc, t.Reduced):
+                        return acc
+                return acc
+            if left:
+                return rf(acc, combine(x, None))
+            return acc
+
+        return rf2
+
+    return xform
+
+
 def reapply(f: Fn, x):
     """
     Reapply `f` to `f(x)`.